@@ -6,8 +6,7 @@ Provides common functionality for all specialized agents
 import json
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
-from config.settings import config
+from utils.llm_gateway import get_llm_gateway
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,7 +16,7 @@ class BaseAgent(ABC):
     
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.llm = get_llm_gateway()
         self.model = "gpt-4"
         logger.info(f"🤖 {agent_name} agent initialized")
     
@@ -31,7 +30,8 @@ class BaseAgent(ABC):
                      max_tokens: int = 1000, temperature: float = 0.3) -> str:
         """Common OpenAI API call with error handling"""
         try:
-            response = self.client.chat.completions.create(
+            return self.llm.chat(
+                f"agent.{self.agent_name}",
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -40,7 +40,6 @@ class BaseAgent(ABC):
                 max_tokens=max_tokens,
                 temperature=temperature
             )
-            return response.choices[0].message.content
         except Exception as e:
             logger.error(f"❌ {self.agent_name} OpenAI call failed: {e}")
             raise
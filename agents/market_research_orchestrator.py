@@ -6,9 +6,10 @@ Phase 2B: Chain of Thought with Progress Tracking
 """
 
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from config.settings import config
 from .base_agent import BaseAgent
 from .market_detection import MarketDetectionAgent, MarketProfile
 from .progress_tracker import ProgressTracker, create_test_progress_tracker
@@ -132,35 +133,38 @@ class MarketResearchOrchestrator(BaseAgent):
         self.market_detector = MarketDetectionAgent()
         # Direct web search - no more complex agents needed
         self.web_search_engine = WebSearchEngine(provider='tavily')
-        
-        # Progress tracker will be initialized per analysis
-        self.progress_tracker = None
 
     def perform_market_intelligence(self, processed_documents: List[Dict[str, Any]],
                                   document_summary: Dict[str, Any], 
                                   analysis_result: Dict[str, Any] = None,
-                                  cached_market_profile = None) -> MarketIntelligenceResult:
-        """Orchestrate comprehensive market intelligence analysis with progress tracking"""
+                                  cached_market_profile = None,
+                                  progress_tracker: Optional[ProgressTracker] = None) -> MarketIntelligenceResult:
+        """Orchestrate comprehensive market intelligence analysis with progress tracking
+
+        Progress is reported through ``progress_tracker`` events as each phase
+        actually starts and finishes - no artificial delays are added. The
+        tracker is passed down rather than stored: one orchestrator serves
+        concurrent runs for different users.
+        """
         try:
             logger.info("🔍 Starting comprehensive market intelligence analysis...")
             
-            # Initialize progress tracker (no Slack integration yet)
-            self.progress_tracker = create_test_progress_tracker()
-            logger.info("📊 Progress tracker initialized (test mode - no Slack)")
+            # Use caller's tracker (Slack-backed) or a log-only tracker
+            if progress_tracker is None:
+                progress_tracker = create_test_progress_tracker()
+                logger.info("📊 Progress tracker initialized (test mode - no Slack)")
 
             # Check if we're in test mode
             import os
             if os.getenv('TEST_MODE', 'false').lower() == 'true':
                 logger.info("🧪 TEST MODE: Using mock data with simulated progress")
-                return self._perform_test_mode_analysis()
+                return self._perform_test_mode_analysis(progress_tracker)
 
             result = MarketIntelligenceResult()
 
             # ==== PHASE 1: Market Detection (Agent 1) ====
             logger.info("🎯 PHASE 1/5: Market Detection and Profiling")
-            self.progress_tracker.phases[0].status = "running"
-            self.progress_tracker.phases[0].start_time = datetime.now()
-            logger.info(f"Progress Update: {self.progress_tracker.format_progress_message()[:200]}...")
+            progress_tracker.start_phase(0)
             result.processing_steps.append("Phase 1: Market Detection Started")
 
             # TASK-UX-003: Use cached market profile if available
@@ -176,74 +180,19 @@ class MarketResearchOrchestrator(BaseAgent):
             result.market_profile = market_profile
             
             # Update progress tracker with detected market
-            self.progress_tracker.detected_market = f"{market_profile.vertical}/{market_profile.sub_vertical}"
-            
-            # Realistic progress timing - show phase for at least 8 seconds (skip in test mode)
-            import time
-            import os
-            if os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(8)
-            
-            self.progress_tracker.phases[0].status = "completed"
-            self.progress_tracker.phases[0].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = 1
+            progress_tracker.detected_market = f"{market_profile.vertical}/{market_profile.sub_vertical}"
+            progress_tracker.complete_phase(0, progress_tracker.detected_market)
             
             result.processing_steps.append(f"Market Detected: {market_profile.vertical} -> {market_profile.sub_vertical}")
-            logger.info(f"✅ Phase 1 Complete: {self.progress_tracker.detected_market}")
+            logger.info(f"✅ Phase 1 Complete: {progress_tracker.detected_market}")
 
-            # ==== PHASE 2: Competitive Intelligence Search ====
-            logger.info("🔍 PHASE 2/5: Competitive Intelligence Search")
-            self.progress_tracker.phases[1].status = "running"
-            self.progress_tracker.phases[1].start_time = datetime.now()
-            
-            # Direct competitive search - no complex agent processing needed
-            competitive_web_data = self._search_competitive_intelligence(market_profile)
-            
-            # Show progress for 10 seconds after work is done but before marking complete (skip in test mode)
-            if os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(10)
-            
-            self.progress_tracker.phases[1].status = "completed"
-            self.progress_tracker.phases[1].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = 2
-            result.processing_steps.append("Phase 2: Competitive Intelligence Search")
-            logger.info("✅ Phase 2 Complete: Competitive Intelligence Search")
-
-            # ==== PHASE 3: Market Validation Research ====
-            logger.info("📈 PHASE 3/5: Market Validation Research")
-            self.progress_tracker.phases[2].status = "running"
-            self.progress_tracker.phases[2].start_time = datetime.now()
-            
-            # Direct market validation search - no complex agent processing needed
-            validation_web_data = self._search_market_validation(market_profile)
-            
-            # Show progress for 10 seconds after work is done but before marking complete (skip in test mode)
-            if os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(10)
-            
-            self.progress_tracker.phases[2].status = "completed"
-            self.progress_tracker.phases[2].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = 3
-            result.processing_steps.append("Phase 3: Market Validation Research")
-            logger.info("✅ Phase 3 Complete: Market Validation Research")
-
-            # ==== PHASE 4: Funding Intelligence Gathering ====
-            logger.info("💰 PHASE 4/5: Funding Intelligence Gathering")
-            self.progress_tracker.phases[3].status = "running"
-            self.progress_tracker.phases[3].start_time = datetime.now()
-            
-            # Direct funding intelligence search - no complex agent processing needed
-            funding_web_data = self._search_funding_intelligence(market_profile)
-            
-            # Show progress for 10 seconds after work is done but before marking complete (skip in test mode)
-            if os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(10)
-            
-            self.progress_tracker.phases[3].status = "completed"
-            self.progress_tracker.phases[3].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = 4
-            result.processing_steps.append("Phase 4: Funding Intelligence Gathering")
-            logger.info("✅ Phase 4 Complete: Funding Intelligence Gathering")
+            # ==== PHASES 2-4: Concurrent Web Search Stage ====
+            # Competitive, validation and funding searches depend only on the market profile
+            logger.info("🔍 PHASES 2-4/5: Concurrent web search stage")
+            search_results = self._run_search_stage(market_profile, result, progress_tracker)
+            competitive_web_data = search_results['competitive_search']
+            validation_web_data = search_results['market_validation_search']
+            funding_web_data = search_results['funding_intelligence_search']
 
             # ==== PHASE 4.5: Combine Web Search Results ====
             # Combine all web search results for GPT-5 synthesis
@@ -285,8 +234,7 @@ class MarketResearchOrchestrator(BaseAgent):
 
             # ==== PHASE 5: GPT-5 Market Intelligence Synthesis ====
             logger.info("🤖 PHASE 5/5: GPT-5 Market Intelligence Synthesis")
-            self.progress_tracker.phases[4].status = "running"
-            self.progress_tracker.phases[4].start_time = datetime.now()
+            progress_tracker.start_phase(4, f"Synthesizing {len(all_web_sources)} sources")
             
             # Use GPT-5 synthesis for final professional analysis
             from utils.expert_formatter import synthesize_market_intelligence_with_gpt4
@@ -297,13 +245,7 @@ class MarketResearchOrchestrator(BaseAgent):
             # Store synthesis result
             result.final_analysis = final_analysis
             
-            # Show progress for 5 seconds after work is done but before marking complete (this phase does most work)
-            if os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(5)
-            
-            self.progress_tracker.phases[4].status = "completed"
-            self.progress_tracker.phases[4].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = 5
+            progress_tracker.complete_phase(4)
             result.processing_steps.append("Phase 5: GPT-5 Market Intelligence Synthesis")
             logger.info(f"✅ Phase 5 Complete: GPT-5 Synthesis - {len(all_web_sources)} sources analyzed")
 
@@ -312,44 +254,41 @@ class MarketResearchOrchestrator(BaseAgent):
 
             # Log final progress state
             logger.info("📊 Final Progress State:")
-            logger.info(self.progress_tracker.format_progress_message())
+            logger.info(progress_tracker.format_progress_message())
             logger.info(f"✅ Market intelligence analysis completed with confidence: {result.confidence_score:.2f}")
             
             return result
 
         except Exception as e:
             logger.error(f"❌ Market intelligence analysis failed: {e}")
+            if progress_tracker:
+                running = [i for i, phase in enumerate(progress_tracker.phases) if phase.status == "running"]
+                for index in running:
+                    progress_tracker.fail_phase(index, str(e))
             result = MarketIntelligenceResult()
             result.processing_steps.append(f"ERROR: {str(e)}")
             return result
 
-    def _perform_test_mode_analysis(self) -> Any:
+    def _perform_test_mode_analysis(self, progress_tracker: ProgressTracker) -> Any:
         """Perform simulated analysis in TEST_MODE with progress tracking"""
         logger.info("🧪 Running TEST_MODE analysis with simulated progress")
         
-        # Simulate all 5 phases
+        # Emit events for all 5 phases (mock data is available immediately)
         phases_simulation = [
-            ("market_detection", "FinTech/Payments", 0.5),
-            ("competitive_intelligence", "Analyzing competitors", 0.5),
-            ("market_validation", "Validating TAM/SAM", 0.5),
-            ("funding_benchmarking", "Benchmarking metrics", 0.5),
-            ("critical_synthesis", "Generating assessment", 0.5)
+            ("market_detection", "FinTech/Payments"),
+            ("competitive_intelligence", "Analyzing competitors"),
+            ("market_validation", "Validating TAM/SAM"),
+            ("funding_benchmarking", "Benchmarking metrics"),
+            ("critical_synthesis", "Generating assessment")
         ]
         
-        for i, (phase_id, description, delay) in enumerate(phases_simulation):
-            self.progress_tracker.phases[i].status = "running"
-            self.progress_tracker.phases[i].start_time = datetime.now()
+        for i, (phase_id, description) in enumerate(phases_simulation):
+            progress_tracker.start_phase(i, description)
             
             if i == 0:  # Set detected market in first phase
-                self.progress_tracker.detected_market = "FinTech/Payments"
-            
-            logger.info(f"🔄 Phase {i+1}/5: {description}")
-            time.sleep(delay)  # Simulate processing
-            
-            self.progress_tracker.phases[i].status = "completed"
-            self.progress_tracker.phases[i].end_time = datetime.now()
-            self.progress_tracker.current_phase_index = i + 1
+                progress_tracker.detected_market = "FinTech/Payments"
             
+            progress_tracker.complete_phase(i)
             logger.info(f"✅ Phase {i+1} complete")
         
         logger.info("🧪 TEST_MODE analysis complete with all phases simulated")
@@ -467,6 +406,62 @@ Be brutally honest - this analysis will be used for investment decisions.
             'status': 'completed' if intelligence_result.confidence_score > 0.6 else 'needs_improvement'
         }
     
+    def _run_search_stage(self, market_profile: MarketProfile, result: MarketIntelligenceResult,
+                          progress_tracker: ProgressTracker) -> Dict[str, Dict[str, Any]]:
+        """Run phases 2-4 concurrently on a bounded executor with per-phase timeouts
+
+        A phase that fails or exceeds its timeout contributes no sources; the
+        other phases' results are still used (partial results).
+        """
+        stage = [
+            (1, 'competitive_search', "Phase 2: Competitive Intelligence Search", self._search_competitive_intelligence),
+            (2, 'market_validation_search', "Phase 3: Market Validation Research", self._search_market_validation),
+            (3, 'funding_intelligence_search', "Phase 4: Funding Intelligence Gathering", self._search_funding_intelligence),
+        ]
+        timeout = config.MARKET_RESEARCH_PHASE_TIMEOUT_SECONDS
+        stage_results = {phase_id: {'all_sources': []} for _, phase_id, _, _ in stage}
+
+        executor = ThreadPoolExecutor(max_workers=max(1, config.MARKET_RESEARCH_MAX_WORKERS),
+                                      thread_name_prefix="market-search")
+        try:
+            futures = {}
+            for index, phase_id, step_name, search_func in stage:
+                progress_tracker.start_phase(index)
+                futures[executor.submit(search_func, market_profile)] = (index, phase_id, step_name)
+
+            def record(future):
+                index, phase_id, step_name = futures.pop(future)
+                try:
+                    phase_data = future.result()
+                    stage_results[phase_id] = phase_data
+                    progress_tracker.complete_phase(index, f"{len(phase_data.get('all_sources', []))} sources")
+                    result.processing_steps.append(step_name)
+                    logger.info(f"✅ {step_name} complete")
+                except Exception as e:
+                    progress_tracker.fail_phase(index, str(e))
+                    result.processing_steps.append(f"{step_name} - ERROR: {str(e)} (partial results)")
+                    logger.error(f"❌ {step_name} failed: {e} - continuing with partial results")
+
+            # All phases start together, so the per-phase timeout is one shared deadline
+            try:
+                for future in as_completed(list(futures), timeout=timeout):
+                    record(future)
+            except FuturesTimeoutError:
+                for future in list(futures):
+                    if future.done():
+                        record(future)
+                        continue
+                    index, phase_id, step_name = futures.pop(future)
+                    future.cancel()
+                    progress_tracker.fail_phase(index, f"timed out after {timeout}s")
+                    result.processing_steps.append(f"{step_name} - TIMEOUT after {timeout}s (partial results)")
+                    logger.warning(f"⏱️ {step_name} timed out after {timeout}s - continuing with partial results")
+        finally:
+            # Don't block on timed-out searches; their threads finish in the background
+            executor.shutdown(wait=False)
+
+        return stage_results
+
     def _search_competitive_intelligence(self, market_profile: MarketProfile) -> Dict[str, Any]:
         """Direct competitive intelligence web search without complex agent processing"""
         solution = market_profile.solution
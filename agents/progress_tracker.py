@@ -6,13 +6,30 @@ Phase 2B.1: Chain of Thought with Progress UX
 """
 
 import time
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import threading
+from typing import Callable, Dict, List, Any, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+STATUS_EMOJIS = {
+    "pending": "⚪",
+    "running": "🔄",
+    "completed": "✅",
+    "error": "❌"
+}
+
+@dataclass
+class ProgressEvent:
+    """A single progress event emitted by the tracker (start, progress, finish, error)"""
+    event_type: str  # start, progress, finish, error
+    phase_index: int
+    phase_id: str
+    message: str = ""
+    timestamp: datetime = field(default_factory=datetime.now)
+
 @dataclass
 class AgentPhase:
     """Represents a single phase in the market research process"""
@@ -27,24 +44,31 @@ class AgentPhase:
 
     def __post_init__(self):
         """Set status emojis based on phase status"""
-        status_emojis = {
-            "pending": "⚪",
-            "running": "🔄",
-            "completed": "✅",
-            "error": "❌"
-        }
-        if self.status in status_emojis:
-            self.emoji = status_emojis[self.status]
+        self.set_status(self.status)
+
+    def set_status(self, status: str):
+        """Update phase status and keep the emoji in sync"""
+        self.status = status
+        if status in STATUS_EMOJIS:
+            self.emoji = STATUS_EMOJIS[status]
 
 class ProgressTracker:
     """Tracks and reports progress for multi-agent market research"""
 
-    def __init__(self, slack_client=None, channel=None, thread_ts=None):
+    # Minimum seconds between Slack updates triggered by "progress" events.
+    # Start/finish/error events are always pushed.
+    SLACK_UPDATE_INTERVAL_SECONDS = 1.0
+
+    def __init__(self, slack_client=None, channel=None, thread_ts=None, message_ts=None):
         self.slack_client = slack_client
         self.channel = channel
         self.thread_ts = thread_ts
         self.start_time = datetime.now()
-        self.message_ts = None  # Will store timestamp of progress message
+        self.message_ts = message_ts  # Timestamp of the Slack message updated in place
+        self.events: List[ProgressEvent] = []
+        self._listeners: List[Callable[[ProgressEvent], None]] = []
+        self._lock = threading.Lock()
+        self._last_slack_update = 0.0
 
         # Define all research phases (Updated to reflect actual processing)
         self.phases = [
@@ -83,6 +107,84 @@ class ProgressTracker:
         self.current_phase_index = 0
         self.detected_market = "Unknown"
 
+    # ==========================================
+    # EVENTS
+    # ==========================================
+
+    def add_listener(self, listener: Callable[[ProgressEvent], None]):
+        """Register a callback invoked for every emitted progress event"""
+        self._listeners.append(listener)
+
+    def start_phase(self, index: int, message: str = ""):
+        """Mark a phase as running and emit a start event"""
+        with self._lock:
+            phase = self.phases[index]
+            phase.set_status("running")
+            phase.start_time = datetime.now()
+        self._emit(ProgressEvent("start", index, phase.id, message or phase.description))
+
+    def update_phase(self, index: int, message: str):
+        """Emit an intermediate progress event for a running phase"""
+        self._emit(ProgressEvent("progress", index, self.phases[index].id, message))
+
+    def complete_phase(self, index: int, message: str = ""):
+        """Mark a phase as completed and emit a finish event"""
+        with self._lock:
+            phase = self.phases[index]
+            phase.set_status("completed")
+            phase.end_time = datetime.now()
+            self.current_phase_index = max(self.current_phase_index, index + 1)
+        self._emit(ProgressEvent("finish", index, phase.id, message))
+
+    def fail_phase(self, index: int, message: str = ""):
+        """Mark a phase as failed and emit an error event"""
+        with self._lock:
+            phase = self.phases[index]
+            phase.set_status("error")
+            phase.end_time = datetime.now()
+            self.current_phase_index = max(self.current_phase_index, index + 1)
+        self._emit(ProgressEvent("error", index, phase.id, message))
+
+    def _emit(self, event: ProgressEvent):
+        """Record an event, notify listeners and push the progress message to Slack"""
+        with self._lock:
+            self.events.append(event)
+
+        logger.info(f"📡 Progress event: {event.event_type} {event.phase_index + 1}/{len(self.phases)} {event.phase_id}"
+                    + (f" - {event.message}" if event.message else ""))
+
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"⚠️ Progress listener failed: {e}")
+
+        self._push_to_slack(force=event.event_type != "progress")
+
+    def _push_to_slack(self, force: bool = False):
+        """Update the Slack progress message in place (throttled for progress events)"""
+        if not (self.slack_client and self.channel and self.message_ts):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_slack_update < self.SLACK_UPDATE_INTERVAL_SECONDS:
+                return
+            self._last_slack_update = now
+
+        try:
+            self.slack_client.chat_update(
+                channel=self.channel,
+                ts=self.message_ts,
+                text=self.format_progress_message()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to push progress update to Slack: {e}")
+
+    # ==========================================
+    # FORMATTING
+    # ==========================================
+
     def get_total_estimated_time(self) -> int:
         """Calculate total estimated time in minutes"""
         return sum(phase.estimated_duration_minutes for phase in self.phases)
@@ -96,7 +198,7 @@ class ProgressTracker:
 
     def get_estimated_remaining_time(self) -> str:
         """Calculate estimated time remaining"""
-        remaining_phases = self.phases[self.current_phase_index:]
+        remaining_phases = [phase for phase in self.phases if phase.status in ("pending", "running")]
         remaining_minutes = sum(phase.estimated_duration_minutes for phase in remaining_phases)
 
         if remaining_minutes <= 0:
@@ -130,7 +232,7 @@ class ProgressTracker:
             phase_line = f"{phase.emoji} {i+1}/5 {phase.name}"
             if phase.status == "running":
                 phase_line += " (analyzing...)"
-            elif phase.status == "completed" and phase.end_time:
+            elif phase.status in ("completed", "error") and phase.end_time:
                 duration = (phase.end_time - phase.start_time).total_seconds() if phase.start_time else 0
                 phase_line += f" ({duration:.0f}s)"
 
@@ -143,6 +245,10 @@ class ProgressTracker:
 
         return f"{header}\n{phases_text}{footer}"
 
+def create_slack_progress_tracker(slack_client, channel: str, message_ts: str) -> ProgressTracker:
+    """Create progress tracker that updates an existing Slack message from progress events"""
+    return ProgressTracker(slack_client=slack_client, channel=channel, message_ts=message_ts)
+
 # Test mode helper for development
 def create_test_progress_tracker() -> ProgressTracker:
     """Create progress tracker for testing without Slack integration"""
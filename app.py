@@ -13,9 +13,17 @@ from slack_bolt.adapter.socket_mode import SocketModeHandler
 from config.settings import config
 from handlers.drive_handler import GoogleDriveHandler
 from handlers.doc_processor import DocumentProcessor
-from handlers.ai_analyzer import AIAnalyzer
+from handlers.ai_analyzer import AIAnalyzer, AnalysisSession
+from handlers.dataroom_pipeline import DataroomPipeline
+from handlers.speculative_precompute import SpeculativePrecomputer
 from handlers.market_research_handler import MarketResearchHandler  # NEW IMPORT
 from utils.slack_formatter import format_analysis_response, format_health_response, format_error_response
+from utils.session_store import SessionStore
+from utils.job_scheduler import get_job_scheduler, format_queue_position
+from utils.workspace import get_workspace_manager
+from utils.slack_streamer import SlackMessageStreamer, latency_stats
+from utils.llm_gateway import get_llm_gateway
+from utils.context_packer import preload_token_encoding
 from utils.logger import get_logger
 from dotenv import load_dotenv
 
@@ -78,18 +86,34 @@ def root():
         "endpoints": ["/health", "/status"]
     })
 
+def _search_cache_stats():
+    """Hit/miss counters for the persistent web search cache"""
+    from utils.web_search import get_search_cache
+    search_cache = get_search_cache()
+    return search_cache.stats() if search_cache else {"enabled": False}
+
 @flask_app.route('/status')
 def status():
     """Detailed status endpoint"""
     try:
+        drive_stats = drive_handler.stats_snapshot() if drive_handler else None
         return jsonify({
             "service": "DataRoom Intelligence Bot",
             "timestamp": datetime.now().isoformat(),
             "deployment": config.deployment_info(),
             "active_sessions": len(user_sessions),
+            "session_store": user_sessions.stats(),
             "configuration_status": config.validate_configuration(),
             "phase": "2B - Market Research Agent (Production Ready)",
-            "market_research_available": market_research_orchestrator is not None
+            "market_research_available": market_research_orchestrator is not None,
+            "search_cache": _search_cache_stats(),
+            "jobs": job_scheduler.stats(),
+            "drive_listing": drive_stats['listing'] if drive_stats else None,
+            "drive_downloads": drive_stats['downloads'] if drive_stats else None,
+            "workspaces": workspace_manager.stats(),
+            "command_latency": latency_stats(),
+            "llm": get_llm_gateway().stats(),
+            "speculative": speculative_precomputer.stats()
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -105,6 +129,9 @@ app = App(token=config.SLACK_BOT_TOKEN)
 drive_handler = GoogleDriveHandler() if config.google_drive_configured else None
 doc_processor = DocumentProcessor()
 ai_analyzer = AIAnalyzer()
+job_scheduler = get_job_scheduler()
+workspace_manager = get_workspace_manager()
+speculative_precomputer = SpeculativePrecomputer(ai_analyzer, job_scheduler)
 
 # Initialize Phase 2A agents
 market_research_orchestrator = None
@@ -123,8 +150,15 @@ except Exception as e:
 logger.info(f"🔧 AI Analyzer initialized: {ai_analyzer is not None}")
 logger.info(f"🔧 OpenAI configured: {config.openai_configured}")
 
-# Store user sessions (in production, use a database)
-user_sessions = {}
+# Store user sessions (bounded in memory, persisted to disk across restarts);
+# a user's download workspaces are removed when their session is deleted or expires
+user_sessions = SessionStore(
+    config.session_dir / "sessions.sqlite3",
+    ttl_seconds=config.SESSION_TTL_HOURS * 3600,
+    max_sessions=config.SESSION_MAX_IN_MEMORY,
+    memory_budget_bytes=config.SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+    on_evict=workspace_manager.discard_owner
+)
 
 # Initialize market research handler (NEW)
 market_research_handler = None
@@ -181,12 +215,20 @@ def handle_analyze_command(ack, body, client):
                  f"🚧 Processing documents and generating AI insights..."
         )
 
-        # Start background processing using threading (proven to work)
-        threading.Thread(
-            target=perform_dataroom_analysis,
-            args=(client, channel_id, user_id, drive_link, initial_response['ts']),
-            daemon=True
-        ).start()
+        # Queue background processing on the bounded CPU worker pool
+        submit_result = job_scheduler.submit(
+            'cpu', user_id, 'analyze', perform_dataroom_analysis,
+            client, channel_id, user_id, drive_link, initial_response['ts'], body.get('team_id')
+        )
+        queue_message = format_queue_position(submit_result)
+        if queue_message:
+            client.chat_update(
+                channel=channel_id,
+                ts=initial_response['ts'],
+                text=("🔍 **Analysis Request Received**\n\n" if submit_result.accepted else "❌ **Analysis Not Started**\n\n") +
+                     f"📁 Link: *{drive_link}*\n" +
+                     queue_message
+            )
 
     except Exception as e:
         logger.error(f"❌ Error in analyze command: {e}")
@@ -232,6 +274,14 @@ def debug_sessions(user_id, channel_id, client):
         if 'analysis_result' in session_data:
             response += f"• Analysis result available: ✅\n"
 
+        analysis_session = session_data.get('analysis_session')
+        if analysis_session is not None:
+            response += f"• AI Q&A context available: {'✅' if analysis_session.has_analysis else '❌'}\n"
+            if analysis_session.financial_data_hash is not None:
+                response += (f"• Financial extraction: {analysis_session.financial_extraction_seconds * 1000:.0f}ms once, "
+                             f"reused {analysis_session.financial_cache_hits}x "
+                             f"(~{analysis_session.financial_time_saved_seconds:.2f}s saved)\n")
+
         if 'market_research' in session_data:
             response += f"• Market research available: ✅\n"
             
@@ -258,8 +308,10 @@ def debug_sessions(user_id, channel_id, client):
         text=response
     )
 
-def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_ts):
-    """Perform the complete data room analysis with AI"""
+def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_ts, team_id=None):
+    """Download and extract a data room (CPU pool), then queue its AI analysis on the network pool"""
+    workspace = None
+    handed_off = False
     try:
         # PRODUCTION MODE: Force TEST_MODE=false for Railway deployment
         PRODUCTION_MODE = os.getenv('PRODUCTION_MODE', 'false').lower() == 'true'  # Set to False for local development
@@ -275,17 +327,20 @@ def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_t
         logger.info(f"🔍 Will skip GPT-5: {'YES ✅' if test_mode_check else 'NO ❌ (WILL USE GPT-5)'}")
         logger.info(f"🔍 ========================================")
 
-        # Step 1: Download documents
-        client.chat_update(
-            channel=channel_id,
-            ts=message_ts,
-            text="🔍 **Analysis in Progress**\n\n" +
-                 f"📁 Link: {drive_link}\n" +
-                 f"📥 **Downloading documents from Google Drive...**" +
-                 (f"\n\n⚠️ **TEST MODE ACTIVE** - Will skip GPT-5" if test_mode_check else "")
-        )
-
-        downloaded_files = drive_handler.download_dataroom(drive_link)
+        # Steps 1-2: Download and process documents (overlapped, per-file progress in Slack)
+        # into this job's own workspace, so concurrent data rooms never share files
+        workspace = workspace_manager.acquire_job(user_id)
+        try:
+            pipeline = DataroomPipeline(
+                drive_handler, doc_processor,
+                slack_client=client, channel=channel_id, message_ts=message_ts,
+                header="🔍 **Analysis in Progress**\n\n" + f"📁 Link: {drive_link}\n",
+                footer=(f"\n\n⚠️ **TEST MODE ACTIVE** - Will skip GPT-5" if test_mode_check else ""),
+                workspace=workspace
+            )
+            downloaded_files, processed_documents = pipeline.run(drive_link)
+        finally:
+            workspace_manager.release(workspace)
 
         if not downloaded_files:
             client.chat_update(
@@ -297,17 +352,6 @@ def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_t
             )
             return
 
-        # Step 2: Process documents
-        client.chat_update(
-            channel=channel_id,
-            ts=message_ts,
-            text="🔍 **Analysis in Progress**\n\n" +
-                 f"📄 Found {len(downloaded_files)} documents\n" +
-                 f"📖 **Processing document contents...**" +
-                 (f"\n\n⚠️ **TEST MODE ACTIVE** - Will skip GPT-5" if test_mode_check else "")
-        )
-
-        processed_documents = doc_processor.process_dataroom_documents(downloaded_files)
         document_summary = doc_processor.get_content_summary(processed_documents)
 
         # Check for test mode - create mock analysis but use proper formatting
@@ -390,6 +434,7 @@ def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_t
                 'processed_documents': processed_documents,
                 'drive_link': drive_link,
                 'market_profile': mock_market_profile,  # Store for /market-research
+                'workspace_id': workspace.workspace_id,
                 'test_mode': True
             }
 
@@ -401,55 +446,30 @@ def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_t
         logger.info("📊 TEST_MODE is not active, proceeding with GPT-5 analysis")
         
         if ai_analyzer and config.openai_configured:
+            # Step 3 is LLM-bound: hand it to the network pool so this CPU worker can
+            # start extracting the next data room instead of waiting on the API
+            # (status posted first: once queued, the AI job owns the message)
             client.chat_update(
                 channel=channel_id,
                 ts=message_ts,
                 text="🔍 **Analysis in Progress**\n\n" +
                      f"📄 Processed {document_summary['successful_processing']} documents\n" +
-                     f"🧠 **Analyzing with AI (GPT-5)...**"
+                     f"🧠 **Waiting for AI analysis...**"
             )
-
-            analysis_result = ai_analyzer.analyze_dataroom(processed_documents, document_summary)
-
-            # Get market taxonomy for context (minimal cost - ~$0.01)
-            market_profile = None
-            if market_research_orchestrator:
-                try:
-                    market_profile = market_research_orchestrator.market_detector.detect_vertical(
-                        processed_documents, document_summary
-                    )
-                    logger.info(f"✅ Market taxonomy detected: {market_profile.vertical}/{market_profile.sub_vertical}")
-                except Exception as e:
-                    logger.warning(f"⚠️ Market taxonomy detection failed: {e}")
-
-            # Format and send AI analysis response with market taxonomy
-            formatted_response = format_analysis_response(analysis_result, document_summary, market_profile)
-
-            # Enhanced response to mention market research
-            if market_research_orchestrator:
-                formatted_response += "\n\nUse `/market-research` for comprehensive market intelligence analysis."
-            
-
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text=formatted_response
+            submit_result = job_scheduler.submit(
+                'network', user_id, 'analyze.ai', perform_ai_analysis,
+                client, channel_id, user_id, drive_link, message_ts, team_id,
+                processed_documents, document_summary, workspace
             )
-
-            # CRITICAL: Store analysis in user session
-            user_sessions[user_id] = {
-                'analysis_result': analysis_result,
-                'document_summary': document_summary,
-                'processed_documents': processed_documents,
-                'drive_link': drive_link,
-                'market_profile': market_profile,  # Store for /market-research
-                'analysis_timestamp': datetime.now().isoformat()
-            }
-            
-            # DEBUG: Log session storage
-            logger.info(f"✅ PRODUCTION MODE - Session stored for user {user_id}")
-            logger.info(f"✅ PRODUCTION MODE - With GPT-5 analysis results")
-            logger.info(f"✅ PRODUCTION MODE - Active sessions: {list(user_sessions.keys())}")
+            handed_off = submit_result.accepted
+            if not handed_off:
+                client.chat_update(
+                    channel=channel_id,
+                    ts=message_ts,
+                    text="❌ **Analysis Not Completed**\n\n" +
+                         f"📄 Processed {document_summary['successful_processing']} documents\n" +
+                         format_queue_position(submit_result)
+                )
 
         else:
             # Fallback: Document processing only
@@ -474,22 +494,109 @@ def perform_dataroom_analysis(client, channel_id, user_id, drive_link, message_t
                 'processed_documents': processed_documents,
                 'document_summary': document_summary,
                 'drive_link': drive_link,
+                'workspace_id': workspace.workspace_id,
                 'analysis_timestamp': datetime.now().isoformat()
             }
             
             logger.info(f"✅ FALLBACK MODE - Session stored for user {user_id}")
+            logger.info(f"✅ Analysis completed for user {user_id}")
+            logger.info("💾 Session data preserved (temp files NOT cleaned)")
+
+    except Exception as e:
+        logger.error(f"❌ Analysis failed: {e}")
+        logger.error(f"❌ Full traceback: ", exc_info=True)
+        client.chat_update(
+            channel=channel_id,
+            ts=message_ts,
+            text=format_error_response("analysis", str(e))
+        )
+    finally:
+        # Once handed off, the AI job settles the workspace when it stores the session
+        if workspace is not None and not handed_off:
+            _settle_workspace(user_id, workspace)
+
+def perform_ai_analysis(client, channel_id, user_id, drive_link, message_ts, team_id,
+                        processed_documents, document_summary, workspace):
+    """Step 3 of /analyze: AI analysis of extracted documents (network pool)"""
+    try:
+        client.chat_update(
+            channel=channel_id,
+            ts=message_ts,
+            text="🔍 **Analysis in Progress**\n\n" +
+                 f"📄 Processed {document_summary['successful_processing']} documents\n" +
+                 f"🧠 **Analyzing with AI (GPT-5)...**"
+        )
+
+        analysis_session = AnalysisSession()
+        analysis_result = ai_analyzer.analyze_dataroom(processed_documents, document_summary, analysis_session)
+
+        # Get market taxonomy for context (minimal cost - ~$0.01)
+        market_profile = None
+        if market_research_orchestrator:
+            try:
+                market_profile = market_research_orchestrator.market_detector.detect_vertical(
+                    processed_documents, document_summary
+                )
+                logger.info(f"✅ Market taxonomy detected: {market_profile.vertical}/{market_profile.sub_vertical}")
+            except Exception as e:
+                logger.warning(f"⚠️ Market taxonomy detection failed: {e}")
+
+        # Format and send AI analysis response with market taxonomy
+        formatted_response = format_analysis_response(analysis_result, document_summary, market_profile)
+
+        # Enhanced response to mention market research
+        if market_research_orchestrator:
+            formatted_response += "\n\nUse `/market-research` for comprehensive market intelligence analysis."
+        
+
+        client.chat_update(
+            channel=channel_id,
+            ts=message_ts,
+            text=formatted_response
+        )
+
+        # CRITICAL: Store analysis in user session
+        user_sessions[user_id] = {
+            'analysis_result': analysis_result,
+            'document_summary': document_summary,
+            'processed_documents': processed_documents,
+            'drive_link': drive_link,
+            'market_profile': market_profile,  # Store for /market-research
+            'analysis_session': analysis_session,  # Per-user AI context for /ask, /memo, /gaps
+            'workspace_id': workspace.workspace_id,
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+        
+        # DEBUG: Log session storage
+        logger.info(f"✅ PRODUCTION MODE - Session stored for user {user_id}")
+        logger.info(f"✅ PRODUCTION MODE - With GPT-5 analysis results")
+        logger.info(f"✅ PRODUCTION MODE - Active sessions: {list(user_sessions.keys())}")
+
+        # Optional: generate /memo and /gaps in the background, most analysts run both next
+        if config.SPECULATIVE_PRECOMPUTE_ENABLED and 'error' not in analysis_result:
+            speculative_precomputer.start(analysis_session, user_id, team_id,
+                                          on_result=lambda session, kind: _store_speculative_result(user_id, session, kind))
 
         logger.info(f"✅ Analysis completed for user {user_id}")
-        logger.info("💾 Session data preserved (temp files NOT cleaned)")
 
     except Exception as e:
-        logger.error(f"❌ Analysis failed: {e}")
+        logger.error(f"❌ AI analysis failed: {e}")
         logger.error(f"❌ Full traceback: ", exc_info=True)
         client.chat_update(
             channel=channel_id,
             ts=message_ts,
             text=format_error_response("analysis", str(e))
         )
+    finally:
+        _settle_workspace(user_id, workspace)
+
+def _settle_workspace(user_id, workspace):
+    """Keep only the workspace of the user's current session; a failed or superseded job's is removed"""
+    session = user_sessions.get(user_id) or {}
+    if session.get('workspace_id') == workspace.workspace_id:
+        workspace_manager.discard_owner(user_id, keep=workspace.workspace_id)
+    else:
+        workspace_manager.discard(workspace.workspace_id)
 
 def format_processing_results(processed_documents, document_summary, drive_link):
     """Format the processing results when AI is not available"""
@@ -586,6 +693,38 @@ def format_size(size):
     else:
         return f"{size//1000000}M chars"
 
+def _command_streamer(client, channel_id, command, header, progress_ts):
+    """Streamer for an LLM command reply; edits the progress message, or posts once when streaming is off"""
+    if not config.SLACK_STREAMING_ENABLED:
+        progress_ts = None  # Final answer goes out as a new message, like before streaming
+    return SlackMessageStreamer(client, channel_id, command, header=header, ts=progress_ts)
+
+def _current_analysis_session(user_id, analysis_session):
+    """The stored AnalysisSession if it is (a reloaded copy of) analysis_session, else None"""
+    current = (user_sessions.get(user_id) or {}).get('analysis_session')
+    if analysis_session is None or current is None or current.session_id != analysis_session.session_id:
+        return None
+    return current
+
+def _persist_analysis_session(user_id, analysis_session):
+    """
+    Write a mutated AnalysisSession back to the session store, unless a newer /analyze replaced it
+
+    Only memoized data and counters change here, so the disk write waits for the next checkpoint.
+    """
+    if _current_analysis_session(user_id, analysis_session) is not None:
+        user_sessions.update_session(user_id, persist=False, analysis_session=analysis_session)
+
+def _store_speculative_result(user_id, analysis_session, kind):
+    """Save a speculative result into the stored session, even if the store has reloaded it since"""
+    current = _current_analysis_session(user_id, analysis_session)
+    if current is not None:
+        current.speculative_results[kind] = analysis_session.speculative_results[kind]
+        user_sessions.update_session(user_id, analysis_session=current)
+
+def _stream_callback(streamer):
+    return streamer.append if config.SLACK_STREAMING_ENABLED else None
+
 # ==========================================
 # PHASE 2B: FIXED MARKET RESEARCH COMMANDS
 # ==========================================
@@ -665,12 +804,13 @@ def handle_ask_command(ack, body, client):
             return
         
         # Show progress message for complex questions
+        progress_ts = None
         if len(question) > 20:  # Only show for non-trivial questions
             try:
-                client.chat_postMessage(
+                progress_ts = client.chat_postMessage(
                     channel=channel_id,
                     text=f"🤔 **Analyzing Your Question...**\n\n❓ *\"{question}\"*\n\n⏳ Searching through analyzed documents for relevant information..."
-                )
+                )['ts']
             except:
                 pass  # Don't fail if progress message fails
 
@@ -709,8 +849,10 @@ def handle_ask_command(ack, body, client):
             return
 
         logger.info("🤖 Calling AI analyzer...")
-        # Get answer from AI
-        answer = ai_analyzer.answer_question(question)
+        # Get answer from AI, streamed into the progress message as it is generated
+        streamer = _command_streamer(client, channel_id, "ask", f"💡 **Question:** {question}\n\n**Answer:**\n", progress_ts)
+        answer = ai_analyzer.answer_question(session_data.get('analysis_session'), question,
+                                             on_delta=_stream_callback(streamer))
         logger.info(f"✅ AI response received: {len(answer)} chars")
 
         response = f"💡 **Question:** {question}\n\n" +\
@@ -723,12 +865,12 @@ def handle_ask_command(ack, body, client):
 
         response += "*"
 
-        client.chat_postMessage(
-            channel=channel_id,
-            text=response
-        )
+        streamer.finish(response)
         logger.info("✅ Response sent to Slack")
 
+        # The financial memo and its counters live on the analysis session
+        _persist_analysis_session(user_id, session_data.get('analysis_session'))
+
     except Exception as e:
         logger.error(f"❌ Error in ask command: {e}")
         logger.error(f"❌ Full error: {str(e)}")
@@ -792,7 +934,7 @@ def handle_scoring_command(ack, body, client):
             )
             return
 
-        scoring_data = ai_analyzer.get_detailed_scoring()
+        scoring_data = ai_analyzer.get_detailed_scoring(session_data.get('analysis_session'))
 
         if 'error' in scoring_data:
             client.chat_postMessage(
@@ -837,12 +979,13 @@ def handle_memo_command(ack, body, client):
     ack()
     
     # Immediate progress message for better UX
+    progress_ts = None
     try:
         channel_id = body['channel_id']
-        client.chat_postMessage(
+        progress_ts = client.chat_postMessage(
             channel=channel_id,
             text="📝 **Building Investment Memo...**\n\n⏳ Analyzing data room documents and generating comprehensive investment memo. This may take a few moments..."
-        )
+        )['ts']
     except:
         pass  # Don't fail if progress message fails
 
@@ -886,7 +1029,11 @@ def handle_memo_command(ack, body, client):
             )
             return
 
-        memo = ai_analyzer.generate_investment_memo()
+        streamer = _command_streamer(client, channel_id, "memo", "📄 **INVESTMENT MEMO**\n\n", progress_ts)
+        memo = speculative_precomputer.take(session_data.get('analysis_session'), 'memo')
+        if memo is None:
+            memo = ai_analyzer.generate_investment_memo(session_data.get('analysis_session'),
+                                                        on_delta=_stream_callback(streamer))
 
         response = "📄 **INVESTMENT MEMO**\n\n" + memo
 
@@ -895,10 +1042,8 @@ def handle_memo_command(ack, body, client):
             response += "\n\n📊 **Market Intelligence Integrated**\n"
             response += "This memo includes market research insights."
 
-        client.chat_postMessage(
-            channel=channel_id,
-            text=response
-        )
+        streamer.finish(response)
+        _persist_analysis_session(user_id, session_data.get('analysis_session'))
 
     except Exception as e:
         logger.error(f"❌ Error in memo command: {e}")
@@ -913,12 +1058,13 @@ def handle_gaps_command(ack, body, client):
     ack()
     
     # Immediate progress message for better UX
+    progress_ts = None
     try:
         channel_id = body['channel_id']
-        client.chat_postMessage(
+        progress_ts = client.chat_postMessage(
             channel=channel_id,
             text="🔍 **Gaps Analysis in Progress...**\n\n⏳ Identifying missing information and potential data room gaps. Analyzing documentation comprehensiveness..."
-        )
+        )['ts']
     except:
         pass  # Don't fail if progress message fails
 
@@ -963,7 +1109,11 @@ def handle_gaps_command(ack, body, client):
             )
             return
 
-        gaps_analysis = ai_analyzer.analyze_gaps()
+        streamer = _command_streamer(client, channel_id, "gaps", "🔍 **INFORMATION GAPS ANALYSIS**\n\n", progress_ts)
+        gaps_analysis = speculative_precomputer.take(session_data.get('analysis_session'), 'gaps')
+        if gaps_analysis is None:
+            gaps_analysis = ai_analyzer.analyze_gaps(session_data.get('analysis_session'),
+                                                     on_delta=_stream_callback(streamer))
 
         response = "🔍 **INFORMATION GAPS ANALYSIS**\n\n" + gaps_analysis
 
@@ -972,10 +1122,8 @@ def handle_gaps_command(ack, body, client):
             response += "\n\n📊 **Market Research Recommendation**\n"
             response += "Consider market intelligence data for deeper gap analysis."
 
-        client.chat_postMessage(
-            channel=channel_id,
-            text=response
-        )
+        streamer.finish(response)
+        _persist_analysis_session(user_id, session_data.get('analysis_session'))
 
     except Exception as e:
         logger.error(f"❌ Error in gaps command: {e}")
@@ -993,23 +1141,18 @@ def handle_reset_command(ack, body, client):
         user_id = body['user_id']
         channel_id = body['channel_id']
 
-        # Clear user session
+        # Clear user session (includes the user's AI analysis context)
         if user_id in user_sessions:
             del user_sessions[user_id]
 
-        # Reset AI analyzer if available
-        if ai_analyzer:
-            ai_analyzer.reset_analysis()
-
         # Reset market research orchestrator if available
         if market_research_orchestrator:
             # Market research orchestrator reset (placeholder)
             pass
 
-        # FIX #2: NOW is the right time to cleanup temp files
-        if drive_handler:
-            drive_handler.cleanup_temp_files()
-            logger.info("🗑️ Cleaned up temporary files in /reset command")
+        # FIX #2: NOW is the right time to cleanup temp files (this user's workspaces only)
+        workspace_manager.discard_owner(user_id)
+        logger.info("🗑️ Cleaned up temporary files in /reset command")
 
         client.chat_postMessage(
             channel=channel_id,
@@ -1177,6 +1320,9 @@ def main():
         logger.info(f"🔧 Market Research Orchestrator: {'✅' if market_research_orchestrator else '❌'}")
         logger.info(f"🔧 Market Research Handler: {'✅' if market_research_handler else '❌'}")
 
+        # Load the tokenizer before the first /analyze needs it (may download it once)
+        preload_token_encoding()
+
         # Start Slack bot in background thread
         if config.slack_configured:
             slack_thread = threading.Thread(target=run_slack_bot, daemon=True)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for document extraction
+Compares serial vs parallel process_dataroom_documents wall time over the PDFs in docs/
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Measure raw extraction, not cache lookups
+os.environ.setdefault('EXTRACTION_CACHE_ENABLED', 'false')
+os.environ.setdefault('TEMP_STORAGE_PATH', tempfile.mkdtemp(prefix='extraction_bench_'))
+
+from handlers.doc_processor import DocumentProcessor
+
+def collect_pdfs(repeat: int = 1):
+    """Build a downloaded_files list from docs/*.pdf (optionally repeated to simulate larger rooms)"""
+    docs_dir = Path(__file__).parent / 'docs'
+    pdfs = sorted(docs_dir.glob('*.pdf'))
+    return [
+        {'name': f"{i}_{pdf.name}", 'path': str(pdf), 'mime_type': 'application/pdf'}
+        for i in range(repeat) for pdf in pdfs
+    ]
+
+def run(processor: DocumentProcessor, files, parallel: bool):
+    start = time.time()
+    results = processor.process_dataroom_documents(files, parallel=parallel)
+    return time.time() - start, results
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    files = collect_pdfs(repeat)
+    if not files:
+        print("❌ No PDFs found in docs/")
+        return False
+
+    print(f"\n📊 EXTRACTION BENCHMARK: {len(files)} files, {os.cpu_count()} CPU cores")
+    processor = DocumentProcessor()
+
+    serial_time, serial_results = run(processor, files, parallel=False)
+    parallel_time, parallel_results = run(processor, files, parallel=True)
+
+    same_output = [doc['content'] for doc in serial_results] == [doc['content'] for doc in parallel_results]
+    print(f"Serial:   {serial_time:.2f}s")
+    print(f"Parallel: {parallel_time:.2f}s")
+    print(f"Speedup:  {serial_time / parallel_time:.2f}x" if parallel_time else "Speedup: n/a")
+    print(f"Identical output & order: {'✅ YES' if same_output else '❌ NO'}")
+    return same_output
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
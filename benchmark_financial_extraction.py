@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for financial data extraction
+Compares pattern-by-pattern scanning vs the single-pass scanner on a multi-megabyte corpus built from docs/
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.financial_extractor import FinancialDataExtractor
+
+def load_corpus(target_mb: float):
+    """Text of docs/*.pdf and docs/*.md, repeated up to target_mb megabytes"""
+    docs_dir = Path(__file__).parent / 'docs'
+    texts = [md.read_text(encoding='utf-8', errors='ignore') for md in sorted(docs_dir.glob('*.md'))]
+    try:
+        import PyPDF2
+        for pdf in sorted(docs_dir.glob('*.pdf')):
+            reader = PyPDF2.PdfReader(str(pdf))
+            texts.append("\n".join(page.extract_text() or '' for page in reader.pages))
+    except Exception as e:
+        print(f"⚠️ Skipping PDFs: {e}")
+
+    base = "\n\n".join(texts)
+    if not base:
+        return ""
+    target_chars = int(target_mb * 1024 * 1024)
+    return (base * (target_chars // len(base) + 1))[:target_chars]
+
+def run(extractor: FinancialDataExtractor, content: str):
+    start = time.time()
+    result = extractor.extract_all_financial_data(content)
+    return time.time() - start, result
+
+def as_documents(content: str, page_chars: int = 3000):
+    """The corpus as one processed document with a page marker every page_chars characters"""
+    pages = [content[i:i + page_chars] for i in range(0, len(content), page_chars)]
+    paged = "".join(f"\n--- Page {number} ---\n{text}" for number, text in enumerate(pages, 1))
+    return [{'name': 'corpus.pdf', 'type': 'pdf', 'content': paged}]
+
+def main():
+    target_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    content = load_corpus(target_mb)
+    if not content:
+        print("❌ No documents found in docs/")
+        return False
+
+    print(f"\n📊 FINANCIAL EXTRACTION BENCHMARK: {len(content) / (1024 * 1024):.1f} MB")
+
+    per_pattern_time, per_pattern_result = run(FinancialDataExtractor(single_pass=False), content)
+    single_pass_time, single_pass_result = run(FinancialDataExtractor(single_pass=True), content)
+
+    documents = as_documents(content)
+    start = time.time()
+    records = FinancialDataExtractor().extract_records(documents)
+    structured_time = time.time() - start
+
+    identical = per_pattern_result == single_pass_result
+    print(f"Pattern by pattern: {per_pattern_time:.2f}s")
+    print(f"Single pass:        {single_pass_time:.2f}s")
+    print(f"Speedup:            {per_pattern_time / single_pass_time:.2f}x" if single_pass_time else "Speedup: n/a")
+    print(f"Structured records: {structured_time:.2f}s ({len(records)} records, "
+          f"{len(set(records.pages))} pages cited)")
+    print(f"Identical results:  {'✅ YES' if identical else '❌ NO'}")
+    return identical
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the LLM gateway
+Runs concurrent calls against a local fake OpenAI-compatible server that injects 429/500 errors and latency
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('LLM_BACKOFF_BASE_SECONDS', '0.05')
+os.environ.setdefault('LLM_BACKOFF_MAX_SECONDS', '0.5')
+
+from utils.llm_gateway import LLMGateway
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Chat completions endpoint with configurable latency and error rate; tracks peak concurrency"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, error_rate: float):
+        super().__init__(('127.0.0.1', 0), FakeOpenAIHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(7)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+        self.errors = 0
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            fail = server.rng.random() < server.error_rate
+            status = server.rng.choice([429, 500, 503]) if fail else 200
+            if fail:
+                server.errors += 1
+        try:
+            time.sleep(server.latency)
+            if status != 200:
+                self._json(status, {'error': {'message': f'injected {status}', 'type': 'fake'}},
+                           {'Retry-After': '0'} if status == 429 else {})
+            elif body.get('stream'):
+                self._stream(body)
+            else:
+                self._json(200, {
+                    'id': 'fake', 'object': 'chat.completion', 'created': int(time.time()), 'model': body.get('model'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': 'fake answer'}}],
+                    'usage': {'prompt_tokens': 100, 'completion_tokens': 20, 'total_tokens': 120}
+                })
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for word in ['fake ', 'streamed ', 'answer']:
+            chunk = {'id': 'fake', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                     'model': body.get('model'),
+                     'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    server = FakeOpenAIServer(latency=0.05, error_rate=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gateway = LLMGateway(max_concurrency=4, tokens_per_minute=1_000_000, max_retries=6,
+                         base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", api_key='fake')
+
+    print(f"\n📊 LLM GATEWAY BENCHMARK: {calls} calls, concurrency 4, 20% injected 429/5xx")
+
+    def call(i):
+        deltas = []
+        try:
+            text = gateway.chat('benchmark.stream' if i % 4 == 0 else 'benchmark', [{'role': 'user', 'content': f'q{i}'}],
+                                max_tokens=50, on_delta=deltas.append if i % 4 == 0 else None)
+            return text in ('fake answer', 'fake streamed answer')
+        except Exception as e:
+            print(f"❌ call {i}: {e}")
+            return False
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(call, range(calls)))
+    elapsed = time.time() - start
+    server.shutdown()
+
+    stats = gateway.stats()
+    print(f"Succeeded:         {sum(results)}/{calls} in {elapsed:.2f}s")
+    print(f"Server requests:   {server.requests} ({server.errors} injected errors)")
+    print(f"Peak concurrency:  {server.peak} (limit {gateway.max_concurrency})")
+    for site, site_stats in stats['call_sites'].items():
+        print(f"{site:<18} {site_stats}")
+    return all(results) and server.peak <= gateway.max_concurrency
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for market research progress tracking
+Runs the orchestrator with mocked detection, searches and synthesis; fails if tracking adds over 100 ms
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ['TEST_MODE'] = 'false'
+
+import utils.expert_formatter as expert_formatter
+from agents.market_detection import MarketProfile
+from agents.market_research_orchestrator import MarketResearchOrchestrator
+from agents.progress_tracker import create_slack_progress_tracker
+
+DETECTION_SECONDS = 0.2
+SEARCH_SECONDS = 0.3  # Each of the three concurrent searches
+SYNTHESIS_SECONDS = 0.2
+MAX_OVERHEAD_SECONDS = 0.1
+
+class FakeSlackClient:
+    """Records chat_update calls per message"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.updates = {}
+
+    def chat_update(self, channel, ts, text):
+        with self.lock:
+            self.updates.setdefault(ts, []).append(text)
+
+def mock_orchestrator() -> MarketResearchOrchestrator:
+    orchestrator = MarketResearchOrchestrator()
+
+    def detect_vertical(processed_documents, document_summary):
+        time.sleep(DETECTION_SECONDS)
+        return MarketProfile(vertical="fintech", sub_vertical="payments", solution="b2b payments",
+                             industry="financial services", confidence_score=0.9)
+
+    def search(market_profile):
+        time.sleep(SEARCH_SECONDS)
+        return {'all_sources': [{'url': f'https://example.com/{i}', 'title': f'Source {i}'} for i in range(3)]}
+
+    def synthesize(all_web_sources):
+        time.sleep(SYNTHESIS_SECONDS)
+        return f"Synthesis of {len(all_web_sources)} sources"
+
+    orchestrator.market_detector.detect_vertical = detect_vertical
+    orchestrator._search_competitive_intelligence = search
+    orchestrator._search_market_validation = search
+    orchestrator._search_funding_intelligence = search
+    expert_formatter.synthesize_market_intelligence_with_gpt4 = synthesize
+    return orchestrator
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    orchestrator = mock_orchestrator()
+    slack = FakeSlackClient()
+    io_seconds = DETECTION_SECONDS + SEARCH_SECONDS + SYNTHESIS_SECONDS
+
+    print(f"\n📊 MARKET RESEARCH BENCHMARK: {runs} concurrent runs on one orchestrator, "
+          f"{io_seconds * 1000:.0f} ms of mocked I/O each")
+
+    def run(i):
+        tracker = create_slack_progress_tracker(slack, 'C1', f'ts-{i}')
+        start = time.time()
+        result = orchestrator.perform_market_intelligence([], {}, progress_tracker=tracker)
+        elapsed = time.time() - start
+        phases_ok = all(phase.status == "completed" for phase in tracker.phases)
+        return elapsed - io_seconds, phases_ok and result.final_analysis is not None, len(tracker.events)
+
+    with ThreadPoolExecutor(max_workers=runs) as pool:
+        results = list(pool.map(run, range(runs)))
+
+    worst_overhead = max(overhead for overhead, _, _ in results)
+    all_completed = all(ok for _, ok, _ in results)
+    events_per_run = {events for _, _, events in results}
+    # Each run updates only its own message: 10 phase events (start + finish for 5 phases)
+    own_updates = all(len(slack.updates.get(f'ts-{i}', [])) == 10 for i in range(runs))
+
+    print(f"Overhead per run:  {', '.join(f'{overhead * 1000:.1f} ms' for overhead, _, _ in results)}")
+    print(f"Worst overhead:    {worst_overhead * 1000:.1f} ms (limit {MAX_OVERHEAD_SECONDS * 1000:.0f} ms)")
+    print(f"All phases done:   {all_completed}")
+    print(f"Events per run:    {sorted(events_per_run)}")
+    print(f"Updates per msg:   {[len(slack.updates.get(f'ts-{i}', [])) for i in range(runs)]}")
+    return worst_overhead < MAX_OVERHEAD_SECONDS and all_completed and own_updates
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -43,6 +43,29 @@ class Config:
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4")
     OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.3"))
     OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")  # e.g. a proxy or a local fake server
+
+    # Shared LLM gateway (utils.llm_gateway): one pooled client for every call site
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "40000"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_BASE_SECONDS: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+    LLM_BACKOFF_MAX_SECONDS: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+    LLM_REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "120"))
+    LLM_CALL_DEADLINE_SECONDS: float = float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "180"))
+
+    # Opt-in LLM response cache (replays of byte-identical prompts skip the API)
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+    LLM_CACHE_TTL_HOURS: float = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+    LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "200"))
+
+    # Opt-in speculative /memo and /gaps, generated in the background after /analyze
+    SPECULATIVE_PRECOMPUTE_ENABLED: bool = os.getenv("SPECULATIVE_PRECOMPUTE_ENABLED", "false").lower() == "true"
+    SPECULATIVE_DAILY_COST_CAP_USD: float = float(os.getenv("SPECULATIVE_DAILY_COST_CAP_USD", "5.0"))  # Per Slack workspace
+    SPECULATIVE_ATTACH_TIMEOUT_SECONDS: float = float(os.getenv("SPECULATIVE_ATTACH_TIMEOUT_SECONDS", "120"))
+    # Background (speculative) LLM calls yield: gateway slots and share of TPM they can't touch
+    LLM_INTERACTIVE_RESERVED_SLOTS: int = int(os.getenv("LLM_INTERACTIVE_RESERVED_SLOTS", "2"))
+    LLM_BACKGROUND_TPM_RESERVE: float = float(os.getenv("LLM_BACKGROUND_TPM_RESERVE", "0.25"))
 
     @property
     def openai_configured(self) -> bool:
@@ -87,6 +110,19 @@ class Config:
     def google_drive_configured(self) -> bool:
         return self.google_credentials_json is not None
 
+    # Google Drive folder traversal (breadth-first, paginated)
+    DRIVE_MAX_DEPTH: int = int(os.getenv("DRIVE_MAX_DEPTH", "5"))
+    DRIVE_MAX_LISTED_FILES: int = int(os.getenv("DRIVE_MAX_LISTED_FILES", "500"))
+    DRIVE_LIST_PARENT_BATCH: int = int(os.getenv("DRIVE_LIST_PARENT_BATCH", "10"))
+    DRIVE_LIST_PAGE_SIZE: int = int(os.getenv("DRIVE_LIST_PAGE_SIZE", "1000"))
+
+    # Google Drive downloads (streamed to disk, concurrent, retried on 429/5xx)
+    DRIVE_DOWNLOAD_WORKERS: int = int(os.getenv("DRIVE_DOWNLOAD_WORKERS", "4"))
+    DRIVE_DOWNLOAD_CHUNK_MB: int = int(os.getenv("DRIVE_DOWNLOAD_CHUNK_MB", "8"))
+    DRIVE_DOWNLOAD_RETRIES: int = int(os.getenv("DRIVE_DOWNLOAD_RETRIES", "4"))
+    DRIVE_DOWNLOAD_BACKOFF_SECONDS: float = float(os.getenv("DRIVE_DOWNLOAD_BACKOFF_SECONDS", "1.0"))
+    DRIVE_DOWNLOAD_TIMEOUT_SECONDS: int = int(os.getenv("DRIVE_DOWNLOAD_TIMEOUT_SECONDS", "60"))
+
     # ==========================================
     # CLOUD DEPLOYMENT SETTINGS
     # ==========================================
@@ -133,6 +169,23 @@ class Config:
         temp_path.mkdir(parents=True, exist_ok=True)
         return temp_path
 
+    @property
+    def cache_dir(self) -> Path:
+        """Persistent caches live in a subdirectory so temp file cleanup leaves them alone"""
+        cache_path = self.temp_dir / "cache"
+        cache_path.mkdir(parents=True, exist_ok=True)
+        return cache_path
+
+    @property
+    def session_dir(self) -> Path:
+        """Persisted user sessions (kept out of the temp file cleanup path)"""
+        session_path = self.temp_dir / "sessions"
+        session_path.mkdir(parents=True, exist_ok=True)
+        return session_path
+
+    # Per-session download workspaces (idle workspaces evicted LRU over the budget)
+    WORKSPACE_DISK_BUDGET_MB: int = int(os.getenv("WORKSPACE_DISK_BUDGET_MB", "2048"))
+
     # Processing limits
     TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", "300"))
     MAX_FILES_PER_DATAROOM = int(os.getenv("MAX_FILES", "20"))
@@ -141,6 +194,84 @@ class Config:
     MAX_DOCUMENTS_PER_DATAROOM: int = int(os.getenv("MAX_DOCUMENTS_PER_DATAROOM", "20"))
     MAX_PAGES_PER_PDF: int = int(os.getenv("MAX_PAGES_PER_PDF", "100"))
 
+    # Market research concurrency (search phases 2-4 run as one concurrent stage)
+    MARKET_RESEARCH_MAX_WORKERS: int = int(os.getenv("MARKET_RESEARCH_MAX_WORKERS", "3"))
+    MARKET_RESEARCH_PHASE_TIMEOUT_SECONDS: int = int(os.getenv("MARKET_RESEARCH_PHASE_TIMEOUT_SECONDS", "90"))
+
+    # Web search fan-out: concurrent queries per search_multiple call and
+    # per-provider token-bucket limits shared across all searches (requests/second, burst)
+    SEARCH_MAX_CONCURRENCY: int = int(os.getenv("SEARCH_MAX_CONCURRENCY", "6"))
+    SEARCH_RATE_LIMITS: dict = {
+        "tavily": (float(os.getenv("TAVILY_RATE_PER_SECOND", "4")), float(os.getenv("TAVILY_BURST", "6"))),
+        "duckduckgo": (float(os.getenv("DUCKDUCKGO_RATE_PER_SECOND", "2")), float(os.getenv("DUCKDUCKGO_BURST", "2"))),
+        "mock": None  # No limit for mock provider
+    }
+
+    # Background job scheduler (bounded worker pools per job class)
+    JOB_CPU_WORKERS: int = int(os.getenv("JOB_CPU_WORKERS", "2"))  # /analyze download + extraction
+    JOB_NETWORK_WORKERS: int = int(os.getenv("JOB_NETWORK_WORKERS", "4"))  # /analyze AI step, market research LLM/search
+    JOB_SPECULATIVE_WORKERS: int = int(os.getenv("JOB_SPECULATIVE_WORKERS", "2"))  # /memo, /gaps precomputed after /analyze
+    JOB_MAX_QUEUE_SIZE: int = int(os.getenv("JOB_MAX_QUEUE_SIZE", "20"))
+
+    # User session store (LRU/TTL in memory, SQLite tier under temp storage)
+    SESSION_TTL_HOURS: float = float(os.getenv("SESSION_TTL_HOURS", "72"))
+    SESSION_MAX_IN_MEMORY: int = int(os.getenv("SESSION_MAX_IN_MEMORY", "20"))
+    SESSION_MEMORY_BUDGET_MB: int = int(os.getenv("SESSION_MEMORY_BUDGET_MB", "256"))
+
+    # Streaming OCR (pages rendered and OCR'd one at a time across a process pool).
+    # With parallel extraction the pages run as tasks on the extraction pool itself
+    # (OCR_MAX_WORKERS then does not apply; EXTRACTION_MAX_WORKERS bounds them)
+    OCR_MAX_PAGES: int = int(os.getenv("OCR_MAX_PAGES", "25"))
+    OCR_MAX_WORKERS: int = int(os.getenv("OCR_MAX_WORKERS", "0"))  # 0 = one per CPU core
+    OCR_MAX_IN_FLIGHT_PAGES: int = int(os.getenv("OCR_MAX_IN_FLIGHT_PAGES", "4"))
+    OCR_DOCUMENT_TIMEOUT_SECONDS: int = int(os.getenv("OCR_DOCUMENT_TIMEOUT_SECONDS", "180"))
+
+    # Parallel per-file extraction (one pool process per file)
+    EXTRACTION_PARALLEL_ENABLED: bool = os.getenv("EXTRACTION_PARALLEL_ENABLED", "true").lower() == "true"
+    EXTRACTION_MAX_WORKERS: int = int(os.getenv("EXTRACTION_MAX_WORKERS", "0"))  # 0 = one per CPU core
+    EXTRACTION_FILE_TIMEOUT_SECONDS: int = int(os.getenv("EXTRACTION_FILE_TIMEOUT_SECONDS", "240"))
+    EXTRACTION_INLINE_RESULT_BYTES: int = int(os.getenv("EXTRACTION_INLINE_RESULT_BYTES", str(1024 * 1024)))
+
+    # Download -> extraction pipeline (bounded hand-off queue)
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+
+    # Content-addressed document extraction cache
+    EXTRACTION_CACHE_ENABLED: bool = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_MAX_MB: int = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "500"))
+
+    # /analyze prompt context (documents packed into a token budget, see utils.context_packer);
+    # the default covers the ~6k tokens the former 25,000-character cut sent. The budget is
+    # lowered further when the rest of the prompt plus the completion would overflow the
+    # model's context window (ANALYSIS_MODEL_CONTEXT_TOKENS, 0 = the model's known window)
+    ANALYSIS_CONTEXT_TOKEN_BUDGET: int = int(os.getenv("ANALYSIS_CONTEXT_TOKEN_BUDGET", "7000"))
+    ANALYSIS_MODEL_CONTEXT_TOKENS: int = int(os.getenv("ANALYSIS_MODEL_CONTEXT_TOKENS", "0"))
+
+    # Map-reduce /analyze for data rooms that don't fit the budget (see handlers.map_reduce_analysis)
+    ANALYSIS_MAP_REDUCE_MODE: str = os.getenv("ANALYSIS_MAP_REDUCE_MODE", "auto").lower()  # auto | always | off
+    ANALYSIS_MAP_REDUCE_THRESHOLD: float = float(os.getenv("ANALYSIS_MAP_REDUCE_THRESHOLD", "0.2"))  # Share of content left out
+    ANALYSIS_MAP_UNIT_TOKENS: int = int(os.getenv("ANALYSIS_MAP_UNIT_TOKENS", "5000"))
+    ANALYSIS_MAP_SUMMARY_TOKENS: int = int(os.getenv("ANALYSIS_MAP_SUMMARY_TOKENS", "350"))
+    ANALYSIS_MAP_MAX_UNITS: int = int(os.getenv("ANALYSIS_MAP_MAX_UNITS", "24"))
+    ANALYSIS_MAP_CONCURRENCY: int = int(os.getenv("ANALYSIS_MAP_CONCURRENCY", "4"))
+    ANALYSIS_REDUCE_TOKEN_BUDGET: int = int(os.getenv("ANALYSIS_REDUCE_TOKEN_BUDGET", "4000"))
+    ANALYSIS_MAP_CACHE_TTL_HOURS: float = float(os.getenv("ANALYSIS_MAP_CACHE_TTL_HOURS", "168"))
+    ANALYSIS_MAP_CACHE_MAX_MB: int = int(os.getenv("ANALYSIS_MAP_CACHE_MAX_MB", "100"))
+
+    # /ask retrieval (BM25 over page-aware chunks of the analyzed documents)
+    RETRIEVAL_CHUNK_CHARS: int = int(os.getenv("RETRIEVAL_CHUNK_CHARS", "1200"))
+    RETRIEVAL_CHUNK_OVERLAP_CHARS: int = int(os.getenv("RETRIEVAL_CHUNK_OVERLAP_CHARS", "200"))
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "8"))
+
+    # Streamed /ask, /memo and /gaps answers (partial text pushed with coalesced chat_update calls)
+    SLACK_STREAMING_ENABLED: bool = os.getenv("SLACK_STREAMING_ENABLED", "true").lower() == "true"
+    SLACK_STREAM_UPDATE_INTERVAL_SECONDS: float = float(os.getenv("SLACK_STREAM_UPDATE_INTERVAL_SECONDS", "1.5"))
+    SLACK_STREAM_UPDATES_PER_SECOND: float = float(os.getenv("SLACK_STREAM_UPDATES_PER_SECOND", "0.8"))
+
+    # Persistent web search cache (SQLite under temp storage)
+    SEARCH_CACHE_ENABLED: bool = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_TTL_HOURS: float = float(os.getenv("SEARCH_CACHE_TTL_HOURS", "72"))
+    SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
     # ==========================================
     # COMPANY SETTINGS (OpenLab + K Fund)
     # ==========================================
@@ -3,67 +3,112 @@ AI Analysis handler for DataRoom Intelligence Bot
 Integrates with OpenAI GPT-5 to analyze data room documents
 """
 
+import hashlib
 import json
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Any, Optional
 from config.settings import config
 from prompts.analysis_prompts import DATAROOM_ANALYSIS_PROMPT, SCORING_PROMPT
 from prompts.qa_prompts import QA_PROMPT, MEMO_PROMPT, GAPS_PROMPT
+from handlers.map_reduce_analysis import MapReduceAnalyzer
+from utils.context_packer import count_chat_tokens, model_context_window, pack_documents
+from utils.llm_gateway import get_llm_gateway
+from utils.financial_extractor import FinancialRecordStore
+from utils.retrieval_index import RetrievalIndex
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+@dataclass
+class AnalysisSession:
+    """Per-user analysis state, stored in the user's session entry"""
+    # Stable identity across pickling: a session reloaded from disk is a new object with the same id
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    current_analysis: Optional[Dict[str, Any]] = None
+    analysis_context: Optional[Dict[str, Any]] = None
+    retrieval_index: Optional[RetrievalIndex] = None  # Built once per analysis for /ask
+
+    # Financial extraction memoized by SHA-256 of the content it was run on
+    financial_records: Optional[FinancialRecordStore] = None  # Page-aware records, built in /analyze
+    financial_data: Optional[Dict[str, Any]] = None  # Text extraction (sessions from before the records)
+    financial_data_hash: Optional[str] = None
+    financial_extraction_seconds: float = 0.0
+    financial_cache_hits: int = 0
+
+    # Speculative /memo and /gaps (see handlers.speculative_precompute; jobs are tracked there)
+    speculative_results: Dict[str, str] = field(default_factory=dict)
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # Sessions pickled before these fields existed load with a fresh id and no results
+        self.__dict__.update(session_id=uuid.uuid4().hex, speculative_results={})
+        self.__dict__.update(state)
+
+    @property
+    def has_analysis(self) -> bool:
+        return bool(self.current_analysis and self.analysis_context)
+
+    @property
+    def financial_time_saved_seconds(self) -> float:
+        return self.financial_cache_hits * self.financial_extraction_seconds
+
 class AIAnalyzer:
-    """Handles AI-powered analysis of data room documents using OpenAI GPT-5"""
+    """
+    Handles AI-powered analysis of data room documents using OpenAI GPT-5
+
+    Stateless and thread-safe: results live in the caller's AnalysisSession,
+    so one analyzer instance can serve concurrent users.
+    """
+
+    NO_ANALYSIS_MESSAGE = "❌ No data room has been analyzed yet. Please run /analyze first."
+
+    ANALYSIS_SYSTEM_MESSAGE = "You are a senior venture capital analyst with 15+ years of experience in due diligence and startup evaluation."
+    ANALYSIS_MAX_TOKENS = 2000
+    PROMPT_SAFETY_MARGIN_TOKENS = 64  # Tokenization across packed page boundaries may differ slightly
 
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.llm = get_llm_gateway()
         self.model = "gpt-4"
-        self.current_analysis = None
-        self.analysis_context = None
+        self.map_reduce = MapReduceAnalyzer(self.llm, self.model)
 
     def analyze_dataroom(self, processed_documents: List[Dict[str, Any]],
-                        document_summary: Dict[str, Any]) -> Dict[str, Any]:
-        """Perform comprehensive data room analysis using GPT-5"""
+                        document_summary: Dict[str, Any],
+                        session: Optional[AnalysisSession] = None) -> Dict[str, Any]:
+        """Perform comprehensive data room analysis using GPT-5 (stored in session for Q&A)"""
         try:
             logger.info("🧠 Starting AI analysis of data room...")
 
-            # Prepare context for analysis
-            context = self._prepare_analysis_context(processed_documents, document_summary)
-
-            # PHASE 1: Extract financial data deterministically
+            # PHASE 1: Extract financial data deterministically, page by page (memoized in the session)
             logger.info("💰 Extracting financial data patterns...")
-            from utils.financial_extractor import extract_financial_data, format_financial_data_for_prompt
-            
-            financial_data = extract_financial_data(context['full_content'])
-            formatted_financials = format_financial_data_for_prompt(financial_data)
-            
-            # Create enhanced analysis prompt with extracted financial data
-            analysis_prompt = DATAROOM_ANALYSIS_PROMPT.format(
-                documents_with_metadata=context['documents_summary'],
-                document_contents=context['full_content'][:25000],  # Increased to ensure financial data is included
-                extracted_financials=formatted_financials
-            )
+            from utils.financial_extractor import format_financial_records_for_prompt
 
-            # Call GPT-5 for analysis
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a senior venture capital analyst with 15+ years of experience in due diligence and startup evaluation."},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.3
-            )
+            financial_records = self._get_financial_records(session, processed_documents)
+            formatted_financials = format_financial_records_for_prompt(financial_records)
+
+            # Prepare context for analysis (content packed into what the rest of the prompt leaves)
+            context = self._prepare_analysis_context(processed_documents, document_summary, formatted_financials)
+            retrieval_index = RetrievalIndex.from_documents(processed_documents)
+            
+            analysis_result = None
+            if self.map_reduce.should_use(context['packing_report']):
+                analysis_result = self._map_reduce_analysis(processed_documents, context, formatted_financials)
 
+            if analysis_result is None:
+                # Create enhanced analysis prompt with extracted financial data
+                analysis_prompt = self._build_analysis_prompt(context, formatted_financials)
+                self._check_prompt_fits(analysis_prompt)
 
+                # Call GPT-5 for analysis
+                analysis_result = self._run_analysis("analyze", analysis_prompt)
 
             # Parse and structure the analysis
-            analysis_result = response.choices[0].message.content
             structured_analysis = self._parse_analysis_response(analysis_result)
             # Store for future Q&A
-            self.current_analysis = structured_analysis
-            self.analysis_context = context
+            if session is not None:
+                session.current_analysis = structured_analysis
+                session.analysis_context = context
+                session.retrieval_index = retrieval_index
 
             logger.info("✅ AI analysis completed successfully")
             return structured_analysis
@@ -79,8 +124,69 @@ class AIAnalyzer:
                 'recommendation': 'TECHNICAL_ERROR'
             }
 
+    def _run_analysis(self, call_site: str, analysis_prompt: str) -> str:
+        return self.llm.chat(
+            call_site,
+            model=self.model,
+            messages=self._analysis_messages(analysis_prompt),
+            max_tokens=self.ANALYSIS_MAX_TOKENS,
+            temperature=0.3
+        )
+
+    def _analysis_messages(self, analysis_prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.ANALYSIS_SYSTEM_MESSAGE},
+            {"role": "user", "content": analysis_prompt}
+        ]
+
+    @staticmethod
+    def _build_analysis_prompt(context: Dict[str, Any], formatted_financials: str) -> str:
+        return DATAROOM_ANALYSIS_PROMPT.format(
+            documents_with_metadata=context['documents_summary'],
+            document_contents=context['packed_content'],  # Highest-value pages within the token budget
+            extracted_financials=formatted_financials
+        )
+
+    def _prompt_token_limit(self) -> int:
+        """Prompt tokens the model accepts once the completion is reserved"""
+        return model_context_window(self.model) - self.ANALYSIS_MAX_TOKENS - self.PROMPT_SAFETY_MARGIN_TOKENS
+
+    def _content_token_budget(self, documents_summary: str, formatted_financials: str) -> int:
+        """ANALYSIS_CONTEXT_TOKEN_BUDGET, lowered to what the rest of the prompt leaves in the context window"""
+        empty_prompt = self._build_analysis_prompt(
+            {'documents_summary': documents_summary, 'packed_content': ''}, formatted_financials)
+        available = self._prompt_token_limit() - count_chat_tokens(self._analysis_messages(empty_prompt))
+        budget = min(config.ANALYSIS_CONTEXT_TOKEN_BUDGET, max(available, 0))
+        if budget < config.ANALYSIS_CONTEXT_TOKEN_BUDGET:
+            logger.info(f"🧮 Content budget lowered to {budget} tokens to fit the {self.model} context window")
+        return budget
+
+    def _check_prompt_fits(self, analysis_prompt: str):
+        """Fail before the API call, not inside it, when the prompt can't fit the context window"""
+        prompt_tokens = count_chat_tokens(self._analysis_messages(analysis_prompt))
+        limit = self._prompt_token_limit()
+        if prompt_tokens > limit:
+            raise ValueError(f"Analysis prompt has {prompt_tokens} tokens, {self.model} accepts {limit} "
+                             f"with {self.ANALYSIS_MAX_TOKENS} reserved for the answer")
+
+    def _map_reduce_analysis(self, processed_documents: List[Dict[str, Any]], context: Dict[str, Any],
+                             formatted_financials: str) -> Optional[str]:
+        """Review documents separately and merge the reviews; None falls back to the single-pass analysis"""
+        try:
+            logger.info("🗺️ Data room exceeds the analysis budget, using map-reduce analysis")
+            mapped = self.map_reduce.map(processed_documents)
+            context['map_reduce_report'] = mapped['report']
+            reduce_prompt = self.map_reduce.build_reduce_prompt(
+                context['documents_summary'], formatted_financials, mapped['reviews']
+            )
+            return self._run_analysis("analyze.reduce", reduce_prompt)
+        except Exception as e:
+            logger.warning(f"⚠️ Map-reduce analysis failed, falling back to single pass: {e}")
+            return None
+
     def _prepare_analysis_context(self, processed_documents: List[Dict[str, Any]],
-                                 document_summary: Dict[str, Any]) -> Dict[str, Any]:
+                                 document_summary: Dict[str, Any],
+                                 formatted_financials: str = "") -> Dict[str, Any]:
         """Prepare structured context for AI analysis"""
 
         # Document metadata summary
@@ -100,9 +206,16 @@ class AIAnalyzer:
                 full_content += f"\n\n=== DOCUMENT: {doc['name']} ===\n"
                 full_content += doc['content'][:10000]  # Increased limit to capture financial data
 
+        # Token-budgeted prompt content, weighted by document type and financial signal
+        documents_summary = json.dumps(docs_summary, indent=2)
+        packed = pack_documents(processed_documents,
+                                self._content_token_budget(documents_summary, formatted_financials))
+
         return {
-            'documents_summary': json.dumps(docs_summary, indent=2),
+            'documents_summary': documents_summary,
             'full_content': full_content,
+            'packed_content': packed.content,
+            'packing_report': packed.report(),
             'document_count': len(docs_summary),
             'total_content_length': len(full_content)
         }
@@ -223,37 +336,35 @@ class AIAnalyzer:
                 'recommendation': 'TECHNICAL_ERROR'
             }
 
-    def answer_question(self, question: str) -> str:
-        """Answer specific questions about the analyzed data room"""
+    def answer_question(self, session: Optional[AnalysisSession], question: str,
+                        on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Answer specific questions about the analyzed data room (streamed to on_delta if given)"""
         try:
-            if not self.current_analysis or not self.analysis_context:
-                return "❌ No data room has been analyzed yet. Please run /analyze first."
+            if not session or not session.has_analysis:
+                return self.NO_ANALYSIS_MESSAGE
 
             logger.info(f"🤔 Answering question: {question[:100]}...")
 
-            # Extract financial data for Q&A context
-            from utils.financial_extractor import extract_financial_data, format_financial_data_for_prompt
-            financial_data = extract_financial_data(self.analysis_context['full_content'])
-            formatted_financials = format_financial_data_for_prompt(financial_data)
+            # Financial data for Q&A context (computed once per data room)
+            formatted_financials = self._format_session_financials(session)
 
-            # Create Q&A prompt with FULL CONTENT and EXTRACTED FINANCIAL DATA
+            # Create Q&A prompt with the most relevant passages and EXTRACTED FINANCIAL DATA
             qa_prompt = QA_PROMPT.format(
-                analyzed_documents_summary=self.analysis_context['full_content'][:10000],  # ← CONTENIDO REAL
+                analyzed_documents_summary=self._retrieve_question_context(session, question),
                 extracted_financials=formatted_financials,
                 user_question=question
             )
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            answer = self._complete(
+                "ask",
                 messages=[
                     {"role": "system", "content": "You are an expert VC analyst who has just completed a comprehensive data room analysis."},
                     {"role": "user", "content": qa_prompt}
                 ],
                 max_tokens=500,
-                temperature=0.2
+                temperature=0.2,
+                on_delta=on_delta
             )
-
-            answer = response.choices[0].message.content
             logger.info("✅ Question answered successfully")
             return answer
 
@@ -261,30 +372,110 @@ class AIAnalyzer:
             logger.error(f"❌ Failed to answer question: {e}")
             return f"❌ Sorry, I couldn't answer that question due to a technical error: {str(e)}"
 
-    def generate_investment_memo(self) -> str:
-        """Generate a structured investment memo"""
+    def _complete(self, call_site: str, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                  on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Chat completion text through the shared gateway; with on_delta, streamed chunk by chunk as it arrives"""
+        return self.llm.chat(call_site, messages, model=self.model, max_tokens=max_tokens,
+                             temperature=temperature, on_delta=on_delta)
+
+    def _get_financial_records(self, session: Optional[AnalysisSession],
+                               processed_documents: List[Dict[str, Any]]) -> FinancialRecordStore:
+        """Run the page-aware extractor once per set of documents and reuse the store from the session"""
+        from utils.financial_extractor import extract_financial_records
+
+        digest = hashlib.sha256()
+        for doc in processed_documents:
+            if doc.get('type') != 'error' and doc.get('content'):
+                digest.update(doc['name'].encode('utf-8') + b'\0' + doc['content'].encode('utf-8') + b'\0')
+        content_hash = digest.hexdigest()
+        if session is not None and session.financial_records is not None and session.financial_data_hash == content_hash:
+            session.financial_cache_hits += 1
+            logger.info(f"💰 Reusing financial records (saved ~{session.financial_extraction_seconds * 1000:.0f}ms)")
+            return session.financial_records
+
+        start_time = time.time()
+        financial_records = extract_financial_records(processed_documents)
+        elapsed = time.time() - start_time
+        logger.info(f"💰 Financial extraction took {elapsed * 1000:.0f}ms")
+
+        if session is not None:
+            session.financial_records = financial_records
+            session.financial_data = None
+            session.financial_data_hash = content_hash
+            session.financial_extraction_seconds = elapsed
+            session.financial_cache_hits = 0
+        return financial_records
+
+    def _format_session_financials(self, session: AnalysisSession) -> str:
+        """Prompt section for the session's financial data, from its record store when it has one"""
+        from utils.financial_extractor import format_financial_data_for_prompt, format_financial_records_for_prompt
+
+        if session.financial_records is not None:
+            session.financial_cache_hits += 1
+            return format_financial_records_for_prompt(session.financial_records)
+
+        financial_data = self._get_financial_data(session, session.analysis_context['full_content'])
+        return format_financial_data_for_prompt(financial_data)
+
+    def _get_financial_data(self, session: Optional[AnalysisSession], content: str) -> Dict[str, Any]:
+        """Run the financial extractor once per content hash and reuse the result from the session"""
+        from utils.financial_extractor import extract_financial_data
+
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if session is not None and session.financial_data is not None and session.financial_data_hash == content_hash:
+            session.financial_cache_hits += 1
+            logger.info(f"💰 Reusing financial extraction (saved ~{session.financial_extraction_seconds * 1000:.0f}ms)")
+            return session.financial_data
+
+        start_time = time.time()
+        financial_data = extract_financial_data(content)
+        elapsed = time.time() - start_time
+        logger.info(f"💰 Financial extraction took {elapsed * 1000:.0f}ms")
+
+        if session is not None:
+            session.financial_data = financial_data
+            session.financial_data_hash = content_hash
+            session.financial_extraction_seconds = elapsed
+            session.financial_cache_hits = 0
+        return financial_data
+
+    def _retrieve_question_context(self, session: AnalysisSession, question: str) -> str:
+        """Top-k cited passages for the question (sessions from before the index fall back to the content prefix)"""
+        if not session.retrieval_index:
+            return session.analysis_context['full_content'][:10000]
+
+        start_time = time.time()
+        results = session.retrieval_index.search(question)
+        logger.info(f"🔎 Retrieved {len(results)}/{len(session.retrieval_index)} chunks "
+                    f"in {(time.time() - start_time) * 1000:.1f}ms")
+        if not results:
+            return session.analysis_context['full_content'][:10000]
+        return session.retrieval_index.format_context(results)
+
+    def generate_investment_memo(self, session: Optional[AnalysisSession],
+                                 on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Generate a structured investment memo (streamed to on_delta if given)"""
         try:
-            if not self.current_analysis or not self.analysis_context:
-                return "❌ No data room has been analyzed yet. Please run /analyze first."
+            if not session or not session.has_analysis:
+                return self.NO_ANALYSIS_MESSAGE
 
             logger.info("📄 Generating investment memo...")
 
             memo_prompt = MEMO_PROMPT.format(
-                analysis_summary=json.dumps(self.current_analysis, indent=2),
-                document_context=self.analysis_context['documents_summary']
+                analysis_summary=json.dumps(session.current_analysis, indent=2),
+                document_context=session.analysis_context['documents_summary']
             )
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            memo = self._complete(
+                "memo",
                 messages=[
                     {"role": "system", "content": "You are a senior partner at a VC firm writing an investment memo for the partnership."},
                     {"role": "user", "content": memo_prompt}
                 ],
                 max_tokens=1500,
-                temperature=0.3
+                temperature=0.3,
+                on_delta=on_delta
             )
-
-            memo = response.choices[0].message.content
             logger.info("✅ Investment memo generated successfully")
             return memo
 
@@ -292,37 +483,35 @@ class AIAnalyzer:
             logger.error(f"❌ Failed to generate memo: {e}")
             return f"❌ Sorry, I couldn't generate the memo due to a technical error: {str(e)}"
 
-    def analyze_gaps(self) -> str:
-            """Analyze information gaps in the data room with financial data awareness"""
+    def analyze_gaps(self, session: Optional[AnalysisSession],
+                     on_delta: Optional[Callable[[str], None]] = None) -> str:
+            """Analyze information gaps in the data room with financial data awareness (streamed to on_delta if given)"""
             try:
-                if not self.current_analysis or not self.analysis_context:
-                    return "❌ No data room has been analyzed yet. Please run /analyze first."
+                if not session or not session.has_analysis:
+                    return self.NO_ANALYSIS_MESSAGE
 
                 logger.info("🔍 Analyzing information gaps...")
 
-                # PHASE 1: Extract financial data deterministically to know what we actually have
-                from utils.financial_extractor import extract_financial_data, format_financial_data_for_prompt
-                financial_data = extract_financial_data(self.analysis_context['full_content'])
-                formatted_financials = format_financial_data_for_prompt(financial_data)
+                # PHASE 1: Financial data (memoized) to know what we actually have
+                formatted_financials = self._format_session_financials(session)
 
                 # FIXED: Use available variables + financial data context
                 gaps_prompt = GAPS_PROMPT.format(
-                    available_documents=self.analysis_context['documents_summary'],
-                    content_summary=json.dumps(self.current_analysis.get('missing_info', []), indent=2),
+                    available_documents=session.analysis_context['documents_summary'],
+                    content_summary=json.dumps(session.current_analysis.get('missing_info', []), indent=2),
                     extracted_financials=formatted_financials
                 )
 
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                gaps_analysis = self._complete(
+                    "gaps",
                     messages=[
                         {"role": "system", "content": "You are a VC expert identifying critical missing information for due diligence."},
                         {"role": "user", "content": gaps_prompt}
                     ],
                     max_tokens=1000,  # Increased for comprehensive gaps analysis
-                    temperature=0.2
+                    temperature=0.2,
+                    on_delta=on_delta
                 )
-
-                gaps_analysis = response.choices[0].message.content
                 logger.info("✅ Gaps analysis completed successfully")
                 return gaps_analysis
 
@@ -330,20 +519,16 @@ class AIAnalyzer:
                 logger.error(f"❌ Failed to analyze gaps: {e}")
                 return f"❌ Sorry, I couldn't analyze gaps due to a technical error: {str(e)}"
 
-    def get_detailed_scoring(self) -> Dict[str, Any]:
+    def get_detailed_scoring(self, session: Optional[AnalysisSession]) -> Dict[str, Any]:
         """Get detailed scoring breakdown"""
-        if not self.current_analysis:
+        if not session or not session.current_analysis:
             return {"error": "No analysis available. Please run /analyze first."}
 
+        current_analysis = session.current_analysis
+
         return {
-            'overall_score': self.current_analysis.get('overall_score', 0),
-            'category_scores': self.current_analysis.get('scoring', {}),
-            'recommendation': self.current_analysis.get('recommendation', 'UNKNOWN'),
-            'summary': self.current_analysis.get('executive_summary', [])
+            'overall_score': current_analysis.get('overall_score', 0),
+            'category_scores': current_analysis.get('scoring', {}),
+            'recommendation': current_analysis.get('recommendation', 'UNKNOWN'),
+            'summary': current_analysis.get('executive_summary', [])
         }
-
-    def reset_analysis(self):
-        """Reset current analysis context"""
-        self.current_analysis = None
-        self.analysis_context = None
-        logger.info("🔄 Analysis context reset")
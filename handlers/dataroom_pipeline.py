@@ -0,0 +1,305 @@
+"""
+Data room pipeline for DataRoom Intelligence Bot
+Overlaps Google Drive downloads with document extraction through a bounded queue
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import config
+from handlers.doc_processor import ExtractionPool
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FILE_STATE_EMOJIS = {
+    "queued": "⏳",
+    "downloading": "📥",
+    "downloaded": "📦",
+    "extracting": "📖",
+    "done": "✅",
+    "failed": "❌"
+}
+
+_DOWNLOADS_FINISHED = object()
+QUEUE_PUT_TIMEOUT_SECONDS = 0.5  # How often a blocked producer checks whether the run was cancelled
+
+
+class PipelineCancelled(Exception):
+    """Raised in download threads once the consumer side of the pipeline has failed"""
+
+
+class _InlineExtractor:
+    """Same interface as ExtractionPool, extracting in the calling thread (serial mode)"""
+
+    def __init__(self, doc_processor):
+        self.doc_processor = doc_processor
+        self._pending: List[Tuple[int, Dict]] = []
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, index: int, file_info: Dict):
+        self._pending.append((index, file_info))
+
+    def poll(self, wait_seconds: float = 0.05) -> List[Tuple[int, Dict[str, Any]]]:
+        if not self._pending:
+            return []
+        index, file_info = self._pending.pop(0)
+        processed_doc = self.doc_processor.process_document(
+            file_info['path'], file_info['name'], file_info['mime_type'],
+            content_hash=file_info.get('content_sha256')
+        )
+        return [(index, processed_doc)]
+
+    def close(self):
+        self._pending.clear()
+
+
+class DataroomPipeline:
+    """
+    Producer/consumer pipeline for /analyze
+
+    A producer thread runs the Drive download; each finished (or reused) file
+    is put on a bounded queue and handed to an extraction worker while other
+    files are still downloading. Results are returned in Drive listing order.
+
+    With a ``workspace`` (utils.workspace) files are downloaded into it, and
+    each file is deleted as soon as its extraction is in the extraction cache.
+
+    If extraction fails, the run is cancelled: downloads not yet started are
+    skipped, blocked producers are released and the download thread is joined
+    before the error propagates.
+    """
+
+    SLACK_UPDATE_INTERVAL_SECONDS = 1.5
+    MAX_FILES_SHOWN = 20
+
+    def __init__(self, drive_handler, doc_processor, slack_client=None, channel: Optional[str] = None,
+                 message_ts: Optional[str] = None, header: str = "", footer: str = "",
+                 workspace=None):
+        self.drive_handler = drive_handler
+        self.doc_processor = doc_processor
+        self.slack_client = slack_client
+        self.channel = channel
+        self.message_ts = message_ts
+        self.header = header
+        self.footer = footer
+        self.workspace = workspace
+
+        self.file_names: Dict[int, str] = {}
+        self.file_states: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._last_slack_update = 0.0
+        self._cancelled = threading.Event()
+
+    # ==========================================
+    # PIPELINE
+    # ==========================================
+
+    def run(self, drive_link: str) -> Tuple[List[Dict], List[Dict[str, Any]]]:
+        """
+        Download and extract a data room
+
+        Returns:
+            (downloaded_files, processed_documents), both in Drive listing order
+        """
+        start_time = time.time()
+        self._cancelled.clear()
+        ready_queue: "queue.Queue" = queue.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+        producer_result: Dict[str, Any] = {}
+
+        def produce():
+            try:
+                producer_result['files'] = self.drive_handler.download_dataroom(
+                    drive_link,
+                    doc_processor=self.doc_processor,
+                    on_file_event=lambda event, index, data: self._on_download_event(ready_queue, event, index, data),
+                    workspace_dir=self.workspace.path if self.workspace else None
+                )
+            except Exception as e:
+                producer_result['error'] = e
+            finally:
+                self._put(ready_queue, _DOWNLOADS_FINISHED)
+
+        producer = threading.Thread(target=produce, name="dataroom-download", daemon=True)
+        producer.start()
+
+        downloaded: Dict[int, Dict] = {}
+        processed: Dict[int, Dict[str, Any]] = {}
+        extractor = None
+        max_in_flight = 1
+        downloads_finished = False
+
+        try:
+            while True:
+                # Hand ready files to extraction while there is capacity
+                while not downloads_finished and (extractor is None or extractor.pending_count < max_in_flight):
+                    try:
+                        idle = extractor is None or extractor.pending_count == 0
+                        item = ready_queue.get(timeout=0.1 if idle else 0.01)
+                    except queue.Empty:
+                        break
+                    if item is _DOWNLOADS_FINISHED:
+                        downloads_finished = True
+                        break
+
+                    index, entry = item
+                    if extractor is None:
+                        extractor, max_in_flight = self._create_extractor()
+                    entry = self._ensure_extractable(entry)
+                    downloaded[index] = entry
+                    extractor.submit(index, entry)
+                    self._set_state(index, "extracting")
+
+                if extractor is not None:
+                    for index, processed_doc in extractor.poll():
+                        if processed_doc.get('type') == 'error' and downloaded[index].get('reused') == 'extraction_cache':
+                            # The cached extraction went away after the check above: download and extract again
+                            entry = self._ensure_extractable(downloaded[index], force=True)
+                            if not entry.get('reused'):
+                                downloaded[index] = entry
+                                extractor.submit(index, entry)
+                                continue
+                        processed[index] = processed_doc
+                        self._set_state(index, "failed" if processed_doc.get('type') == 'error' else "done")
+                        self._release_extracted_file(downloaded[index], processed_doc)
+
+                self._push_to_slack()
+
+                if downloads_finished and (extractor is None or extractor.pending_count == 0):
+                    break
+        except BaseException:
+            self._cancel(ready_queue, producer)
+            raise
+        finally:
+            if extractor is not None:
+                extractor.close()
+
+        producer.join()
+        if 'error' in producer_result:
+            raise producer_result['error']
+
+        order = sorted(downloaded)
+        downloaded_files = [downloaded[index] for index in order]
+        processed_documents = [processed[index] for index in order if index in processed]
+        self._push_to_slack(force=True)
+
+        logger.info(f"✅ Pipeline finished: {len(processed_documents)} documents in {time.time() - start_time:.1f}s")
+        return downloaded_files, processed_documents
+
+    def _cancel(self, ready_queue: "queue.Queue", producer: threading.Thread):
+        """Stop the download side after a consumer failure so no thread stays blocked on the queue"""
+        logger.warning("⚠️ Pipeline failed, cancelling remaining downloads")
+        self._cancelled.set()
+        while producer.is_alive():
+            try:
+                ready_queue.get(timeout=QUEUE_PUT_TIMEOUT_SECONDS)  # Release producers blocked on a full queue
+            except queue.Empty:
+                pass
+        producer.join()
+
+    def _put(self, ready_queue: "queue.Queue", item) -> bool:
+        """Put with backpressure, giving up once the run is cancelled"""
+        while not self._cancelled.is_set():
+            try:
+                ready_queue.put(item, timeout=QUEUE_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _create_extractor(self):
+        """Extraction workers are only started once the first file is ready"""
+        if config.EXTRACTION_PARALLEL_ENABLED:
+            workers = config.EXTRACTION_MAX_WORKERS or os.cpu_count() or 1
+            return ExtractionPool(workers, doc_processor=self.doc_processor), workers * 2
+        return _InlineExtractor(self.doc_processor), 1
+
+    def _ensure_extractable(self, entry: Dict, force: bool = False) -> Dict:
+        """
+        A file reused from the extraction cache has no local copy; download it
+        after all if its cache entry expired or was evicted since the listing
+        """
+        if entry.get('reused') != 'extraction_cache':
+            return entry
+        if not force and entry.get('content_sha256') and self.doc_processor.has_cached_extraction(
+                self.doc_processor.extraction_cache_key(entry['name'], entry['content_sha256'])):
+            return entry
+
+        logger.info(f"♻️ Cached extraction for {entry['name']} is gone, downloading it")
+        try:
+            return self.drive_handler.download_reused_file(entry, self.workspace.path if self.workspace else None)
+        except Exception as e:
+            logger.error(f"❌ Failed to download {entry['name']}: {e}")
+            return entry
+
+    def _release_extracted_file(self, file_info: Dict, processed_doc: Dict[str, Any]):
+        """Delete the downloaded copy once the extraction cache holds its result"""
+        if self.workspace is None or file_info.get('reused') == 'extraction_cache':
+            return
+        if processed_doc.get('metadata', {}).get('extraction_cache') in ('hit', 'miss') \
+                and processed_doc.get('type') != 'error' and not processed_doc.get('metadata', {}).get('error'):
+            self.workspace.remove_file(file_info.get('path'))
+
+    def _on_download_event(self, ready_queue: "queue.Queue", event: str, index: int, data: Dict):
+        """Called from download threads; blocks on a full queue to apply backpressure"""
+        if self._cancelled.is_set() and event == 'downloading':
+            raise PipelineCancelled(f"Pipeline cancelled before downloading {data['name']}")
+        with self._lock:
+            self.file_names[index] = data['name']
+        if event == 'ready':
+            self._set_state(index, "downloaded")
+            self._put(ready_queue, (index, data))
+        elif event in ('queued', 'downloading', 'failed'):
+            self._set_state(index, event)
+
+    # ==========================================
+    # SLACK PROGRESS
+    # ==========================================
+
+    def _set_state(self, index: int, state: str):
+        with self._lock:
+            self.file_states[index] = state
+
+    def format_progress_message(self) -> str:
+        """Per-file download/extraction state for the Slack progress message"""
+        with self._lock:
+            states = dict(self.file_states)
+            names = dict(self.file_names)
+
+        total = len(states)
+        finished = sum(1 for state in states.values() if state in ("done", "failed"))
+        lines = [
+            f"{FILE_STATE_EMOJIS.get(states[index], '⚪')} {names.get(index, f'File {index + 1}')}"
+            for index in sorted(states)[:self.MAX_FILES_SHOWN]
+        ]
+        if total > self.MAX_FILES_SHOWN:
+            lines.append(f"… and {total - self.MAX_FILES_SHOWN} more")
+
+        message = self.header
+        message += (f"📄 **Downloading & processing documents:** {finished}/{total} done\n\n" if total
+                    else "📥 **Listing documents in Google Drive...**\n")
+        message += "\n".join(lines)
+        return message + self.footer
+
+    def _push_to_slack(self, force: bool = False):
+        if not (self.slack_client and self.channel and self.message_ts):
+            return
+
+        now = time.monotonic()
+        if not force and now - self._last_slack_update < self.SLACK_UPDATE_INTERVAL_SECONDS:
+            return
+        self._last_slack_update = now
+
+        try:
+            self.slack_client.chat_update(
+                channel=self.channel,
+                ts=self.message_ts,
+                text=self.format_progress_message()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to push pipeline progress to Slack: {e}")
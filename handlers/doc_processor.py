@@ -4,18 +4,59 @@ Extracts content from PDFs, Excel, Word, and other document types
 """
 
 import os
+import json
+import time
+import queue
+import hashlib
+import importlib.util
+import multiprocessing
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 # import pandas as pd  # COMENTAR TEMPORALMENTE
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import PyPDF2
 import docx
+from config.settings import config
+from handlers.extraction_worker import init_extraction_worker, extract_file_worker
+from utils.disk_cache import DiskCache
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds an extraction worker may be gone before its file is reported as crashed
+WORKER_EXIT_GRACE_SECONDS = 1.0
+
+# Tesseract settings tuned for business documents
+OCR_TESSERACT_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,€$%+-:|() '
+
+def _ocr_pdf_page(file_path: str, page_num: int, timeout: float) -> Tuple[int, str, Optional[str]]:
+    """Render and OCR a single PDF page (runs in OCR worker processes)"""
+    try:
+        import pytesseract
+        from pdf2image import convert_from_path
+
+        images = convert_from_path(file_path, first_page=page_num, last_page=page_num)
+        if not images:
+            return page_num, "", None
+        page_text = pytesseract.image_to_string(images[0], lang='eng', config=OCR_TESSERACT_CONFIG,
+                                                timeout=max(int(timeout), 1))
+        images[0].close()
+        return page_num, page_text, None
+    except Exception as e:
+        return page_num, "", str(e)
+
+def _missing_ocr_libraries() -> List[str]:
+    """OCR modules that are not installed (probed without importing them)"""
+    return [module for module in ('pytesseract', 'pdf2image', 'PIL')
+            if importlib.util.find_spec(module) is None]
+
 class DocumentProcessor:
     """Processes various document types and extracts structured content"""
 
+    # Bump whenever extraction output changes so cached results are not reused
+    EXTRACTOR_VERSION = "1"
+
     def __init__(self):
         self.supported_extensions = {
             '.pdf': self._process_pdf,
@@ -27,8 +68,24 @@ class DocumentProcessor:
             # '.csv': self._process_csv        # COMENTAR TEMPORALMENTE
         }
 
-    def process_document(self, file_path: str, file_name: str, mime_type: str) -> Dict[str, Any]:
-        """Process a document and extract its content"""
+        # Set in extraction pool workers: scanned PDFs come back with their pages for the pool to OCR
+        self.defer_ocr = False
+
+        # Content-addressed extraction cache (file SHA-256 + extractor version)
+        self.extraction_cache = None
+        if config.EXTRACTION_CACHE_ENABLED:
+            try:
+                self.extraction_cache = DiskCache(
+                    config.cache_dir / "extraction_cache.sqlite3",
+                    name="Extraction",
+                    max_bytes=config.EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Extraction cache unavailable: {e}")
+
+    def process_document(self, file_path: str, file_name: str, mime_type: str,
+                         content_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Process a document and extract its content (content_hash skips re-hashing known files)"""
         try:
             logger.info(f"📄 Processing document: {file_name}")
 
@@ -44,10 +101,28 @@ class DocumentProcessor:
                     'metadata': {'error': f'Unsupported file type: {file_ext}'}
                 }
 
+            # Skip extraction entirely for files we have already seen
+            content_hash = content_hash or self._hash_file(file_path)
+            cache_key = self.extraction_cache_key(file_name, content_hash)
+            cached = self.extraction_cache.get(cache_key) if self.extraction_cache else None
+            if cached is not None:
+                cached['name'] = file_name
+                cached['metadata']['content_sha256'] = content_hash
+                cached['metadata']['extraction_cache'] = 'hit'
+                logger.info(f"🗄️ Extraction cache hit: {file_name}")
+                return cached
+
             # Process based on file type
             processor_func = self.supported_extensions[file_ext]
             content_data = processor_func(file_path, file_name)
 
+            if content_data.get('metadata', {}).get('ocr_pending'):
+                # Not finished yet: the extraction pool OCRs the pages and caches the result
+                content_data['metadata']['content_sha256'] = content_hash
+                return content_data
+
+            self._store_extraction(content_data, file_name, content_hash)
+
             logger.info(f"✅ Successfully processed: {file_name}")
             return content_data
 
@@ -60,6 +135,43 @@ class DocumentProcessor:
                 'metadata': {'error': str(e)}
             }
 
+    def _store_extraction(self, content_data: Dict[str, Any], file_name: str, content_hash: str):
+        """Cache complete extractions only (errors, OCR timeouts and empty results may be transient)"""
+        cacheable = self._is_cacheable(content_data)
+        if self.extraction_cache and cacheable:
+            self.extraction_cache.set(self.extraction_cache_key(file_name, content_hash), content_data)
+
+        content_data.setdefault('metadata', {})['content_sha256'] = content_hash
+        content_data['metadata']['extraction_cache'] = (
+            'disabled' if not self.extraction_cache else 'miss' if cacheable else 'skipped'
+        )
+
+    @staticmethod
+    def _is_cacheable(content_data: Dict[str, Any]) -> bool:
+        """Whether an extraction result is complete enough to serve again for the same content"""
+        metadata = content_data.get('metadata', {})
+        if metadata.get('error') or metadata.get('ocr_timed_out'):
+            return False
+        if metadata.get('has_content') is False or metadata.get('total_chars_extracted') == 0:
+            return False
+        return True
+
+    def extraction_cache_key(self, file_name: str, content_hash: str) -> str:
+        """Cache key for an extraction result: extractor version + extension + content SHA-256"""
+        return f"{self.EXTRACTOR_VERSION}:{Path(file_name).suffix.lower()}:{content_hash}"
+
+    def has_cached_extraction(self, cache_key: str) -> bool:
+        """Whether an extraction result is cached (lets callers skip re-downloading unchanged files)"""
+        return bool(self.extraction_cache and self.extraction_cache.contains(cache_key))
+
+    def _hash_file(self, file_path: str) -> str:
+        """SHA-256 of the file bytes (streamed in 1MB blocks)"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+
     def _process_pdf(self, file_path: str, file_name: str) -> Dict[str, Any]:
         """Extract text content from PDF files with multiple extraction methods"""
         try:
@@ -81,17 +193,13 @@ class DocumentProcessor:
                     # If both traditional methods fail, try OCR as last resort
                     if plumber_result['metadata']['total_chars_extracted'] < 100:
                         logger.info(f"   🔄 Both traditional methods failed, trying OCR as last resort...")
+                        if self.defer_ocr:
+                            deferred = self._defer_ocr(file_path, file_name, result, plumber_result)
+                            if deferred is not None:
+                                return deferred
                         ocr_result = self._try_ocr_extraction(file_path, file_name)
-                        
-                        if ocr_result['metadata']['total_chars_extracted'] > 100:
-                            logger.info(f"   ✅ OCR succeeded: {ocr_result['metadata']['total_chars_extracted']} chars")
-                            ocr_result['metadata']['extraction_method'] = 'ocr_tesseract'
-                            ocr_result['metadata']['pypdf2_result'] = result['metadata']
-                            ocr_result['metadata']['pdfplumber_result'] = plumber_result['metadata']
-                            return ocr_result
-                        else:
-                            logger.warning(f"   ⚠️ All extraction methods failed - PDF may be corrupted or encrypted")
-                    
+                        return self._merge_ocr_result(result, plumber_result, ocr_result)
+
                     result['metadata']['extraction_method'] = 'pypdf2'
                     result['metadata']['pdfplumber_attempted'] = True
                     return result
@@ -111,6 +219,73 @@ class DocumentProcessor:
                 }
             }
 
+    def _merge_ocr_result(self, result: Dict[str, Any], plumber_result: Dict[str, Any],
+                          ocr_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Final PDF result once OCR has run after PyPDF2 and pdfplumber both came up short"""
+        if ocr_result['metadata']['total_chars_extracted'] > 100:
+            logger.info(f"   ✅ OCR succeeded: {ocr_result['metadata']['total_chars_extracted']} chars")
+            ocr_result['metadata']['extraction_method'] = 'ocr_tesseract'
+            ocr_result['metadata']['pypdf2_result'] = result['metadata']
+            ocr_result['metadata']['pdfplumber_result'] = plumber_result['metadata']
+            return ocr_result
+
+        logger.warning(f"   ⚠️ All extraction methods failed - PDF may be corrupted or encrypted")
+        # Keep the OCR failure (e.g. missing libraries, timeout) so the result is not cached
+        ocr_metadata = ocr_result['metadata']
+        if ocr_metadata.get('error'):
+            result['metadata']['error'] = f"OCR failed: {ocr_metadata['error']}"
+        if ocr_metadata.get('ocr_timed_out'):
+            result['metadata']['ocr_timed_out'] = True
+        result['metadata']['extraction_method'] = 'pypdf2'
+        result['metadata']['pdfplumber_attempted'] = True
+        return result
+
+    def _defer_ocr(self, file_path: str, file_name: str, result: Dict[str, Any],
+                   plumber_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Hand OCR back to the process that owns the extraction pool
+
+        Extraction pool workers are daemonic and cannot start a page pool of
+        their own, so they return the pages to OCR instead; ExtractionPool
+        runs them as tasks on its own workers and finishes the document with
+        complete_deferred_ocr(). Returns None when OCR cannot be deferred
+        (libraries missing, unreadable page count) so the caller runs it inline.
+        """
+        if _missing_ocr_libraries():
+            return None
+        try:
+            total_pages = self._count_pdf_pages(file_path)
+        except Exception:
+            return None
+
+        page_numbers = list(range(1, min(total_pages, config.OCR_MAX_PAGES) + 1))
+        logger.info(f"   📸 Deferring OCR of {len(page_numbers)}/{total_pages} pages to the extraction pool")
+        return {
+            'name': file_name,
+            'type': 'pdf',
+            'content': '',
+            'metadata': {
+                'ocr_pending': {
+                    'page_numbers': page_numbers,
+                    'pypdf2_result': result,
+                    'pdfplumber_result': plumber_result
+                }
+            }
+        }
+
+    def complete_deferred_ocr(self, deferred_doc: Dict[str, Any], file_info: Dict,
+                              page_texts: Dict[int, str], timed_out: bool, workers: int,
+                              ocr_start: float) -> Dict[str, Any]:
+        """Finish (and cache) a document whose OCR pages ran on the extraction pool"""
+        pending = deferred_doc['metadata']['ocr_pending']
+        ocr_result = self._build_ocr_result(file_info['path'], file_info['name'], page_texts,
+                                            timed_out, workers, ocr_start)
+        content_data = self._merge_ocr_result(pending['pypdf2_result'], pending['pdfplumber_result'], ocr_result)
+        content_hash = deferred_doc['metadata'].get('content_sha256') or self._hash_file(file_info['path'])
+        self._store_extraction(content_data, file_info['name'], content_hash)
+        logger.info(f"✅ Successfully processed: {file_info['name']}")
+        return content_data
+
     def _try_pypdf2_extraction(self, file_path: str, file_name: str) -> Dict[str, Any]:
         """Try extraction with PyPDF2 (original method)"""
         content = ""
@@ -308,12 +483,10 @@ class DocumentProcessor:
     def _try_ocr_extraction(self, file_path: str, file_name: str) -> Dict[str, Any]:
         """Try OCR extraction using Tesseract (for image-based PDFs)"""
         try:
-            # Import OCR libraries (conditional import to avoid dependency issues)
-            try:
-                import pytesseract
-                from pdf2image import convert_from_path
-                import PIL.Image
-            except ImportError as import_error:
+            # Probe the OCR libraries without importing them; pages are rendered and OCR'd in _ocr_pdf_page
+            missing_libraries = _missing_ocr_libraries()
+            if missing_libraries:
+                import_error = f"No module named {', '.join(missing_libraries)}"
                 logger.warning(f"   ⚠️ OCR libraries not available: {import_error}")
                 return {
                     'name': file_name,
@@ -329,12 +502,11 @@ class DocumentProcessor:
             
             logger.info(f"🔧 PDF OCR extraction for {file_name}:")
             
-            # Convert PDF to images
-            logger.info(f"   📸 Converting PDF to images...")
+            # Count pages up front; pages are rendered one at a time inside OCR workers
             try:
-                # Convert PDF pages to images (limit to first 5 pages for performance)
-                images = convert_from_path(file_path, first_page=1, last_page=25)  # Process more pages for better coverage
-                logger.info(f"   📸 Converted {len(images)} pages to images")
+                total_pages = self._count_pdf_pages(file_path)
+                page_numbers = list(range(1, min(total_pages, config.OCR_MAX_PAGES) + 1))
+                logger.info(f"   📸 Streaming OCR over {len(page_numbers)}/{total_pages} pages")
             except Exception as convert_error:
                 logger.error(f"   ❌ PDF to image conversion failed: {convert_error}")
                 return {
@@ -349,63 +521,10 @@ class DocumentProcessor:
                     }
                 }
             
-            # Perform OCR on each image
-            content = ""
-            total_chars_extracted = 0
-            pages_with_content = 0
-            
-            for page_num, image in enumerate(images, 1):
-                try:
-                    logger.info(f"   🔍 OCR processing page {page_num}...")
-                    
-                    # Perform OCR with Tesseract - enhanced for business documents
-                    custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,€$%+-:|() '
-                    page_text = pytesseract.image_to_string(image, lang='eng', config=custom_config)
-                    page_char_count = len(page_text.strip())
-                    total_chars_extracted += page_char_count
-                    
-                    if page_char_count > 0:
-                        pages_with_content += 1
-                        content += f"\n--- Page {page_num} (OCR) ---\n"
-                        content += page_text
-                        
-                        # Log sample text from first few pages
-                        if page_num <= 3:
-                            sample_text = page_text.strip()[:100].replace('\n', ' ')
-                            logger.info(f"   📄 Page {page_num}: {page_char_count} chars - \"{sample_text}...\"")
-                    
-                except Exception as ocr_error:
-                    logger.warning(f"   ⚠️ OCR failed for page {page_num}: {ocr_error}")
-                    continue
-            
-            logger.info(f"   📊 OCR Summary: {pages_with_content}/{len(images)} pages, {total_chars_extracted} chars")
-            
-            # Determine OCR quality
-            if total_chars_extracted == 0:
-                ocr_quality = "failed"
-            elif total_chars_extracted < 500:
-                ocr_quality = "poor"
-            elif total_chars_extracted < 2000:
-                ocr_quality = "moderate"
-            else:
-                ocr_quality = "good"
-            
-            return {
-                'name': file_name,
-                'type': 'pdf',
-                'content': content.strip(),
-                'metadata': {
-                    'pages': len(images),
-                    'content_length': len(content),
-                    'has_content': bool(content.strip()),
-                    'pages_with_text': pages_with_content,
-                    'total_chars_extracted': total_chars_extracted,
-                    'ocr_quality': ocr_quality,
-                    'file_size_bytes': os.path.getsize(file_path),
-                    'pages_processed': len(images),
-                    'ocr_available': True
-                }
-            }
+            # Perform OCR on each page (parallel, order preserved)
+            ocr_start = time.time()
+            page_texts, timed_out, workers = self._run_streaming_ocr(file_path, file_name, page_numbers)
+            return self._build_ocr_result(file_path, file_name, page_texts, timed_out, workers, ocr_start)
             
         except Exception as e:
             logger.error(f"❌ OCR extraction failed for {file_name}: {e}")
@@ -422,6 +541,158 @@ class DocumentProcessor:
                 }
             }
 
+    def _build_ocr_result(self, file_path: str, file_name: str, page_texts: Dict[int, str],
+                          timed_out: bool, workers: int, ocr_start: float) -> Dict[str, Any]:
+        """Assemble OCR'd page texts (page number -> text) into a document result"""
+        content = ""
+        total_chars_extracted = 0
+        pages_with_content = 0
+        
+        for page_num in sorted(page_texts):
+            page_text = page_texts[page_num]
+            page_char_count = len(page_text.strip())
+            total_chars_extracted += page_char_count
+            
+            if page_char_count > 0:
+                pages_with_content += 1
+                content += f"\n--- Page {page_num} (OCR) ---\n"
+                content += page_text
+                
+                # Log sample text from first few pages
+                if page_num <= 3:
+                    sample_text = page_text.strip()[:100].replace('\n', ' ')
+                    logger.info(f"   📄 Page {page_num}: {page_char_count} chars - \"{sample_text}...\"")
+        
+        pages_processed = len(page_texts)
+        logger.info(f"   📊 OCR Summary ({file_name}): {pages_with_content}/{pages_processed} pages, "
+                    f"{total_chars_extracted} chars")
+        
+        # Determine OCR quality
+        if total_chars_extracted == 0:
+            ocr_quality = "failed"
+        elif total_chars_extracted < 500:
+            ocr_quality = "poor"
+        elif total_chars_extracted < 2000:
+            ocr_quality = "moderate"
+        else:
+            ocr_quality = "good"
+        
+        return {
+            'name': file_name,
+            'type': 'pdf',
+            'content': content.strip(),
+            'metadata': {
+                'pages': pages_processed,
+                'content_length': len(content),
+                'has_content': bool(content.strip()),
+                'pages_with_text': pages_with_content,
+                'total_chars_extracted': total_chars_extracted,
+                'ocr_quality': ocr_quality,
+                'file_size_bytes': os.path.getsize(file_path),
+                'pages_processed': pages_processed,
+                'ocr_available': True,
+                'ocr_workers': workers,
+                'ocr_timed_out': timed_out,
+                'ocr_seconds': round(time.time() - ocr_start, 2)
+            }
+        }
+
+    def _count_pdf_pages(self, file_path: str) -> int:
+        """Page count via poppler, falling back to PyPDF2"""
+        try:
+            from pdf2image import pdfinfo_from_path
+            return int(pdfinfo_from_path(file_path)['Pages'])
+        except Exception as e:
+            logger.debug(f"   pdfinfo unavailable ({e}), counting pages with PyPDF2")
+            with open(file_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+
+    def _run_streaming_ocr(self, file_path: str, file_name: str,
+                           page_numbers: List[int]) -> Tuple[Dict[int, str], bool, int]:
+        """
+        OCR pages across a process pool with a bounded window of in-flight pages
+
+        Each worker renders and OCRs a single page, so at most
+        ``OCR_MAX_IN_FLIGHT_PAGES`` page images exist at once. Pages still
+        pending when the per-document deadline passes are skipped.
+
+        Used where extraction is serial (single-file data rooms,
+        EXTRACTION_PARALLEL_ENABLED=false). ExtractionPool workers defer OCR
+        instead, and the pool runs the pages as tasks on its own workers; a
+        daemonic process that gets here anyway OCRs its pages serially.
+
+        Returns:
+            (page number -> text, timed_out, worker count)
+        """
+        deadline = time.time() + config.OCR_DOCUMENT_TIMEOUT_SECONDS
+        page_texts: Dict[int, str] = {}
+        timed_out = False
+        # More workers than in-flight pages would sit idle, so the window also caps the pool
+        max_in_flight = max(config.OCR_MAX_IN_FLIGHT_PAGES, 1)
+        workers = min(config.OCR_MAX_WORKERS or os.cpu_count() or 1, max(len(page_numbers), 1), max_in_flight)
+
+        # Daemonic processes (e.g. extraction pool workers) cannot spawn children
+        in_daemon = multiprocessing.current_process().daemon
+        if workers <= 1 or in_daemon:
+            if in_daemon and workers > 1:
+                logger.warning(f"   ⚠️ OCR {file_name}: {len(page_numbers)} pages serially "
+                               f"(daemonic worker cannot start a page pool)")
+            for page_num in page_numbers:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                page_num, page_text, error = _ocr_pdf_page(file_path, page_num, remaining)
+                if error:
+                    logger.warning(f"   ⚠️ OCR failed for page {page_num}: {error}")
+                else:
+                    page_texts[page_num] = page_text
+            return page_texts, timed_out, 1
+
+        pending_pages = iter(page_numbers)
+        in_flight = set()
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_get_extraction_context())
+        logger.info(f"   🔍 OCR {file_name}: {len(page_numbers)} pages on {workers} workers")
+
+        try:
+            while True:
+                # Keep the window full without exceeding the in-flight bound
+                while len(in_flight) < max_in_flight and time.time() < deadline:
+                    page_num = next(pending_pages, None)
+                    if page_num is None:
+                        break
+                    in_flight.add(executor.submit(_ocr_pdf_page, file_path, page_num,
+                                                  max(deadline - time.time(), 1)))
+
+                if not in_flight:
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+
+                done, in_flight = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        page_num, page_text, error = future.result()
+                    except Exception as e:
+                        logger.warning(f"   ⚠️ OCR worker failed: {e}")
+                        continue
+                    if error:
+                        logger.warning(f"   ⚠️ OCR failed for page {page_num}: {error}")
+                    else:
+                        page_texts[page_num] = page_text
+
+            if timed_out or next(pending_pages, None) is not None:
+                timed_out = True
+                logger.warning(f"   ⏱️ OCR deadline reached for {file_name}: "
+                               f"{len(page_texts)}/{len(page_numbers)} pages completed")
+        finally:
+            executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+        return page_texts, timed_out, workers
+
     def _process_word(self, file_path: str, file_name: str) -> Dict[str, Any]:
         """Extract text content from Word documents"""
         try:
@@ -497,8 +768,14 @@ class DocumentProcessor:
                 }
             }
 
-    def process_dataroom_documents(self, downloaded_files: List[Dict]) -> List[Dict[str, Any]]:
-        """Process all documents in a data room"""
+    def process_dataroom_documents(self, downloaded_files: List[Dict],
+                                   parallel: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Process all documents in a data room (in parallel across processes when enabled)"""
+        if parallel is None:
+            parallel = config.EXTRACTION_PARALLEL_ENABLED
+        if parallel and len(downloaded_files) > 1:
+            return self._process_documents_parallel(downloaded_files)
+
         processed_documents = []
 
         logger.info(f"🔄 Processing {len(downloaded_files)} documents...")
@@ -508,7 +785,8 @@ class DocumentProcessor:
                 processed_doc = self.process_document(
                     file_info['path'],
                     file_info['name'],
-                    file_info['mime_type']
+                    file_info['mime_type'],
+                    content_hash=file_info.get('content_sha256')
                 )
                 processed_documents.append(processed_doc)
 
@@ -525,6 +803,28 @@ class DocumentProcessor:
         logger.info(f"✅ Processed {len(processed_documents)} documents")
         return processed_documents
 
+    def _process_documents_parallel(self, downloaded_files: List[Dict]) -> List[Dict[str, Any]]:
+        """Extract each file in its own pool process, preserving input order"""
+        total = len(downloaded_files)
+        workers = min(config.EXTRACTION_MAX_WORKERS or os.cpu_count() or 1, total)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        batch_start = time.time()
+
+        logger.info(f"🔄 Processing {total} documents on {workers} worker processes...")
+
+        pool = ExtractionPool(workers, doc_processor=self)
+        try:
+            for index, file_info in enumerate(downloaded_files):
+                pool.submit(index, file_info)
+            while pool.pending_count:
+                for index, processed_doc in pool.poll():
+                    results[index] = processed_doc
+        finally:
+            pool.close()
+
+        logger.info(f"✅ Processed {total} documents in {time.time() - batch_start:.1f}s (parallel)")
+        return results
+
     def get_content_summary(self, processed_documents: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate a summary of all processed documents"""
         summary = {
@@ -533,7 +833,8 @@ class DocumentProcessor:
             'total_content_length': 0,
             'successful_processing': 0,
             'failed_processing': 0,
-            'document_list': []
+            'document_list': [],
+            'extraction_cache': {'hits': 0, 'misses': 0, 'hit_rate': 0.0}
         }
 
         for doc in processed_documents:
@@ -551,6 +852,13 @@ class DocumentProcessor:
                 summary['successful_processing'] += 1
                 summary['total_content_length'] += len(doc.get('content', ''))
 
+            # Extraction cache effectiveness
+            cache_status = doc.get('metadata', {}).get('extraction_cache')
+            if cache_status == 'hit':
+                summary['extraction_cache']['hits'] += 1
+            elif cache_status == 'miss':
+                summary['extraction_cache']['misses'] += 1
+
             # Document list for reference
             summary['document_list'].append({
                 'name': doc['name'],
@@ -559,4 +867,303 @@ class DocumentProcessor:
                 'content_length': len(doc.get('content', ''))
             })
 
+        cache_lookups = summary['extraction_cache']['hits'] + summary['extraction_cache']['misses']
+        if cache_lookups:
+            summary['extraction_cache']['hit_rate'] = round(summary['extraction_cache']['hits'] / cache_lookups, 3)
+            logger.info(f"🗄️ Extraction cache: {summary['extraction_cache']['hits']}/{cache_lookups} hits")
+
         return summary
+
+
+@dataclass
+class _OcrJob:
+    """A scanned PDF whose pages are OCR'd as tasks on the extraction pool"""
+    deferred_doc: Dict[str, Any]
+    file_info: Dict
+    queued: List[int]
+    deadline: float
+    started_at: float = field(default_factory=time.time)
+    in_flight: Dict[int, Any] = field(default_factory=dict)
+    page_texts: Dict[int, str] = field(default_factory=dict)
+    timed_out: bool = False
+
+
+class ExtractionPool:
+    """
+    Extraction worker processes that accept files as they become available
+
+    Workers report when (and in which process) they start a file, so per-file
+    timeouts measure extraction time rather than queue time and a worker
+    that dies is noticed on the next poll. A file that kills its worker is
+    reported as an error document at once (the pool replaces the worker); a
+    file that hangs is reported after the timeout, the pool is terminated and
+    the other pending files are resubmitted to a fresh pool.
+
+    With a ``doc_processor``, workers hand scanned PDFs back instead of
+    OCRing them (they are daemonic and cannot start a page pool). Their
+    pages run on a second pool of long-lived workers, started on first use
+    (file workers are replaced after every file, which would cost a process
+    start per page), at most ``OCR_MAX_IN_FLIGHT_PAGES`` per document and
+    under the ``OCR_DOCUMENT_TIMEOUT_SECONDS`` deadline. The document is
+    then finished and cached through ``doc_processor``.
+
+    Not thread-safe: submit and poll from a single thread.
+    """
+
+    def __init__(self, workers: int, timeout: Optional[float] = None, doc_processor=None):
+        self.workers = max(1, workers)
+        self.timeout = timeout or config.EXTRACTION_FILE_TIMEOUT_SECONDS
+        self._doc_processor = doc_processor
+        self._context = _get_extraction_context()
+        self._files: Dict[int, Dict] = {}
+        self._pending: Dict[int, Any] = {}
+        self._start_times: Dict[int, float] = {}
+        self._worker_pids: Dict[int, int] = {}
+        self._exited_at: Dict[int, float] = {}
+        self._ocr_jobs: Dict[int, _OcrJob] = {}
+        self._ocr_pool = None
+        self._ocr_abandoned = False  # Pages past their deadline may still occupy OCR workers
+        self._start_pool()
+
+    def _start_pool(self):
+        self._started = self._context.Queue()
+        self._lost_tasks = False  # A worker died mid-file; close() must terminate, join() would wait for it
+        self._pool = self._context.Pool(self.workers, initializer=init_extraction_worker,
+                                        initargs=(self._started, self._doc_processor is not None),
+                                        maxtasksperchild=1)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending) + len(self._ocr_jobs)
+
+    def submit(self, index: int, file_info: Dict):
+        """Queue a downloaded file for extraction; ``index`` identifies it in poll results"""
+        self._files[index] = file_info
+        self._pending[index] = self._pool.apply_async(extract_file_worker, (index, file_info))
+
+    def is_running(self, index: int) -> bool:
+        return index in self._start_times and index in self._pending
+
+    def poll(self, wait_seconds: float = 0.05) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return (index, processed document) for every file finished or timed out since the last poll"""
+        completed: List[Tuple[int, Dict[str, Any]]] = []
+
+        while True:
+            try:
+                index, started_at, pid = self._started.get_nowait()
+                self._start_times[index] = started_at
+                self._worker_pids[index] = pid
+            except queue.Empty:
+                break
+
+        for index, async_result in list(self._pending.items()):
+            if async_result.ready():
+                file_info = self._files[index]
+                processed_doc = _collect_extraction_result(async_result, file_info)
+                self._forget(index)
+                if processed_doc.get('metadata', {}).get('ocr_pending'):
+                    self._start_ocr(index, processed_doc, file_info)
+                else:
+                    completed.append((index, processed_doc))
+
+        now = time.time()
+        for index in [index for index in self._pending if self._worker_exited(index, now)]:
+            file_name = self._files[index]['name']
+            logger.error(f"❌ Extraction worker exited unexpectedly: {file_name}")
+            self._lost_tasks = True
+            completed.append((index, {
+                'name': file_name,
+                'type': 'error',
+                'content': '',
+                'metadata': {'error': 'Extraction worker exited unexpectedly'}
+            }))
+            self._forget(index)
+
+        timed_out = [index for index in self._pending
+                     if index in self._start_times and now - self._start_times[index] > self.timeout]
+        if timed_out:
+            for index in timed_out:
+                file_name = self._files[index]['name']
+                logger.error(f"❌ Extraction timed out after {self.timeout}s: {file_name}")
+                completed.append((index, {
+                    'name': file_name,
+                    'type': 'error',
+                    'content': '',
+                    'metadata': {'error': f'Extraction timed out after {self.timeout}s'}
+                }))
+                self._forget(index)
+
+            # Hung workers can only be stopped by replacing the whole pool
+            self._pool.terminate()
+            self._pool.join()
+            resubmit = list(self._pending)
+            self._pending.clear()
+            self._start_times.clear()
+            self._worker_pids.clear()
+            self._exited_at.clear()
+            self._start_pool()
+            for index in resubmit:
+                self.submit(index, self._files[index])
+
+        completed.extend(self._advance_ocr())
+
+        if not completed and self.pending_count:
+            time.sleep(wait_seconds)
+        return completed
+
+    def _start_ocr(self, index: int, deferred_doc: Dict[str, Any], file_info: Dict):
+        page_numbers = deferred_doc['metadata']['ocr_pending']['page_numbers']
+        logger.info(f"   🔍 OCR {file_info['name']}: {len(page_numbers)} pages on the extraction pool")
+        self._ocr_jobs[index] = _OcrJob(
+            deferred_doc=deferred_doc,
+            file_info=file_info,
+            queued=list(page_numbers),
+            deadline=time.time() + config.OCR_DOCUMENT_TIMEOUT_SECONDS
+        )
+
+    def _advance_ocr(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Collect OCR'd pages, keep each document's page window full and finish documents that are done"""
+        completed: List[Tuple[int, Dict[str, Any]]] = []
+        max_in_flight = max(config.OCR_MAX_IN_FLIGHT_PAGES, 1)
+        now = time.time()
+
+        if self._ocr_abandoned and not any(job.in_flight for job in self._ocr_jobs.values()):
+            # Replace the page pool once nothing else runs on it, so abandoned pages stop holding workers
+            self._stop_ocr_pool(terminate=True)
+
+        for index, job in list(self._ocr_jobs.items()):
+            for page_num, async_result in list(job.in_flight.items()):
+                if not async_result.ready():
+                    continue
+                del job.in_flight[page_num]
+                try:
+                    _, page_text, error = async_result.get()
+                except Exception as e:
+                    page_text, error = "", str(e)
+                if error:
+                    logger.warning(f"   ⚠️ OCR failed for page {page_num}: {error}")
+                else:
+                    job.page_texts[page_num] = page_text
+
+            if job.queued or job.in_flight:
+                if now < job.deadline:
+                    while job.queued and len(job.in_flight) < max_in_flight:
+                        page_num = job.queued.pop(0)
+                        job.in_flight[page_num] = self._get_ocr_pool().apply_async(
+                            _ocr_pdf_page, (job.file_info['path'], page_num, max(job.deadline - now, 1)))
+                    continue
+
+                job.timed_out = True
+                if job.in_flight:
+                    self._ocr_abandoned = True
+                logger.warning(f"   ⏱️ OCR deadline reached for {job.file_info['name']}: "
+                               f"{len(job.page_texts)}/{len(job.page_texts) + len(job.queued) + len(job.in_flight)} "
+                               f"pages completed")
+
+            del self._ocr_jobs[index]
+            completed.append((index, self._finish_ocr(job, max_in_flight)))
+
+        return completed
+
+    def _get_ocr_pool(self):
+        if self._ocr_pool is None:
+            self._ocr_pool = self._context.Pool(self.workers)
+        return self._ocr_pool
+
+    def _stop_ocr_pool(self, terminate: bool):
+        if self._ocr_pool is not None:
+            if terminate:
+                self._ocr_pool.terminate()
+            else:
+                self._ocr_pool.close()
+            self._ocr_pool.join()
+            self._ocr_pool = None
+        self._ocr_abandoned = False
+
+    def _finish_ocr(self, job: _OcrJob, max_in_flight: int) -> Dict[str, Any]:
+        page_count = len(job.deferred_doc['metadata']['ocr_pending']['page_numbers'])
+        try:
+            return self._doc_processor.complete_deferred_ocr(
+                job.deferred_doc, job.file_info, job.page_texts, job.timed_out,
+                min(self.workers, max_in_flight, max(page_count, 1)), job.started_at
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed to process {job.file_info['name']}: {e}")
+            return {
+                'name': job.file_info['name'],
+                'type': 'error',
+                'content': '',
+                'metadata': {'error': str(e)}
+            }
+
+    def _worker_exited(self, index: int, now: float) -> bool:
+        """True once the process running ``index`` has been gone for WORKER_EXIT_GRACE_SECONDS without a result"""
+        pid = self._worker_pids.get(index)
+        if pid is None:
+            return False
+        try:
+            os.kill(pid, 0)  # Exited workers stay signalable until the pool reaps them (within ~0.1s)
+            self._exited_at.pop(index, None)
+            return False
+        except PermissionError:
+            return False
+        except ProcessLookupError:
+            # A worker exits after every file (maxtasksperchild=1); give its result time to arrive
+            return now - self._exited_at.setdefault(index, now) > WORKER_EXIT_GRACE_SECONDS
+
+    def _forget(self, index: int):
+        self._pending.pop(index, None)
+        self._start_times.pop(index, None)
+        self._worker_pids.pop(index, None)
+        self._exited_at.pop(index, None)
+        self._files.pop(index, None)
+
+    def close(self):
+        """Shut down the worker processes"""
+        self._stop_ocr_pool(terminate=bool(self._ocr_jobs or self._ocr_abandoned))
+        if self._pending or self._ocr_jobs or self._lost_tasks:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+
+
+# ==========================================
+# PARALLEL EXTRACTION WORKERS
+# ==========================================
+
+def _get_extraction_context():
+    """
+    forkserver where available, else spawn: forking the bot itself would copy
+    locks held by its other threads (Slack, Flask, job workers) into children
+
+    Children only import the worker module and the entry module, which must
+    be safe to import (main.py is; running ``python app.py`` would re-import
+    the whole bot in every worker).
+    """
+    try:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['handlers.extraction_worker', 'handlers.doc_processor'])
+        return context
+    except ValueError:
+        return multiprocessing.get_context('spawn')
+
+
+def _collect_extraction_result(async_result, file_info: Dict) -> Dict[str, Any]:
+    """Fetch a worker result, loading it from its spill file if it was too large to pipe"""
+    try:
+        result = async_result.get()
+        if isinstance(result, str):
+            with open(result, 'r', encoding='utf-8') as spill_file:
+                processed_doc = json.load(spill_file)
+            os.remove(result)
+            return processed_doc
+        return result
+    except Exception as e:
+        logger.error(f"❌ Failed to process {file_info['name']}: {e}")
+        return {
+            'name': file_info['name'],
+            'type': 'error',
+            'content': '',
+            'metadata': {'error': str(e)}
+        }
@@ -5,24 +5,99 @@ FIXED VERSION with complete Shared Drive support for OPENLAB/Datarooms
 """
 
 import os
-import io
 import re
-from typing import List, Dict, Optional, Tuple
+import time
+import random
+import socket
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from typing import Callable, List, Dict, Optional, Tuple
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 from googleapiclient.errors import HttpError
 from google.oauth2.service_account import Credentials
 from config.settings import config
+from utils.dataroom_manifest import DataroomManifest
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# on_file_event(event, index, data) - see GoogleDriveHandler.download_dataroom
+FileEventCallback = Callable[[str, int, Dict], None]
+
+
+def _disambiguate_names(files: List[Dict]):
+    """
+    Make document names unique across a recursive listing
+
+    A name shared by several files is qualified with its folder path
+    ("Q1/Financials.xlsx"), and same-named files in one folder are numbered
+    ("Financials (2).xlsx"), so prompts, citations and labels tell them apart.
+    The Drive name is kept as ``drive_name``.
+    """
+    counts = Counter(f['name'].lower() for f in files)
+    used = set()
+    for file in files:
+        file['drive_name'] = file['name']
+        name = file['name']
+        if counts[name.lower()] > 1 and file.get('folder_path'):
+            name = f"{file['folder_path']}/{name}"
+        candidate, number = name, 1
+        while candidate.lower() in used:
+            number += 1
+            path = PurePosixPath(name)
+            candidate = str(path.with_name(f"{path.stem} ({number}){path.suffix}"))
+        used.add(candidate.lower())
+        file['name'] = candidate
+
+class _HashingWriter:
+    """File wrapper that computes SHA-256 of everything written through it"""
+
+    def __init__(self, file_handle):
+        self._file_handle = file_handle
+        self._sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self._sha256.update(data)
+        return self._file_handle.write(data)
+
+    def tell(self):
+        return self._file_handle.tell()
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
 class GoogleDriveHandler:
     """Handles Google Drive API operations with FULL Shared Drive support"""
 
+    FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
     def __init__(self):
+        self.credentials = None
         self.service = self._authenticate()
         self.temp_dir = config.temp_storage_path
+        # Snapshots of the last completed data room download; each call collects its own stats
+        self.last_listing_stats: Dict = {}
+        self.last_download_stats: Dict = {}
+        self._thread_local = threading.local()
+        self._stats_lock = threading.Lock()
+
+    def stats_snapshot(self) -> Dict[str, Dict]:
+        """Listing and download stats of the last completed data room download (for /status)"""
+        with self._stats_lock:
+            return {'listing': self.last_listing_stats, 'downloads': self.last_download_stats}
+
+    def _publish_stats(self, listing_stats: Dict, download_stats: Dict):
+        with self._stats_lock:
+            self.last_listing_stats = listing_stats
+            self.last_download_stats = download_stats
 
     def _authenticate(self):
         """Authenticate with Google Drive API - Enhanced for Shared Drives"""
@@ -44,6 +119,7 @@ class GoogleDriveHandler:
             )
 
             service = build('drive', 'v3', credentials=credentials)
+            self.credentials = credentials  # Reused by per-thread download sessions
 
             # Test the connection AND Shared Drive access
             about = service.about().get(fields="user").execute()
@@ -98,6 +174,11 @@ class GoogleDriveHandler:
 
     def list_folder_contents(self, folder_id: str) -> List[Dict]:
         """List all files in a Google Drive folder - FIXED for Shared Drives"""
+        files, _ = self._list_folder_contents(folder_id)
+        return files
+
+    def _list_folder_contents(self, folder_id: str) -> Tuple[List[Dict], Dict]:
+        """List supported files in a folder tree, returning (files, listing stats)"""
         try:
             # First, check if folder exists and get its metadata
             try:
@@ -137,28 +218,22 @@ class GoogleDriveHandler:
                 else:
                     raise
 
-            # List folder contents with ENHANCED parameters for Shared Drives
-            query = f"'{folder_id}' in parents and trashed=false"
-
+            # Walk the folder tree (paginated, breadth-first, batched parents)
             logger.info(f"🔍 Listing folder contents with Shared Drive support...")
 
-            results = self.service.files().list(
-                q=query,
-                fields="files(id,name,mimeType,size,parents,driveId)",
-                includeItemsFromAllDrives=True,  # CRITICAL: Include Shared Drive items
-                supportsAllDrives=True,          # CRITICAL: Support Shared Drive operations
-                pageSize=100  # Increase page size for better performance
-            ).execute()
+            files, listing_stats = self._traverse_folder_tree(folder_id)
+            listing_stats['api_calls'] += 1  # Root folder metadata lookup
 
-            files = results.get('files', [])
-            logger.info(f"📋 Found {len(files)} files in folder")
+            logger.info(f"📋 Found {len(files)} files in folder tree "
+                        f"({listing_stats['folders_visited']} folders, "
+                        f"{listing_stats['api_calls']} API calls)")
 
             if not files:
                 logger.warning("⚠️ No files found - folder may be empty or inaccessible")
                 logger.info("💡 If folder should contain files, check:")
                 logger.info("   - Service account has access to the Shared Drive")
                 logger.info("   - Folder permissions are correctly set")
-                return []
+                return [], listing_stats
 
             # Filter supported file types
             supported_files = []
@@ -179,7 +254,7 @@ class GoogleDriveHandler:
 
                 if file_type in supported_types:
                     supported_files.append(file)
-                    logger.info(f"✅ Supported: {file_name} ({file_type}) - {file_size} bytes")
+                    logger.info(f"✅ Supported: {file['folder_path'] or '.'}/{file_name} ({file_type}) - {file_size} bytes")
 
                     # Special logging for PDFs
                     if file_type == 'application/pdf':
@@ -188,7 +263,8 @@ class GoogleDriveHandler:
                     logger.warning(f"⚠️ Unsupported: {file_name} ({file_type})")
 
             logger.info(f"📊 Result: {len(supported_files)}/{len(files)} files are supported")
-            return supported_files
+            _disambiguate_names(supported_files)
+            return supported_files, listing_stats
 
         except Exception as e:
             logger.error(f"❌ Failed to list folder contents: {e}")
@@ -200,69 +276,339 @@ class GoogleDriveHandler:
 
             raise
 
-    def download_file(self, file_id: str, file_name: str, mime_type: str) -> str:
-        """Download a file from Google Drive - Enhanced for Shared Drives"""
-        try:
-            # Create temp directory if it doesn't exist
-            os.makedirs(self.temp_dir, exist_ok=True)
-
-            # Clean filename for local storage
-            safe_filename = re.sub(r'[<>:"/\\|?*]', '', file_name)
-            local_path = os.path.join(self.temp_dir, safe_filename)
+    def _traverse_folder_tree(self, root_folder_id: str) -> Tuple[List[Dict], Dict]:
+        """
+        Breadth-first listing of a folder tree
+
+        Follows nextPageToken, batches several parent folders into one ``q``
+        expression, and stops at DRIVE_MAX_DEPTH / DRIVE_MAX_LISTED_FILES.
+        Returns a flat list of non-folder files, each tagged with the
+        ``folder_path`` it was found under (relative to the root, '' for root),
+        and the listing stats.
+        """
+        start_time = time.time()
+        stats = {
+            'api_calls': 0,
+            'folders_visited': 0,
+            'files_seen': 0,
+            'max_depth_reached': 0,
+            'truncated': False
+        }
+
+        files: List[Dict] = []
+        visited = {root_folder_id}
+        frontier: List[Tuple[str, str]] = [(root_folder_id, '')]  # (folder id, path) at current depth
+        depth = 0
+
+        while frontier and not stats['truncated']:
+            stats['max_depth_reached'] = depth
+            folder_paths = dict(frontier)
+            next_frontier: List[Tuple[str, str]] = []
+
+            for batch_start in range(0, len(frontier), config.DRIVE_LIST_PARENT_BATCH):
+                batch = [folder_id for folder_id, _ in frontier[batch_start:batch_start + config.DRIVE_LIST_PARENT_BATCH]]
+                stats['folders_visited'] += len(batch)
+                parents_query = " or ".join(f"'{folder_id}' in parents" for folder_id in batch)
+                query = f"({parents_query}) and trashed=false"
+
+                page_token = None
+                while True:
+                    response = self.service.files().list(
+                        q=query,
+                        fields="nextPageToken, files(id,name,mimeType,size,parents,driveId,md5Checksum,modifiedTime)",
+                        includeItemsFromAllDrives=True,  # CRITICAL: Include Shared Drive items
+                        supportsAllDrives=True,          # CRITICAL: Support Shared Drive operations
+                        pageSize=config.DRIVE_LIST_PAGE_SIZE,
+                        pageToken=page_token
+                    ).execute()
+                    stats['api_calls'] += 1
+
+                    for item in response.get('files', []):
+                        parent_id = next((p for p in item.get('parents', []) if p in folder_paths), batch[0])
+                        parent_path = folder_paths.get(parent_id, '')
+
+                        if item['mimeType'] == self.FOLDER_MIME_TYPE:
+                            if item['id'] not in visited and depth < config.DRIVE_MAX_DEPTH:
+                                visited.add(item['id'])
+                                child_path = f"{parent_path}/{item['name']}" if parent_path else item['name']
+                                next_frontier.append((item['id'], child_path))
+                            continue
+
+                        stats['files_seen'] += 1
+                        item['folder_path'] = parent_path
+                        files.append(item)
+                        if len(files) >= config.DRIVE_MAX_LISTED_FILES:
+                            stats['truncated'] = True
+                            break
+
+                    page_token = response.get('nextPageToken')
+                    if not page_token or stats['truncated']:
+                        break
+
+                if stats['truncated']:
+                    logger.warning(f"⚠️ Listing stopped at {config.DRIVE_MAX_LISTED_FILES} files (DRIVE_MAX_LISTED_FILES)")
+                    break
+
+            # Deterministic order: by depth (BFS), then folder path, then name
+            frontier = sorted(next_frontier, key=lambda entry: entry[1].lower())
+            depth += 1
+
+        files.sort(key=lambda f: (f['folder_path'].count('/') + bool(f['folder_path']),
+                                  f['folder_path'].lower(), f['name'].lower()))
+        stats['elapsed_seconds'] = round(time.time() - start_time, 2)
+        logger.info(f"📊 Drive listing: {stats['api_calls']} API calls, {stats['folders_visited']} folders, "
+                    f"depth {stats['max_depth_reached']}, {stats['files_seen']} files in {stats['elapsed_seconds']}s")
+        return files, stats
+
+    def _get_thread_service(self):
+        """Drive service with its own authorized HTTP session for the calling thread (httplib2 is not thread-safe)"""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            if self.credentials is None:
+                return self.service
+            http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=config.DRIVE_DOWNLOAD_TIMEOUT_SECONDS))
+            service = build('drive', 'v3', http=http, cache_discovery=False)
+            self._thread_local.service = service
+        return service
+
+    def _stream_to_file(self, file_id: str, file_handle, max_bytes: int) -> Tuple[int, int]:
+        """Stream a file's bytes in chunks straight to ``file_handle``; returns (bytes written, chunks)"""
+        request = self._get_thread_service().files().get_media(
+            fileId=file_id,
+            supportsAllDrives=True  # CRITICAL for Shared Drive files
+        )
+        downloader = MediaIoBaseDownload(file_handle, request,
+                                         chunksize=config.DRIVE_DOWNLOAD_CHUNK_MB * 1024 * 1024)
+        chunks = 0
+        done = False
+        while done is False:
+            status, done = downloader.next_chunk()
+            chunks += 1
+            if file_handle.tell() > max_bytes:
+                raise ValueError(f"File exceeds {config.MAX_FILE_SIZE_MB} MB limit")
+            if status:
+                progress = int(status.progress() * 100)
+                if progress % 25 == 0:  # Log every 25%
+                    logger.info(f"📥 Download progress: {progress}%")
+        return file_handle.tell(), chunks
+
+    def download_file(self, file_id: str, file_name: str, mime_type: str,
+                      workspace_dir: Optional[str] = None) -> str:
+        """Download a file from Google Drive - streamed to disk, retried on 429/5xx"""
+        local_path, _ = self._download_file(file_id, file_name, mime_type, workspace_dir)
+        return local_path
+
+    def _download_file(self, file_id: str, file_name: str, mime_type: str,
+                       workspace_dir: Optional[str] = None,
+                       download_stats: Optional[Dict] = None) -> Tuple[str, str]:
+        """Download a file, returning its local path and the SHA-256 of the bytes written (retries counted in download_stats)"""
+        # Download into the job's workspace (or the shared temp dir if none was given)
+        target_dir = workspace_dir or self.temp_dir
+        os.makedirs(target_dir, exist_ok=True)
+
+        # Clean filename for local storage; the file id prefix keeps same-named files apart
+        safe_filename = re.sub(r'[<>:"/\\|?*]', '', file_name)
+        local_path = os.path.join(target_dir, f"{file_id}_{safe_filename}")
+        part_path = f"{local_path}.part"
+        max_bytes = config.MAX_FILE_SIZE_MB * 1024 * 1024
+
+        logger.info(f"📥 Downloading: {file_name} -> {local_path}")
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with open(part_path, 'wb') as part_file:
+                    hashing_file = _HashingWriter(part_file)
+                    file_size, _ = self._stream_to_file(file_id, hashing_file, max_bytes)
+                os.replace(part_path, local_path)
+                logger.info(f"✅ Downloaded: {file_name} -> {local_path} ({file_size} bytes)")
+                return local_path, hashing_file.hexdigest()
 
-            logger.info(f"📥 Downloading: {file_name} -> {local_path}")
+            except HttpError as e:
+                retryable = e.resp.status in self.RETRYABLE_STATUS_CODES
+                if retryable and attempt <= config.DRIVE_DOWNLOAD_RETRIES:
+                    self._backoff(file_name, attempt, f"HTTP {e.resp.status}", download_stats)
+                    continue
+                self._remove_partial(part_path)
+                if e.resp.status == 403:
+                    logger.error(f"❌ Permission denied downloading {file_name}")
+                    logger.error("💡 Service account may need access to this specific file")
+                elif e.resp.status == 404:
+                    logger.error(f"❌ File not found: {file_name}")
+                else:
+                    logger.error(f"❌ HTTP error downloading {file_name}: {e}")
+                raise
+            except (ConnectionError, TimeoutError, socket.timeout, httplib2.HttpLib2Error) as e:  # socket.timeout is TimeoutError only from 3.10
+                if attempt <= config.DRIVE_DOWNLOAD_RETRIES:
+                    self._backoff(file_name, attempt, str(e), download_stats)
+                    continue
+                self._remove_partial(part_path)
+                logger.error(f"❌ Failed to download {file_name}: {e}")
+                raise
+            except Exception as e:
+                self._remove_partial(part_path)
+                logger.error(f"❌ Failed to download {file_name}: {e}")
+                raise
+
+    def _backoff(self, file_name: str, attempt: int, reason: str, download_stats: Optional[Dict] = None):
+        """Exponential backoff with jitter between download retries"""
+        delay = min(config.DRIVE_DOWNLOAD_BACKOFF_SECONDS * (2 ** (attempt - 1)), 30) * random.uniform(0.5, 1.5)
+        logger.warning(f"⚠️ Download of {file_name} failed ({reason}), retry {attempt}/{config.DRIVE_DOWNLOAD_RETRIES} in {delay:.1f}s")
+        if download_stats is not None:
+            with self._stats_lock:  # Download threads of one run share its stats
+                download_stats['retries'] = download_stats.get('retries', 0) + 1
+        time.sleep(delay)
+
+    def _remove_partial(self, part_path: str):
+        try:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not remove partial download {part_path}: {e}")
+
+    def _downloaded_entry(self, file_info: Dict, local_path: str, content_sha256: Optional[str],
+                          reused: str = '') -> Dict:
+        """Shape of a downloaded file as returned by download_dataroom"""
+        return {
+            'name': file_info['name'],
+            'path': local_path,
+            'mime_type': file_info['mimeType'],
+            'size': file_info.get('size', 0),
+            'drive_id': file_info.get('driveId'),  # Track if from Shared Drive
+            'drive_file_id': file_info['id'],
+            'folder_path': file_info.get('folder_path', ''),
+            'content_sha256': content_sha256,
+            'reused': reused  # '' or 'extraction_cache'
+        }
+
+    def download_reused_file(self, entry: Dict, workspace_dir: Optional[str] = None) -> Dict:
+        """
+        Download a file that was planned as reused from the extraction cache
+
+        Used when its cache entry expired or was evicted between listing and
+        extraction; returns a regular downloaded entry.
+        """
+        file_info = {
+            'id': entry['drive_file_id'],
+            'name': entry['name'],
+            'mimeType': entry['mime_type'],
+            'size': entry.get('size', 0),
+            'driveId': entry.get('drive_id'),
+            'folder_path': entry.get('folder_path', '')
+        }
+        local_path, content_sha256 = self._download_file(file_info['id'], file_info['name'],
+                                                         file_info['mimeType'], workspace_dir)
+        return self._downloaded_entry(file_info, local_path, content_sha256)
+
+    def _plan_downloads(self, files: List[Dict], manifest: DataroomManifest,
+                        doc_processor=None) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        Split listed files into those to download and those reusable from a previous run
+
+        Unchanged files whose extraction is still cached are served from the
+        extraction cache without downloading at all. Local copies are never
+        reused: every job downloads into a fresh workspace of its own.
+        """
+        to_download: List[Dict] = []
+        reused: Dict[str, Dict] = {}
+
+        for file_info in files:
+            entry = manifest.get(file_info['id'])
+            if (entry and manifest.is_unchanged(file_info) and doc_processor
+                    and entry.get('extraction_cache_key')
+                    and doc_processor.has_cached_extraction(entry['extraction_cache_key'])):
+                reused[file_info['id']] = self._downloaded_entry(
+                    file_info, entry.get('local_path'), entry.get('content_sha256'), reused='extraction_cache')
+            else:
+                to_download.append(file_info)
 
-            # Download file with Shared Drive support
-            request = self.service.files().get_media(
-                fileId=file_id,
-                supportsAllDrives=True  # CRITICAL for Shared Drive files
-            )
+        return to_download, reused
 
-            file_io = io.BytesIO()
-
-            downloader = MediaIoBaseDownload(file_io, request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-                if status:
-                    progress = int(status.progress() * 100)
-                    if progress % 25 == 0:  # Log every 25%
-                        logger.info(f"📥 Download progress: {progress}%")
-
-            # Write to local file
-            with open(local_path, 'wb') as f:
-                f.write(file_io.getvalue())
-
-            file_size = os.path.getsize(local_path)
-            logger.info(f"✅ Downloaded: {file_name} -> {local_path} ({file_size} bytes)")
-            return local_path
-
-        except HttpError as e:
-            if e.resp.status == 403:
-                logger.error(f"❌ Permission denied downloading {file_name}")
-                logger.error("💡 Service account may need access to this specific file")
-            elif e.resp.status == 404:
-                logger.error(f"❌ File not found: {file_name}")
-            else:
-                logger.error(f"❌ HTTP error downloading {file_name}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"❌ Failed to download {file_name}: {e}")
-            raise
+    def _download_files_concurrently(self, indexed_files: List[Tuple[int, Dict]],
+                                     on_file_event: Optional[FileEventCallback] = None,
+                                     workspace_dir: Optional[str] = None) -> Tuple[List[Dict], Dict]:
+        """Download (listing index, file) pairs on a bounded thread pool; returns (entries, throughput stats)"""
+        start_time = time.time()
+        stats: Dict = {'retries': 0}
+        files = [file_info for _, file_info in indexed_files]
+        notify = on_file_event or (lambda event, index, data: None)
 
-    def download_dataroom(self, drive_link: str) -> List[Dict]:
-        """Download all supported files from a data room folder - FIXED"""
+        def download(position_and_file):
+            position, (index, file_info) = position_and_file
+            try:
+                logger.info(f"📥 Downloading {position}/{len(files)}: {file_info['name']}")
+                notify('downloading', index, file_info)
+                local_path, content_sha256 = self._download_file(
+                    file_info['id'],
+                    file_info['name'],
+                    file_info['mimeType'],
+                    workspace_dir,
+                    stats
+                )
+                entry = self._downloaded_entry(file_info, local_path, content_sha256)
+                notify('ready', index, entry)
+                return entry
+            except Exception as e:
+                logger.error(f"❌ Failed to download {file_info['name']}: {e}")
+                notify('failed', index, file_info)
+                return None
+
+        if not files:
+            stats.update({'files': 0, 'failed': 0, 'bytes': 0, 'seconds': 0.0,
+                          'mb_per_second': 0.0, 'workers': 0})
+            return [], stats
+
+        workers = max(1, min(config.DRIVE_DOWNLOAD_WORKERS, len(files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive-download") as executor:
+            results = list(executor.map(download, enumerate(indexed_files, 1)))
+
+        downloaded_files = [r for r in results if r is not None]
+        elapsed = time.time() - start_time
+        total_bytes = sum(os.path.getsize(f['path']) for f in downloaded_files if os.path.exists(f['path']))
+        stats.update({
+            'files': len(downloaded_files),
+            'failed': len(files) - len(downloaded_files),
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 2),
+            'mb_per_second': round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed > 0 else 0.0,
+            'workers': workers
+        })
+        logger.info(f"📊 Download throughput: {total_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s "
+                    f"({stats['mb_per_second']} MB/s, {workers} workers, "
+                    f"{stats['retries']} retries)")
+        return downloaded_files, stats
+
+    def download_dataroom(self, drive_link: str, doc_processor=None,
+                          on_file_event: Optional[FileEventCallback] = None,
+                          workspace_dir: Optional[str] = None) -> List[Dict]:
+        """
+        Download all supported files from a data room folder - FIXED
+
+        A per-folder manifest lets re-runs download only new or changed files.
+        Pass the DocumentProcessor so unchanged files can be served from the
+        extraction cache without downloading.
+        Files are written to ``workspace_dir`` (the job's workspace, see
+        utils.workspace) as ``{file_id}_{name}``; defaults to the temp dir.
+
+        ``on_file_event(event, index, data)`` is called as files progress, with
+        ``index`` the file's position in the returned listing order:
+        'queued' (listing dict), 'downloading' (listing dict),
+        'ready' (downloaded entry) and 'failed' (listing dict).
+        Events may arrive from download worker threads.
+        """
         try:
             logger.info(f"🚀 Starting data room download from: {drive_link}")
-            logger.info(f"📁 Using temp directory: {self.temp_dir}")
+            logger.info(f"📁 Using download directory: {workspace_dir or self.temp_dir}")
 
             # Extract folder ID
             folder_id = self.extract_folder_id(drive_link)
 
             # List folder contents with enhanced Shared Drive support
-            files = self.list_folder_contents(folder_id)
+            files, listing_stats = self._list_folder_contents(folder_id)
 
             if not files:
+                self._publish_stats(listing_stats, {})
                 logger.warning("⚠️ No supported files found in data room")
                 logger.info("💡 Troubleshooting steps:")
                 logger.info("   1. Verify the folder contains PDF, Word, Excel, or CSV files")
@@ -275,32 +621,54 @@ class GoogleDriveHandler:
                 logger.warning(f"⚠️ Too many files ({len(files)}), limiting to {config.MAX_FILES_PER_DATAROOM}")
                 files = files[:config.MAX_FILES_PER_DATAROOM]
 
-            # Download all files
+            # Skip files over the size limit before downloading (uses listed size)
+            max_bytes = config.MAX_FILE_SIZE_MB * 1024 * 1024
+            oversized = [f for f in files if int(f.get('size', 0) or 0) > max_bytes]
+            for file_info in oversized:
+                logger.warning(f"⚠️ Skipping {file_info['name']}: {int(file_info['size']) / (1024 * 1024):.1f} MB "
+                               f"exceeds {config.MAX_FILE_SIZE_MB} MB limit")
+            files = [f for f in files if f not in oversized]
+
+            # Reuse unchanged files from the previous run's manifest
+            manifest = DataroomManifest(folder_id)
+            to_download, reused = self._plan_downloads(files, manifest, doc_processor)
+            if reused:
+                logger.info(f"♻️ Reusing {len(reused)}/{len(files)} unchanged files from previous analysis")
+
+            if on_file_event:
+                for index, file_info in enumerate(files):
+                    on_file_event('queued', index, file_info)
+                for index, file_info in enumerate(files):
+                    if file_info['id'] in reused:
+                        on_file_event('ready', index, reused[file_info['id']])
+
+            # Download concurrently, keeping listing order
+            download_ids = {file_info['id'] for file_info in to_download}
+            indexed_downloads = [(index, file_info) for index, file_info in enumerate(files)
+                                 if file_info['id'] in download_ids]
+            new_entries, download_stats = self._download_files_concurrently(
+                indexed_downloads, on_file_event, workspace_dir)
+            new_downloads = {entry['drive_file_id']: entry for entry in new_entries}
+            download_stats['skipped_oversize'] = len(oversized)
+            download_stats['reused'] = len(reused)
+
             downloaded_files = []
-            for i, file_info in enumerate(files, 1):
-                try:
-                    logger.info(f"📥 Downloading {i}/{len(files)}: {file_info['name']}")
-
-                    local_path = self.download_file(
-                        file_info['id'],
-                        file_info['name'],
-                        file_info['mimeType']
-                    )
-
-                    downloaded_files.append({
-                        'name': file_info['name'],
-                        'path': local_path,
-                        'mime_type': file_info['mimeType'],
-                        'size': file_info.get('size', 0),
-                        'drive_id': file_info.get('driveId')  # Track if from Shared Drive
-                    })
-
-                except Exception as e:
-                    logger.error(f"❌ Failed to download {file_info['name']}: {e}")
+            for file_info in files:
+                entry = reused.get(file_info['id']) or new_downloads.get(file_info['id'])
+                if entry is None:
                     continue
+                downloaded_files.append(entry)
+                if file_info['id'] in new_downloads:
+                    cache_key = (doc_processor.extraction_cache_key(entry['name'], entry['content_sha256'])
+                                 if doc_processor and entry['content_sha256'] else None)
+                    manifest.record(file_info, entry['path'], entry['content_sha256'], cache_key)
+
+            manifest.prune({file_info['id'] for file_info in files})
+            manifest.save()
+            self._publish_stats(listing_stats, download_stats)
 
             logger.info(f"✅ Successfully downloaded {len(downloaded_files)}/{len(files)} files")
-            logger.info(f"📂 Files stored in: {self.temp_dir}")
+            logger.info(f"📂 Files stored in: {workspace_dir or self.temp_dir}")
 
             # Log Shared Drive vs Personal Drive stats
             shared_drive_files = sum(1 for f in downloaded_files if f.get('drive_id'))
@@ -328,7 +696,12 @@ class GoogleDriveHandler:
             raise
 
     def cleanup_temp_files(self):
-        """Clean up temporary downloaded files - Cloud ready"""
+        """
+        Clean up loose files at the top level of the temp dir - Cloud ready
+
+        Session downloads live in per-session workspaces; use
+        WorkspaceManager.discard to remove a single session's files.
+        """
         try:
             if os.path.exists(self.temp_dir):
                 file_count = 0
@@ -0,0 +1,43 @@
+"""
+Extraction worker entry points for DataRoom Intelligence Bot
+Runs in ExtractionPool processes; imports only what extraction needs (never app.py)
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+from config.settings import config
+
+_worker_processor = None
+_worker_started_queue = None
+
+
+def init_extraction_worker(started_queue, defer_ocr: bool = False):
+    global _worker_processor, _worker_started_queue
+    from handlers.doc_processor import DocumentProcessor
+    _worker_processor = DocumentProcessor()
+    _worker_processor.defer_ocr = defer_ocr
+    _worker_started_queue = started_queue
+
+
+def extract_file_worker(index: int, file_info: Dict) -> Any:
+    """
+    Extract one file inside a pool worker
+
+    Large results are written to a spill file and the path is returned,
+    so multi-megabyte extractions do not travel through the result pipe.
+    """
+    _worker_started_queue.put((index, time.time(), os.getpid()))
+    processed_doc = _worker_processor.process_document(
+        file_info['path'], file_info['name'], file_info['mime_type'],
+        content_hash=file_info.get('content_sha256')
+    )
+
+    if len(processed_doc.get('content', '')) > config.EXTRACTION_INLINE_RESULT_BYTES:
+        spill_fd, spill_path = tempfile.mkstemp(prefix='extract_', suffix='.json', dir=str(config.temp_dir))
+        with os.fdopen(spill_fd, 'w', encoding='utf-8') as spill_file:
+            json.dump(processed_doc, spill_file, default=str)
+        return spill_path
+    return processed_doc
@@ -0,0 +1,228 @@
+"""
+Map-reduce analysis for DataRoom Intelligence Bot
+Reviews every document (or group of its pages) of a large data room concurrently, then merges the reviews
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from config.settings import config
+from prompts.analysis_prompts import DOCUMENT_MAP_PROMPT, DATAROOM_REDUCE_PROMPT
+from utils.context_packer import ContextPacker, TokenCounter, get_token_counter
+from utils.disk_cache import DiskCache
+from utils.retrieval_index import chunk_text, split_pages
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAP_PROMPT_VERSION = "1"  # Bump when DOCUMENT_MAP_PROMPT changes so cached reviews are recomputed
+MAP_SYSTEM_MESSAGE = "You are a senior venture capital analyst reviewing part of a startup data room."
+MIN_SUMMARY_TOKENS = 80  # Reduce-prompt share below which a review is no longer useful
+
+
+@dataclass
+class MapUnit:
+    """One map call: a whole document or a run of consecutive pages of it"""
+    document: str
+    content: str
+    tokens: int
+    weight: float  # Priority when a data room has more units than ANALYSIS_MAP_MAX_UNITS
+    first_page: Optional[int] = None
+    last_page: Optional[int] = None
+    part: Optional[int] = None  # Part number when an unpaged document is split
+
+    @property
+    def label(self) -> str:
+        if self.first_page is not None:
+            pages = (f"page {self.first_page}" if self.first_page == self.last_page
+                     else f"pages {self.first_page}-{self.last_page}")
+            return f"{self.document} ({pages})"
+        if self.part is not None:
+            return f"{self.document} (part {self.part})"
+        return self.document
+
+
+class MapReduceAnalyzer:
+    """
+    Analyzes data rooms that don't fit in one prompt
+
+    Documents are split into units of at most ANALYSIS_MAP_UNIT_TOKENS
+    (consecutive pages; unpaged text in parts). Each unit is reviewed by its
+    own bounded completion, ANALYSIS_MAP_CONCURRENCY at a time, and the
+    reviews are merged by a reduce prompt whose output has the same sections
+    as the single-pass analysis. Reviews are cached by a hash of the unit's
+    content, so re-analyzing a data room only reviews what changed.
+    """
+
+    def __init__(self, llm, model: str = "gpt-4", counter: Optional[TokenCounter] = None):
+        self.llm = llm
+        self.model = model
+        self.counter = counter or get_token_counter()
+        self._cache: Optional[DiskCache] = None
+        self._cache_lock = threading.Lock()
+
+    @property
+    def cache(self) -> Optional[DiskCache]:
+        """Persistent review cache (created on first use; None if it can't be opened)"""
+        with self._cache_lock:
+            if self._cache is None:
+                try:
+                    self._cache = DiskCache(
+                        config.cache_dir / "analysis_map_cache.sqlite3",
+                        name="Analysis map",
+                        ttl_seconds=config.ANALYSIS_MAP_CACHE_TTL_HOURS * 3600,
+                        max_bytes=config.ANALYSIS_MAP_CACHE_MAX_MB * 1024 * 1024
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Analysis map cache unavailable: {e}")
+            return self._cache
+
+    @staticmethod
+    def should_use(packing_report: Dict[str, Any]) -> bool:
+        """Whether /analyze should map-reduce, given the single-pass ContextPacker report"""
+        mode = config.ANALYSIS_MAP_REDUCE_MODE
+        if mode in ("always", "true"):
+            return True
+        if mode != "auto":
+            return False
+
+        left_out = sum(item['tokens'] for item in packing_report.get('dropped', [])
+                       if item['reason'] != 'boilerplate')
+        total = packing_report.get('token_count', 0) + left_out
+        return total > 0 and left_out / total >= config.ANALYSIS_MAP_REDUCE_THRESHOLD
+
+    def build_units(self, processed_documents: List[Dict[str, Any]]) -> List[MapUnit]:
+        """Split documents into map units, in document and page order"""
+        packer = ContextPacker(counter=self.counter)
+        budget = config.ANALYSIS_MAP_UNIT_TOKENS
+        units: List[MapUnit] = []
+
+        for doc in processed_documents:
+            if doc.get('type') == 'error' or not doc.get('content'):
+                continue
+            weight = packer.document_weight(doc)
+            group: List[str] = []
+            group_tokens = 0
+            first_page = last_page = None
+
+            def flush():
+                if group:
+                    content = "".join(group)
+                    units.append(MapUnit(doc['name'], content, group_tokens,
+                                         weight * (1 + min(packer.financial_density(content), 10) / 10),
+                                         first_page, last_page))
+
+            for page, text in split_pages(doc['content']):
+                if page is None:
+                    # Unpaged text (spreadsheets, Word, plain text): split into parts of the unit size
+                    parts = chunk_text(text, budget * 3, 0) if self.counter.count(text) > budget else [text]
+                    for number, part in enumerate(parts, 1):
+                        part = self.counter.truncate(part, budget)
+                        units.append(MapUnit(doc['name'], part, self.counter.count(part),
+                                             weight * (1 + min(packer.financial_density(part), 10) / 10),
+                                             part=number if len(parts) > 1 else None))
+                    continue
+
+                rendered = f"\n--- Page {page} ---\n{text}\n"
+                tokens = self.counter.count(rendered)
+                if tokens > budget:
+                    rendered = self.counter.truncate(rendered, budget)
+                    tokens = self.counter.count(rendered)
+                if group and group_tokens + tokens > budget:
+                    flush()
+                    group, group_tokens, first_page = [], 0, None
+                group.append(rendered)
+                group_tokens += tokens
+                first_page = page if first_page is None else first_page
+                last_page = page
+            flush()
+
+        return units
+
+    def cache_key(self, unit: MapUnit) -> str:
+        payload = "\x1f".join([MAP_PROMPT_VERSION, self.model, str(config.ANALYSIS_MAP_SUMMARY_TOKENS),
+                               unit.label, unit.content])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def review(self, unit: MapUnit) -> str:
+        """Bounded review of one unit, from the cache when its content was reviewed before"""
+        cache = self.cache
+        key = self.cache_key(unit)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        summary = self.llm.chat(
+            "analyze.map",
+            model=self.model,
+            messages=[
+                {"role": "system", "content": MAP_SYSTEM_MESSAGE},
+                {"role": "user", "content": DOCUMENT_MAP_PROMPT.format(document_name=unit.label,
+                                                                       document_content=unit.content)}
+            ],
+            max_tokens=config.ANALYSIS_MAP_SUMMARY_TOKENS,
+            temperature=0.2,
+            use_cache=False  # Cached here by content instead of by full prompt
+        )
+        if cache is not None and summary:
+            cache.set(key, summary)
+        return summary
+
+    def map(self, processed_documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Review every unit concurrently; returns the reviews in document order plus a report"""
+        units = self.build_units(processed_documents)
+        skipped: List[MapUnit] = []
+        if len(units) > config.ANALYSIS_MAP_MAX_UNITS:
+            ranked = sorted(range(len(units)), key=lambda index: units[index].weight, reverse=True)
+            keep = set(ranked[:config.ANALYSIS_MAP_MAX_UNITS])
+            skipped = [unit for index, unit in enumerate(units) if index not in keep]
+            units = [unit for index, unit in enumerate(units) if index in keep]
+            logger.warning(f"⚠️ Data room has {len(units) + len(skipped)} map units; "
+                           f"reviewing the {len(units)} highest-value ones")
+
+        cache = self.cache
+        cached = sum(1 for unit in units if cache is not None and cache.contains(self.cache_key(unit)))
+        logger.info(f"🗺️ Map pass: {len(units)} units ({cached} cached) over "
+                    f"{sum(unit.tokens for unit in units)} tokens")
+
+        def review_or_none(unit: MapUnit) -> Optional[str]:
+            try:
+                return self.review(unit)
+            except Exception as e:
+                logger.warning(f"⚠️ Review of {unit.label} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(config.ANALYSIS_MAP_CONCURRENCY, len(units))),
+                                thread_name_prefix="analysis-map") as executor:
+            summaries = list(executor.map(review_or_none, units))
+
+        reviews = [(unit, summary) for unit, summary in zip(units, summaries) if summary]
+        if not reviews:
+            raise RuntimeError("Map pass produced no document reviews")
+
+        return {
+            'reviews': reviews,
+            'report': {
+                'units': len(units),
+                'cached_units': cached,
+                'failed_units': [unit.label for unit, summary in zip(units, summaries) if not summary],
+                'skipped_units': [unit.label for unit in skipped],
+                'mapped_tokens': sum(unit.tokens for unit in units)
+            }
+        }
+
+    def build_reduce_prompt(self, documents_summary: str, extracted_financials: str, reviews) -> str:
+        """Reduce prompt with every review, each trimmed to an equal share of ANALYSIS_REDUCE_TOKEN_BUDGET"""
+        share = max(config.ANALYSIS_REDUCE_TOKEN_BUDGET // max(len(reviews), 1), MIN_SUMMARY_TOKENS)
+        document_summaries = "".join(
+            f"\n\n=== REVIEW: {unit.label} ===\n{self.counter.truncate(summary.strip(), share)}"
+            for unit, summary in reviews
+        )
+        return DATAROOM_REDUCE_PROMPT.format(
+            documents_with_metadata=documents_summary,
+            extracted_financials=extracted_financials,
+            document_summaries=document_summaries
+        )
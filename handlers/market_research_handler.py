@@ -7,10 +7,11 @@ acknowledgment and response handling for Slack slash commands.
 """
 
 import os
-import threading
-import time
 from datetime import datetime
 from typing import Dict, Any, Optional
+from agents.progress_tracker import create_slack_progress_tracker
+from utils.session_store import SessionStore
+from utils.job_scheduler import get_job_scheduler, format_queue_position
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,13 +19,13 @@ logger = get_logger(__name__)
 class MarketResearchHandler:
     """Handler for market research commands with proper Slack response handling"""
     
-    def __init__(self, orchestrator, user_sessions: Dict):
+    def __init__(self, orchestrator, user_sessions: SessionStore):
         """
         Initialize the market research handler
         
         Args:
             orchestrator: Market research orchestrator instance
-            user_sessions: Dictionary storing user session data
+            user_sessions: Shared SessionStore holding user session data
         """
         self.orchestrator = orchestrator
         self.user_sessions = user_sessions
@@ -89,11 +90,11 @@ class MarketResearchHandler:
                 )
                 
                 # Store mock market research in session
-                self.user_sessions[user_id]['market_research'] = {
+                self.user_sessions.update_session(user_id, market_research={
                     'result': {'test_mode': True},
                     'timestamp': datetime.now().isoformat(),
                     'analysis_type': 'test_mode_mock'
-                }
+                })
                 logger.info("✅ TEST MODE market research completed")
                 return
             
@@ -118,15 +119,21 @@ class MarketResearchHandler:
             
             logger.info(f"🎯 Initial response sent with ts: {initial_response['ts']}")
             
-            # Start background market research analysis
-            thread = threading.Thread(
-                target=self._perform_analysis,
-                args=(client, channel_id, user_id, initial_response['ts']),
-                daemon=True
+            # Queue background market research on the network worker pool
+            submit_result = get_job_scheduler().submit(
+                'network', user_id, 'market_research', self._perform_analysis,
+                client, channel_id, user_id, initial_response['ts']
             )
-            thread.start()
+            queue_message = format_queue_position(submit_result)
+            if queue_message:
+                client.chat_update(
+                    channel=channel_id,
+                    ts=initial_response['ts'],
+                    text=("🔍 **Market Research Analysis Queued**\n\n" if submit_result.accepted
+                          else "❌ **Market Research Not Started**\n\n") + queue_message
+                )
             
-            logger.info("🎯 Background thread started successfully")
+            logger.info(f"🎯 Market research job submitted (accepted={submit_result.accepted}, position={submit_result.position})")
             
         except Exception as e:
             logger.error(f"❌ Error in market research command: {e}", exc_info=True)
@@ -196,64 +203,8 @@ class MarketResearchHandler:
             
             logger.info(f"🔍 Starting market intelligence analysis for user {user_id}")
             
-            # Small delay to ensure message is sent
-            time.sleep(0.5)
-            
-            # Update progress - Phase 1 of 5
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text="🔍 **Market Research Analysis in Progress**\n\n" +
-                     "📊 **Phase 1/5:** Market Detection & Taxonomy\n" +
-                     "🎯 Identifying 4-level hierarchy (Solution → Sub-vertical → Vertical → Industry)\n" +
-                     "⏳ Status: Processing documents with GPT-5..."
-            )
-            
-            # Simulate some processing time
-            time.sleep(1)
-            
-            # Update progress - Phase 2 of 5
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text="🔍 **Market Research Analysis in Progress**\n\n" +
-                     "📊 **Phase 2/5:** Competitive Intelligence Search\n" +
-                     "🔍 Executing 3-level hierarchical web search via Tavily API\n" +
-                     "⏳ Status: Discovering competitors across Solution, Sub-vertical & Vertical levels..."
-            )
-            
-            # Update progress - Phase 3 of 5
-            time.sleep(1)
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text="🔍 **Market Research Analysis in Progress**\n\n" +
-                     "📊 **Phase 3/5:** Market Validation Research\n" +
-                     "📈 Searching for TAM/SAM validation and expert market opinions\n" +
-                     "⏳ Status: Gathering independent market data and precedents..."
-            )
-            
-            # Update progress - Phase 4 of 5
-            time.sleep(1)
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text="🔍 **Market Research Analysis in Progress**\n\n" +
-                     "📊 **Phase 4/5:** Funding Intelligence Gathering\n" +
-                     "💰 Searching for funding patterns, valuations, and investment climate data\n" +
-                     "⏳ Status: Analyzing investment trends and financial benchmarks..."
-            )
-            
-            # Update progress - Phase 5 of 5 (GPT-5 Synthesis - takes longer)
-            time.sleep(1.5)
-            client.chat_update(
-                channel=channel_id,
-                ts=message_ts,
-                text="🔍 **Market Research Analysis in Progress**\n\n" +
-                     "📊 **Phase 5/5:** GPT-5 Market Intelligence Synthesis\n" +
-                     "🤖 AI synthesis of all collected data into professional investment analysis\n" +
-                     "⏳ **Note:** This phase may take 1-2 minutes - synthesizing all intelligence..."
-            )
+            # Slack progress is driven by orchestrator phase events (no simulated delays)
+            progress_tracker = create_slack_progress_tracker(client, channel_id, message_ts)
             
             # Get analysis result from /analyze for funding benchmarking
             analysis_result = session_data.get('analysis_result', {})
@@ -266,12 +217,14 @@ class MarketResearchHandler:
             if cached_market_profile:
                 logger.info("✅ TASK-UX-003: Using cached market taxonomy (saves ~$0.07 GPT-5 call)")
                 market_intelligence_result = self.orchestrator.perform_market_intelligence(
-                    processed_documents, document_summary, analysis_result, cached_market_profile
+                    processed_documents, document_summary, analysis_result, cached_market_profile,
+                    progress_tracker=progress_tracker
                 )
             else:
                 logger.info("ℹ️ No cached taxonomy found - will detect from scratch")
                 market_intelligence_result = self.orchestrator.perform_market_intelligence(
-                    processed_documents, document_summary, analysis_result
+                    processed_documents, document_summary, analysis_result,
+                    progress_tracker=progress_tracker
                 )
             logger.info("✅ Market intelligence analysis complete")
             
@@ -286,11 +239,11 @@ class MarketResearchHandler:
             )
             
             # Store market research results in user session
-            self.user_sessions[user_id]['market_research'] = {
+            self.user_sessions.update_session(user_id, market_research={
                 'result': market_intelligence_result,
                 'timestamp': datetime.now().isoformat(),
                 'analysis_type': 'comprehensive_market_intelligence'
-            }
+            })
             
             logger.info(f"✅ Market research analysis completed for user {user_id}")
             
@@ -0,0 +1,219 @@
+"""
+Speculative precomputation for DataRoom Intelligence Bot
+Generates /memo and /gaps in the background right after /analyze, within a per-workspace cost cap
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+from config.settings import config
+from utils.llm_gateway import LLMCallCancelled, get_llm_gateway
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Speculative kind -> AIAnalyzer method that produces it
+SPECULATIVE_KINDS = {
+    'memo': 'generate_investment_memo',
+    'gaps': 'analyze_gaps'
+}
+
+COST_WINDOW_SECONDS = 24 * 3600
+
+
+class SpeculativeCostCap:
+    """Rolling 24h spend on speculative work per Slack workspace (team id)"""
+
+    def __init__(self, daily_cap_usd: float):
+        self.daily_cap_usd = daily_cap_usd
+        self._spend: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def _spent(self, team_id: str, now: float) -> float:
+        """Spend inside the window (lock held)"""
+        entries = self._spend.setdefault(team_id, deque())
+        while entries and now - entries[0][0] > COST_WINDOW_SECONDS:
+            entries.popleft()
+        return sum(cost for _, cost in entries)
+
+    def allows(self, team_id: str) -> bool:
+        """True while the workspace is under its cap (a job that starts under it may finish a little over)"""
+        with self._lock:
+            allowed = self._spent(team_id, time.time()) < self.daily_cap_usd
+            if not allowed:
+                self.skipped += 1
+            return allowed
+
+    def charge(self, team_id: str, cost_usd: float):
+        if cost_usd > 0:
+            with self._lock:
+                self._spend.setdefault(team_id, deque()).append((time.time(), cost_usd))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                'daily_cap_usd': self.daily_cap_usd,
+                'skipped_over_cap': self.skipped,
+                'spent_usd': {team_id: round(self._spent(team_id, now), 4) for team_id in list(self._spend)}
+            }
+
+
+class SpeculativePrecomputer:
+    """
+    Runs /memo and /gaps ahead of the user on the low-priority 'speculative' job class
+
+    Results are stored in the AnalysisSession they were computed for. A
+    command takes a finished result at once, waits for a running job
+    (SPECULATIVE_ATTACH_TIMEOUT_SECONDS), and runs the call itself if the job
+    hasn't started yet or the wait times out; the job is then skipped or
+    cancelled. Jobs run at background priority in the LLM gateway, and jobs
+    for a session the user has since replaced with a new /analyze are skipped.
+
+    Jobs are tracked by ``AnalysisSession.session_id``, not by object, so a
+    session the store reloaded from disk still finds its jobs.
+    """
+
+    def __init__(self, analyzer, scheduler, cost_cap: Optional[SpeculativeCostCap] = None):
+        self.analyzer = analyzer
+        self.scheduler = scheduler
+        self.cost_cap = cost_cap or SpeculativeCostCap(config.SPECULATIVE_DAILY_COST_CAP_USD)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.attached = 0
+        self.misses = 0
+        self.completed = 0
+        self.cancelled = 0
+        self._latest_sessions: Dict[str, str] = {}  # user id -> session_id speculation is for
+        self._jobs: Dict[Tuple[str, str], Any] = {}  # (session_id, kind) -> Job
+        self._skipped: Set[Tuple[str, str]] = set()  # (session_id, kind) answered interactively
+
+    def start(self, session, user_id: str, team_id: Optional[str] = None,
+              on_result: Optional[Callable[[Any, str], None]] = None):
+        """Queue every speculative kind for a freshly analyzed session"""
+        team_id = team_id or 'default'
+        with self._lock:
+            previous = self._latest_sessions.get(user_id)
+            self._latest_sessions[user_id] = session.session_id
+            if previous is not None and previous != session.session_id:
+                # Running jobs of the replaced session see it as stale; their entries can go
+                self._jobs = {key: job for key, job in self._jobs.items() if key[0] != previous}
+                self._skipped = {key for key in self._skipped if key[0] != previous}
+        if not self.cost_cap.allows(team_id):
+            logger.info(f"💸 Speculative precompute skipped for workspace {team_id}: daily cost cap reached")
+            return
+
+        queued = []
+        for kind in SPECULATIVE_KINDS:
+            # The session in the name keeps a still-queued job for the previous /analyze from deduplicating this one
+            submit_result = self.scheduler.submit(
+                'speculative', user_id, f"{kind}.speculative.{session.session_id[:12]}", self._run,
+                session, kind, team_id, on_result, user_id
+            )
+            if submit_result.accepted:
+                with self._lock:
+                    self._jobs[(session.session_id, kind)] = submit_result.job
+                queued.append(kind)
+        logger.info(f"🔮 Speculative {', '.join(queued)} queued for user {user_id}")
+
+    def _is_stale(self, session, user_id: str) -> bool:
+        with self._lock:
+            return self._latest_sessions.get(user_id) != session.session_id
+
+    def _is_skipped(self, session, kind: str) -> bool:
+        with self._lock:
+            return (session.session_id, kind) in self._skipped
+
+    def _skip(self, session, kind: str):
+        with self._lock:
+            self._skipped.add((session.session_id, kind))
+
+    def _run(self, session, kind: str, team_id: str, on_result: Optional[Callable[[Any, str], None]],
+             user_id: str) -> Optional[str]:
+        if self._is_skipped(session, kind):
+            logger.info(f"🔮 Speculative {kind} skipped: already answered interactively")
+            return None
+        if self._is_stale(session, user_id):
+            logger.info(f"🔮 Speculative {kind} skipped: user {user_id} has run a newer /analyze")
+            return None
+        if not self.cost_cap.allows(team_id):
+            logger.info(f"💸 Speculative {kind} skipped for workspace {team_id}: daily cost cap reached")
+            return None
+
+        def cancelled() -> bool:
+            return self._is_skipped(session, kind) or self._is_stale(session, user_id)
+
+        gateway = get_llm_gateway()
+        text = None
+        with gateway.cost_scope() as scope:
+            try:
+                with gateway.background(cancelled):
+                    text = getattr(self.analyzer, SPECULATIVE_KINDS[kind])(session)
+            except LLMCallCancelled:
+                pass
+        self.cost_cap.charge(team_id, scope.cost_usd)
+
+        if cancelled():
+            with self._lock:
+                self.cancelled += 1
+            logger.info(f"🔮 Speculative {kind} cancelled (${scope.cost_usd:.3f} spent)")
+            return None
+        if not text or text.startswith("❌"):
+            logger.warning(f"⚠️ Speculative {kind} produced no usable result")
+            return None
+
+        session.speculative_results[kind] = text
+        with self._lock:
+            self.completed += 1
+        logger.info(f"🔮 Speculative {kind} ready (${scope.cost_usd:.3f})")
+        if on_result is not None:
+            try:
+                on_result(session, kind)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not persist speculative {kind}: {e}")
+        return text
+
+    def take(self, session, kind: str) -> Optional[str]:
+        """Precomputed result for a command, waiting for it if it is being generated; None = run it now"""
+        if session is None:
+            return None
+
+        text = session.speculative_results.get(kind)
+        if text is None:
+            with self._lock:
+                job = self._jobs.get((session.session_id, kind))
+            if job is not None and job.status == "completed" and job.result:
+                text = job.result  # Finished for an earlier copy of this session (reloaded from disk since)
+            elif job is not None and job.status == "running":
+                logger.info(f"🔮 Attaching /{kind} to running speculative job {job.job_id}")
+                if job.wait(config.SPECULATIVE_ATTACH_TIMEOUT_SECONDS):
+                    text = job.result
+                    if text is not None:
+                        with self._lock:
+                            self.attached += 1
+                        return text
+                else:
+                    # The command runs the call itself now; stop the job before its next LLM call
+                    logger.info(f"🔮 Speculative {kind} job {job.job_id} still running, cancelling it")
+                    self._skip(session, kind)
+            elif job is not None and job.status == "queued":
+                self._skip(session, kind)  # The command runs it now; don't pay twice
+
+            if text is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            session.speculative_results[kind] = text
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"🔮 /{kind} answered from speculative result")
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {'completed': self.completed, 'hits': self.hits, 'attached': self.attached,
+                        'misses': self.misses, 'cancelled': self.cancelled}
+        return {**counters, 'cost_cap': self.cost_cap.stats()}
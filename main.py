@@ -0,0 +1,8 @@
+"""
+Process entry point for DataRoom Intelligence Bot
+Kept import-safe: extraction worker processes (forkserver/spawn) re-import the entry module
+"""
+
+if __name__ == "__main__":
+    from app import main
+    main()
@@ -0,0 +1,323 @@
+"""
+Context packer for DataRoom Intelligence
+Fits extracted documents into a token budget, keeping the highest-value pages of each document
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import config
+from utils.retrieval_index import split_pages
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Base share of the budget per document type (DocumentProcessor 'type')
+DOCUMENT_TYPE_WEIGHTS = {
+    'excel': 1.5,
+    'csv': 1.4,
+    'pdf': 1.0,
+    'word': 0.9,
+    'text': 0.8
+}
+
+# File-name hints that a document is more (or less) central to an investment decision
+DOCUMENT_NAME_WEIGHTS = [
+    (re.compile(r'financ|model|p&l|pnl|forecast|budget|metrics|kpi|cap ?table', re.IGNORECASE), 1.4),
+    (re.compile(r'deck|pitch|teaser|memo|overview|summary', re.IGNORECASE), 1.2),
+    (re.compile(r'nda|terms? of|privacy|policy|bylaws|articles|template', re.IGNORECASE), 0.6)
+]
+
+# Cheap signals of financial content: currency amounts, percentages and metric keywords
+FINANCIAL_SIGNAL_PATTERN = re.compile(
+    r'[$€£]\s?\d[\d,.]*\s?[kmb]?\b|\b\d[\d,.]*\s?(?:%|k€|m€|usd|eur|million|millones|mil)\b|'
+    r'\b(?:revenue|ingresos|arr|mrr|ebitda|margin|burn|runway|cac|ltv|churn|gmv|valuation|'
+    r'pre-money|post-money|funding|round|cash|profit|loss|growth)\b',
+    re.IGNORECASE
+)
+
+# Context windows (prompt + completion tokens) of the chat models the bot runs on
+MODEL_CONTEXT_WINDOWS = {
+    'gpt-4': 8192,
+    'gpt-4-32k': 32768,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4o-mini': 128000,
+    'gpt-3.5-turbo': 16385
+}
+DEFAULT_CONTEXT_WINDOW = 8192  # Unknown models get the smallest window above
+
+CHAT_MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators around every chat message
+CHAT_REPLY_OVERHEAD_TOKENS = 3  # Priming of the assistant reply
+
+MIN_PAGE_TOKENS = 20  # Shorter pages (marker included) are headers, separators or blank slides
+MIN_TRUNCATED_TOKENS = 150  # Don't bother including a page fragment smaller than this
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken, else ~4 chars per token
+
+    tiktoken downloads the encoding's BPE file the first time it is loaded
+    unless it is already in TIKTOKEN_CACHE_DIR (the deploy build ships it;
+    elsewhere it defaults to the cache dir). preload() does this at startup,
+    so the first /analyze neither waits on the download nor packs with the
+    chars/4 estimate when it fails.
+    """
+
+    def __init__(self, model: str = "gpt-4"):
+        self.model = model
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _get_encoding(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                os.environ.setdefault("TIKTOKEN_CACHE_DIR", str(config.cache_dir / "tiktoken"))
+                try:
+                    import tiktoken
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except ImportError:
+                    logger.warning("⚠️ tiktoken not installed, estimating tokens as chars/4")
+                except Exception as e:
+                    logger.warning(f"⚠️ tiktoken encoding unavailable ({e}), estimating tokens as chars/4")
+            return self._encoding
+
+    @property
+    def exact(self) -> bool:
+        return self._get_encoding() is not None
+
+    def preload(self) -> bool:
+        """Load the encoding now, downloading it if it is not cached; True if counts are exact"""
+        start = time.time()
+        exact = self.exact
+        if exact:
+            logger.info(f"🔢 Token encoding for {self.model} ready in {time.time() - start:.1f}s")
+        return exact
+
+    def count(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens, on a whitespace boundary where possible"""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            tokens = encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            cut = encoding.decode(tokens[:max_tokens])
+        else:
+            if len(text) <= max_tokens * 4:
+                return text
+            cut = text[:max_tokens * 4]
+        boundary = cut.rfind(' ')
+        return cut[:boundary] if boundary > len(cut) // 2 else cut
+
+
+@dataclass
+class _Page:
+    page: Optional[int]
+    text: str
+    tokens: int  # Including the page marker
+    value: float
+
+    @property
+    def marker(self) -> str:
+        return f"\n--- Page {self.page} ---\n" if self.page is not None else ""
+
+
+@dataclass
+class PackedContext:
+    """Packed prompt content plus a report of what was kept and dropped"""
+    content: str
+    token_count: int
+    token_budget: int
+    exact_tokens: bool
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'token_count': self.token_count,
+            'token_budget': self.token_budget,
+            'exact_tokens': self.exact_tokens,
+            'documents': self.documents,
+            'dropped_pages': len(self.dropped),
+            'dropped_tokens': sum(item['tokens'] for item in self.dropped),
+            'dropped': self.dropped
+        }
+
+
+class ContextPacker:
+    """
+    Packs processed documents into a global token budget
+
+    Every document gets a share of the budget weighted by its type, its name
+    and the density of financial signals in it; shares a document can't use
+    are handed to the others. Within a document, pages are taken by value
+    (financial-signal density, with a bonus for the opening pages) until its
+    share is spent, then emitted in page order. Blank and repeated
+    (boilerplate) pages are skipped.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, counter: Optional[TokenCounter] = None):
+        self.token_budget = config.ANALYSIS_CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+        self.counter = counter or get_token_counter()
+
+    @staticmethod
+    def financial_density(text: str) -> float:
+        """Financial signals per 1,000 characters"""
+        if not text:
+            return 0.0
+        return len(FINANCIAL_SIGNAL_PATTERN.findall(text)) * 1000 / len(text)
+
+    def document_weight(self, doc: Dict[str, Any]) -> float:
+        weight = DOCUMENT_TYPE_WEIGHTS.get(doc.get('type'), 1.0)
+        for pattern, multiplier in DOCUMENT_NAME_WEIGHTS:
+            if pattern.search(doc.get('name', '')):
+                weight *= multiplier
+                break
+        return weight * (1 + min(self.financial_density(doc.get('content', '')), 10) / 10)
+
+    def pack(self, processed_documents: List[Dict[str, Any]]) -> PackedContext:
+        docs = [doc for doc in processed_documents if doc.get('type') != 'error' and doc.get('content')]
+        dropped: List[Dict[str, Any]] = []
+        pages_by_doc: List[List[_Page]] = []
+        seen_pages = set()
+
+        for doc in docs:
+            pages = []
+            for page_number, text in split_pages(doc['content']):
+                normalized = ' '.join(text.lower().split())
+                page = _Page(page_number, text, 0,
+                             self.financial_density(text) + (1.0 if page_number is not None and page_number <= 3 else 0.0))
+                page.tokens = self.counter.count(f"{page.marker}{text}\n")
+                if page.tokens < MIN_PAGE_TOKENS or normalized in seen_pages:
+                    dropped.append(self._dropped(doc, page_number, page.tokens, 'boilerplate'))
+                    continue
+                seen_pages.add(normalized)
+                pages.append(page)
+            pages_by_doc.append(pages)
+
+        headers = [f"\n\n=== DOCUMENT: {doc['name']} ===\n" for doc in docs]
+        header_tokens = sum(self.counter.count(header) for header in headers)
+        shares = self._allocate(
+            [self.document_weight(doc) for doc in docs],
+            [sum(page.tokens for page in pages) for pages in pages_by_doc],
+            max(self.token_budget - header_tokens, 0)
+        )
+
+        content = ""
+        documents = []
+        for doc_index, doc in enumerate(docs):
+            selected, doc_dropped = self._select_pages(doc, pages_by_doc[doc_index], shares[doc_index])
+            dropped.extend(doc_dropped)
+            documents.append({'name': doc['name'], 'share_tokens': shares[doc_index],
+                              'used_tokens': sum(tokens for _, tokens in selected),
+                              'pages_included': len(selected), 'pages_dropped': len(doc_dropped)})
+            if selected:
+                content += headers[doc_index] + "".join(text for text, _ in selected)
+
+        total_tokens = self.counter.count(content) if content else 0
+        packed = PackedContext(content, total_tokens, self.token_budget, self.counter.exact, documents, dropped)
+        logger.info(f"🧮 Packed {len(docs)} documents into {total_tokens}/{self.token_budget} tokens "
+                    f"({len(dropped)} pages dropped, {packed.report()['dropped_tokens']} tokens)")
+        return packed
+
+    @staticmethod
+    def _allocate(weights: List[float], needs: List[int], budget: int) -> List[int]:
+        """Split the budget by weight; whatever a document doesn't need goes back to the rest"""
+        shares = [0] * len(weights)
+        open_docs = [i for i, need in enumerate(needs) if need > 0]
+        remaining = budget
+
+        while open_docs and remaining > 0:
+            total_weight = sum(weights[i] for i in open_docs) or 1.0
+            satisfied = [i for i in open_docs
+                         if needs[i] - shares[i] <= remaining * weights[i] / total_weight]
+            if not satisfied:
+                for i in open_docs:
+                    shares[i] += int(remaining * weights[i] / total_weight)
+                break
+            for i in satisfied:
+                remaining -= needs[i] - shares[i]
+                shares[i] = needs[i]
+                open_docs.remove(i)
+
+        return shares
+
+    def _select_pages(self, doc: Dict[str, Any], pages: List[_Page],
+                      share: int) -> Tuple[List[Tuple[str, int]], List[Dict[str, Any]]]:
+        """Highest-value pages that fit in the share, rendered in page order as (text, tokens)"""
+        chosen: List[Tuple[int, str, int]] = []
+        dropped = []
+        remaining = share
+
+        ranked = sorted(enumerate(pages), key=lambda item: item[1].value, reverse=True)
+        for position, page in ranked:
+            if page.tokens <= remaining:
+                chosen.append((position, f"{page.marker}{page.text}\n", page.tokens))
+                remaining -= page.tokens
+            elif remaining >= MIN_TRUNCATED_TOKENS:
+                marker_tokens = self.counter.count(f"{page.marker}\n")
+                text = f"{page.marker}{self.counter.truncate(page.text, remaining - marker_tokens)}\n"
+                tokens = self.counter.count(text)
+                chosen.append((position, text, tokens))
+                dropped.append(self._dropped(doc, page.page, page.tokens - tokens, 'truncated'))
+                remaining -= tokens
+            else:
+                dropped.append(self._dropped(doc, page.page, page.tokens, 'over_budget'))
+
+        chosen.sort()
+        return [(text, tokens) for _, text, tokens in chosen], dropped
+
+    @staticmethod
+    def _dropped(doc: Dict[str, Any], page: Optional[int], tokens: int, reason: str) -> Dict[str, Any]:
+        return {'document': doc['name'], 'page': page, 'tokens': tokens, 'reason': reason}
+
+
+_default_counter = TokenCounter()
+
+
+def model_context_window(model: str) -> int:
+    """Context window of ``model`` in tokens (ANALYSIS_MODEL_CONTEXT_TOKENS overrides)"""
+    if config.ANALYSIS_MODEL_CONTEXT_TOKENS:
+        return config.ANALYSIS_MODEL_CONTEXT_TOKENS
+    if model in MODEL_CONTEXT_WINDOWS:
+        return MODEL_CONTEXT_WINDOWS[model]
+    # Dated snapshots ("gpt-4-0613", "gpt-4o-2024-08-06") share their family's window
+    family = max((name for name in MODEL_CONTEXT_WINDOWS if model.startswith(f"{name}-")), key=len, default=None)
+    return MODEL_CONTEXT_WINDOWS[family] if family else DEFAULT_CONTEXT_WINDOW
+
+
+def count_chat_tokens(messages: List[Dict[str, str]], counter: Optional[TokenCounter] = None) -> int:
+    """Prompt tokens of a chat request, including per-message overhead"""
+    counter = counter or get_token_counter()
+    return CHAT_REPLY_OVERHEAD_TOKENS + sum(
+        counter.count(message.get('content') or '') + CHAT_MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def get_token_counter() -> TokenCounter:
+    """Process-wide token counter (its encoding is loaded once and shared)"""
+    return _default_counter
+
+
+def preload_token_encoding() -> bool:
+    """Load the shared counter's encoding (call at startup, before jobs pack context)"""
+    return _default_counter.preload()
+
+
+def pack_documents(processed_documents: List[Dict[str, Any]], token_budget: Optional[int] = None) -> PackedContext:
+    """Convenience wrapper around ContextPacker"""
+    return ContextPacker(token_budget).pack(processed_documents)
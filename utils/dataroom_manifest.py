@@ -0,0 +1,96 @@
+"""
+Data room manifest for DataRoom Intelligence
+Per-folder record of downloaded Drive files so re-runs only fetch new or changed files
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from config.settings import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DataroomManifest:
+    """
+    JSON manifest for one Drive folder, keyed by Drive file id
+
+    Each entry records md5Checksum, modifiedTime, size, the local path of the
+    last download, its SHA-256 and the extraction cache key derived from it.
+    """
+
+    def __init__(self, folder_id: str):
+        self.folder_id = folder_id
+        manifest_dir = config.cache_dir / "manifests"
+        manifest_dir.mkdir(parents=True, exist_ok=True)
+        self.path = str(manifest_dir / f"{folder_id}.json")
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as manifest_file:
+                return json.load(manifest_file).get('files', {})
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable manifest {self.path}: {e}")
+            return {}
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(file_id)
+
+    def is_unchanged(self, file_info: Dict[str, Any]) -> bool:
+        """True if the listed Drive file matches the manifest entry"""
+        entry = self.entries.get(file_info['id'])
+        if not entry:
+            return False
+        if file_info.get('md5Checksum') and entry.get('md5Checksum'):
+            return file_info['md5Checksum'] == entry['md5Checksum']
+        # Google-native files have no md5; fall back to modification time and size
+        return (file_info.get('modifiedTime') == entry.get('modifiedTime')
+                and str(file_info.get('size', '')) == str(entry.get('size', '')))
+
+    def record(self, file_info: Dict[str, Any], local_path: str,
+               content_sha256: Optional[str], extraction_cache_key: Optional[str]):
+        """Create or replace the entry for a downloaded file"""
+        with self._lock:
+            self.entries[file_info['id']] = {
+                'name': file_info['name'],
+                'folder_path': file_info.get('folder_path', ''),
+                'md5Checksum': file_info.get('md5Checksum'),
+                'modifiedTime': file_info.get('modifiedTime'),
+                'size': file_info.get('size'),
+                'local_path': local_path,
+                'content_sha256': content_sha256,
+                'extraction_cache_key': extraction_cache_key,
+                'updated_at': datetime.now().isoformat()
+            }
+
+    def prune(self, current_file_ids):
+        """Drop entries for files no longer in the folder"""
+        with self._lock:
+            for file_id in list(self.entries):
+                if file_id not in current_file_ids:
+                    del self.entries[file_id]
+
+    def save(self):
+        """Write the manifest atomically"""
+        with self._lock:
+            tmp_path = None
+            try:
+                # A unique temp file per save: concurrent runs on the same folder each replace the manifest whole
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.path) or '.',
+                                                 prefix=f"{os.path.basename(self.path)}.", suffix='.tmp',
+                                                 delete=False) as manifest_file:
+                    tmp_path = manifest_file.name
+                    json.dump({'folder_id': self.folder_id, 'files': self.entries}, manifest_file, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to save manifest {self.path}: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
@@ -0,0 +1,188 @@
+"""
+Persistent disk cache for DataRoom Intelligence
+SQLite-backed key/value store with TTL expiry, size caps and LRU eviction
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskCache:
+    """
+    Thread-safe persistent cache stored in a single SQLite file
+
+    Values are JSON-serialized and zlib-compressed. Entries older than
+    ``ttl_seconds`` are treated as misses and purged. When ``max_entries``
+    or ``max_bytes`` is exceeded, least-recently-used entries are evicted.
+    """
+
+    def __init__(self, path: str, name: str = "cache", ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.path = str(path)
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache (
+                       key TEXT PRIMARY KEY,
+                       value BLOB NOT NULL,
+                       size INTEGER NOT NULL,
+                       created_at REAL NOT NULL,
+                       last_accessed REAL NOT NULL
+                   )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache(last_accessed)")
+            self._conn.commit()
+
+        logger.info(f"🗄️ {self.name} cache ready: {self.path}")
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None on miss/expiry"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                value, created_at = row
+                if self._is_expired(created_at, now):
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.expirations += 1
+                    self.misses += 1
+                    return None
+
+                self._conn.execute("UPDATE cache SET last_accessed = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+
+            return json.loads(zlib.decompress(value).decode('utf-8'))
+
+        except Exception as e:
+            logger.warning(f"⚠️ {self.name} cache read failed: {e}")
+            self.misses += 1
+            return None
+
+    def contains(self, key: str) -> bool:
+        """Check for a live entry without touching LRU order or hit/miss counters"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+            return row is not None and not self._is_expired(row[0], time.time())
+        except Exception as e:
+            logger.warning(f"⚠️ {self.name} cache lookup failed: {e}")
+            return False
+
+    def set(self, key: str, value: Any):
+        """Store ``value`` under ``key`` and enforce size limits"""
+        now = time.time()
+        try:
+            blob = zlib.compress(json.dumps(value, default=str).encode('utf-8'))
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, created_at, last_accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now)
+                )
+                self._evict()
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ {self.name} cache write failed: {e}")
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def _evict(self):
+        """Purge expired entries, then evict LRU entries until within limits (lock held)"""
+        if self.ttl_seconds is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.expirations += max(cursor.rowcount, 0)
+
+        if self.max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY last_accessed ASC LIMIT ?)", (excess,)
+                )
+                self.evictions += excess
+
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM cache ORDER BY last_accessed ASC"
+                ).fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    total -= size
+                    self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        try:
+            with self._lock:
+                entries, total_bytes = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+                ).fetchone()
+        except Exception as e:
+            logger.warning(f"⚠️ {self.name} cache stats failed: {e}")
+            entries, total_bytes = 0, 0
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': total_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'ttl_seconds': self.ttl_seconds,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes
+        }
@@ -983,7 +983,7 @@ Provide your synthesis (max 3000 characters):
 def synthesize_market_intelligence_with_gpt4(references, market_profile=None):
     """Use GPT-5 to synthesize real content from all collected references"""
     import os
-    from openai import OpenAI
+    from utils.llm_gateway import get_llm_gateway
     
     # Check if we're in test mode
     if os.getenv('TEST_MODE', 'false').lower() == 'true':
@@ -1010,9 +1010,6 @@ From an investment perspective, corporate VCs including Shell Ventures and Cater
         """.strip()
     
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
         # Scrape content from all references
         logger.info(f"🔍 Scraping content from {len(references)} sources for GPT-5 synthesis...")
         scraped_content = []
@@ -1046,7 +1043,8 @@ From an investment perspective, corporate VCs including Shell Ventures and Cater
         
         # Get GPT-5 synthesis with more tokens to avoid truncation
         logger.info("🤖 Generating GPT-5 market intelligence synthesis...")
-        response = client.chat.completions.create(
+        synthesis = get_llm_gateway().chat(
+            "market.synthesis",
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a senior VC analyst providing executive market intelligence."},
@@ -1054,9 +1052,7 @@ From an investment perspective, corporate VCs including Shell Ventures and Cater
             ],
             temperature=0.1,
             max_tokens=1200  # Increased to avoid truncation
-        )
-        
-        synthesis = response.choices[0].message.content.strip()
+        ).strip()
         
         # Add professional title and spacing
         final_output = "📊 **MARKET INTELLIGENCE SUMMARY**\n\n"
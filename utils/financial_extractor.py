@@ -6,63 +6,391 @@ before passing to GPT-5 for analysis. It uses pattern matching to identify fundi
 KPIs, percentages, and other financial metrics that GPT-5 might miss due to formatting.
 """
 
+import math
 import re
 import logging
-from typing import Dict, List, Any, Optional
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+from utils.retrieval_index import iter_pages
 
 logger = logging.getLogger(__name__)
 
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+FUNDING_PATTERNS = [
+    # Standard formats: 300K, €1M, $5M, 2.5B
+    r'(\d+[.,]?\d*)\s*([KMB])\s*([€$]|EUR|USD|euro|dollar)',
+    r'([€$]|EUR|USD|euro|dollar)\s*(\d+[.,]?\d*)\s*([KMB])',
+    # Funding context: "Initial financing 2019 needs 300K"
+    r'(?:funding|financing|investment|capital|raise|need|ask)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
+    # Number with currency: 300K€, $1M, €500K
+    r'(\d+[.,]?\d*)\s*([KMB])\s*([€$])',
+    r'([€$])\s*(\d+[.,]?\d*)\s*([KMB])',
+]
+
+KPI_PATTERNS = {
+    'cac': [
+        r'CAC[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'Customer\s+Acquisition\s+Cost[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'(?:CAC|customer acquisition)[:\s]*([€$]?\s*\d+[.,]?\d*[€$]?)',
+    ],
+    'cpl': [
+        r'CPL[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'Cost\s+Per\s+Lead[:\s]*([€$]?\s*\d+[.,]?\d*)',
+    ],
+    'ltv': [
+        r'LTV[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'Customer\s+Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)',
+    ],
+    'arpu': [
+        r'ARPU[:\s]*([€$]?\s*\d+[.,]?\d*)',
+        r'Average\s+Revenue\s+Per\s+User[:\s]*([€$]?\s*\d+[.,]?\d*)',
+    ]
+}
+
+PERCENTAGE_PATTERNS = [
+    # Conversion rates, margins, growth
+    r'(\d+[.,]?\d*)\s*%',
+    r'(\d+[.,]?\d*)\s*percent',
+]
+
+REVENUE_PATTERNS = [
+    r'(?:revenue|sales|income)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
+    r'(?:profit|loss|EBITDA|margin)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
+    r'P&L|profit.*loss|cash.*flow|income.*statement',
+]
+
+# Context keywords used to classify amounts (matched against lowercased context windows)
+EXIT_INDICATORS = [
+    'sold by', 'sold for', 'sold to', 'acquisition', 'acquired for',
+    'akamon', 'startup sold', 'company sold', 'exit'
+]
+FOUNDER_INDICATORS = [
+    'previous startup', 'founder of', 'sold a startup', 'entrepreneur',
+    'previous company', 'previously sold', 'ceo previously'
+]
+KNOWN_EXIT_INDICATORS = ['akamon']
+MARKET_INDICATORS = [
+    'market size', 'tam', 'total addressable market', 'market value',
+    'industry size', 'market potential', 'jewelry market', 'global market',
+    'market worth', 'billion market', 'european market', 'serviceable obtainable market',
+    'market opportunity', 'addressable market', 'market represents'
+]
+STRONG_MARKET_INDICATORS = ['€70b', '€35b', '€1.5b', 'global', 'billion', 'market']
+COMPANY_FUNDING_INDICATORS = [
+    'initial financing', 'funding needs', 'investment needs', 'capital needs',
+    'raise', 'raised', 'funding', 'investment', 'series a', 'series b',
+    'seed', 'round', 'investors', 'valuation', 'financing 2019'
+]
+YEAR_MARKERS = ['2019', '2020', '2021', '2022', '2023', '2024', '2025']
+
+# ==========================================
+# SINGLE-PASS SCANNING
+# ==========================================
+#
+# Instead of running every pattern over the whole corpus, the content is
+# lowercased once and one keyword scan records where every keyword occurs.
+# Patterns that start with a keyword are only tried (anchored) at those
+# positions, patterns that need a literal the content lacks are skipped, and
+# context windows are classified from the recorded keyword positions.
+# Results are identical to running each pattern with re.finditer/re.search.
+
+# Lowercase literals every match of a pattern starts with (a superset is fine).
+# Keyed by the pattern string so an edited pattern falls back to a full scan.
+LEADING_LITERALS = {
+    r'([€$]|EUR|USD|euro|dollar)\s*(\d+[.,]?\d*)\s*([KMB])': ('€', '$', 'eur', 'usd', 'dollar'),
+    r'(?:funding|financing|investment|capital|raise|need|ask)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)':
+        ('funding', 'financing', 'investment', 'capital', 'raise', 'need', 'ask'),
+    r'([€$])\s*(\d+[.,]?\d*)\s*([KMB])': ('€', '$'),
+    r'CAC[:\s]*([€$]?\s*\d+[.,]?\d*)': ('cac',),
+    r'Customer\s+Acquisition\s+Cost[:\s]*([€$]?\s*\d+[.,]?\d*)': ('customer',),
+    r'(?:CAC|customer acquisition)[:\s]*([€$]?\s*\d+[.,]?\d*[€$]?)': ('cac', 'customer'),
+    r'CPL[:\s]*([€$]?\s*\d+[.,]?\d*)': ('cpl',),
+    r'Cost\s+Per\s+Lead[:\s]*([€$]?\s*\d+[.,]?\d*)': ('cost',),
+    r'LTV[:\s]*([€$]?\s*\d+[.,]?\d*)': ('ltv',),
+    r'Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)': ('life',),
+    r'Customer\s+Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)': ('customer',),
+    r'ARPU[:\s]*([€$]?\s*\d+[.,]?\d*)': ('arpu',),
+    r'Average\s+Revenue\s+Per\s+User[:\s]*([€$]?\s*\d+[.,]?\d*)': ('average',),
+    r'(?:revenue|sales|income)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)': ('revenue', 'sales', 'income'),
+    r'(?:profit|loss|EBITDA|margin)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)': ('profit', 'loss', 'ebitda', 'margin'),
+    r'P&L|profit.*loss|cash.*flow|income.*statement': ('p&l', 'profit', 'cash', 'income'),
+}
+
+# Lowercase literals of which every match contains at least one (gates full scans)
+REQUIRED_LITERALS = {
+    r'(\d+[.,]?\d*)\s*([KMB])\s*([€$]|EUR|USD|euro|dollar)': ('€', '$', 'eur', 'usd', 'dollar'),
+    r'(\d+[.,]?\d*)\s*([KMB])\s*([€$])': ('€', '$'),
+    r'(\d+[.,]?\d*)\s*%': ('%',),
+    r'(\d+[.,]?\d*)\s*percent': ('percent',),
+}
+
+# Characters re.IGNORECASE folds onto ASCII letters (or that change length when
+# lowercased); content containing them is scanned pattern by pattern instead
+CASE_FOLD_EXCEPTIONS = ('ſ', 'İ', 'K', 'ı')
+
+EXIT_FLAG = 1
+FOUNDER_FLAG = 2
+KNOWN_EXIT_FLAG = 4
+MARKET_FLAG = 8
+YEAR_FLAG = 16
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str):
+    return re.compile(pattern, PATTERN_FLAGS)
+
+
+class KeywordScanner:
+    """
+    Finds every occurrence of a fixed keyword set (overlaps included) in one pass per keyword
+
+    Keywords carry bit flags, so "does this window contain any keyword of
+    class X" becomes a bisect over recorded positions instead of one
+    substring search per keyword per window. CPython's substring search
+    outperforms a pure-Python Aho-Corasick automaton at this keyword count.
+    """
+
+    def __init__(self, keyword_flags: Dict[str, int]):
+        self.keyword_flags = keyword_flags
+
+    def scan(self, text: str) -> "KeywordOccurrences":
+        occurrences = []
+        for keyword, flags in self.keyword_flags.items():
+            position = text.find(keyword)
+            while position != -1:
+                occurrences.append((position, position + len(keyword), flags, keyword))
+                position = text.find(keyword, position + 1)
+        occurrences.sort()
+        return KeywordOccurrences(occurrences)
+
+
+class KeywordOccurrences:
+    """Sorted keyword occurrences of one text"""
+
+    def __init__(self, occurrences: List[Tuple[int, int, int, str]]):
+        self.starts = [occurrence[0] for occurrence in occurrences]
+        self.ends = [occurrence[1] for occurrence in occurrences]
+        self.flags = [occurrence[2] for occurrence in occurrences]
+        self.by_keyword: Dict[str, List[int]] = {}
+        for start, _, _, keyword in occurrences:
+            self.by_keyword.setdefault(keyword, []).append(start)
+
+    def contains(self, keyword: str) -> bool:
+        return keyword in self.by_keyword
+
+    def starts_of(self, keywords: Iterable[str]) -> List[int]:
+        """Sorted, de-duplicated start positions of any of the keywords"""
+        positions = set()
+        for keyword in keywords:
+            positions.update(self.by_keyword.get(keyword, ()))
+        return sorted(positions)
+
+    def flags_within(self, start: int, end: int) -> int:
+        """OR of the flags of keywords lying entirely inside text[start:end]"""
+        flags = 0
+        index = bisect_left(self.starts, start)
+        while index < len(self.starts) and self.starts[index] < end:
+            if self.ends[index] <= end:
+                flags |= self.flags[index]
+            index += 1
+        return flags
+
+
+def _build_keyword_flags() -> Dict[str, int]:
+    keyword_flags: Dict[str, int] = {}
+    for keywords, flag in [(EXIT_INDICATORS, EXIT_FLAG), (FOUNDER_INDICATORS, FOUNDER_FLAG),
+                           (KNOWN_EXIT_INDICATORS, KNOWN_EXIT_FLAG),
+                           (MARKET_INDICATORS + STRONG_MARKET_INDICATORS, MARKET_FLAG),
+                           (YEAR_MARKERS, YEAR_FLAG)]:
+        for keyword in keywords:
+            keyword_flags[keyword] = keyword_flags.get(keyword, 0) | flag
+    for literals in list(LEADING_LITERALS.values()) + list(REQUIRED_LITERALS.values()):
+        for literal in literals:
+            keyword_flags.setdefault(literal, 0)
+    return keyword_flags
+
+
+KEYWORD_SCANNER = KeywordScanner(_build_keyword_flags())
+
+
+# ==========================================
+# STRUCTURED RECORDS
+# ==========================================
+#
+# extract_records() runs the same patterns page by page over processed
+# documents and keeps every match as a typed record with its source, in
+# parallel columns (arrays of numbers, dictionary-encoded strings) plus a
+# per-category row index, so validation and prompt formatting are lookups.
+
+FUNDING_CATEGORIES = ('company_funding', 'market_data', 'founder_exits')
+PERCENTAGE_CATEGORY = 'percentage'
+REVENUE_CATEGORIES = ('revenue_metric', 'pl_mention')
+
+AMOUNT_NUMBER_PATTERN = re.compile(r'(\d+)(?:[.,](\d+))?\s*([kmb](?![a-z]))?')
+AMOUNT_MULTIPLIERS = {'k': 1e3, 'm': 1e6, 'b': 1e9}
+
+
+def _normalize_amount(text: str) -> Tuple[float, str]:
+    """(numeric value, 'EUR'/'USD'/'') for an amount like '300K€', '$1,5M' or '1,500' (NaN if there's no number)"""
+    lowered = text.lower()
+    if '€' in lowered or 'eur' in lowered:
+        currency = 'EUR'
+    elif '$' in lowered or 'usd' in lowered or 'dollar' in lowered:
+        currency = 'USD'
+    else:
+        currency = ''
+
+    match = AMOUNT_NUMBER_PATTERN.search(lowered)
+    if not match:
+        return math.nan, currency
+    whole, fraction, multiplier = match.groups()
+    if fraction is None:
+        value = float(whole)
+    elif len(fraction) == 3 and not multiplier:
+        value = float(whole + fraction)  # Thousands separator: 1,500 / 1.500
+    else:
+        value = float(f"{whole}.{fraction}")
+    if multiplier:
+        value *= AMOUNT_MULTIPLIERS[multiplier]
+    return value, currency
+
+
+class _Dictionary:
+    """Dictionary encoding for a repetitive string column"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class FinancialRecordStore:
+    """
+    Columnar store of extracted financial records
+
+    One row per match: amount text, normalized value (NaN if none), currency,
+    category, document, page (0 = no page markers) and char offset in the
+    document. Plain lists, arrays and dicts, so it pickles with the session.
+    """
+
+    def __init__(self):
+        self.amounts: List[str] = []
+        self.values = array('d')
+        self.pages = array('i')
+        self.offsets = array('q')
+        self.currency_codes = array('H')
+        self.category_codes = array('H')
+        self.doc_codes = array('H')
+        self.currencies = _Dictionary()
+        self.categories = _Dictionary()
+        self.documents = _Dictionary()
+        self.rows_by_category: Dict[str, array] = {}
+
+    def add(self, amount: str, category: str, doc_name: str, page: Optional[int], offset: int,
+            value: Optional[float] = None, currency: Optional[str] = None):
+        if value is None or currency is None:
+            normalized_value, normalized_currency = _normalize_amount(amount)
+            value = normalized_value if value is None else value
+            currency = normalized_currency if currency is None else currency
+
+        row = len(self.amounts)
+        self.amounts.append(amount)
+        self.values.append(value)
+        self.pages.append(page or 0)
+        self.offsets.append(offset)
+        self.currency_codes.append(self.currencies.encode(currency))
+        self.category_codes.append(self.categories.encode(category))
+        self.doc_codes.append(self.documents.encode(doc_name))
+        self.rows_by_category.setdefault(category, array('I')).append(row)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def rows(self, category: str) -> array:
+        return self.rows_by_category.get(category, array('I'))
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return {
+            'amount': self.amounts[row],
+            'value': None if math.isnan(self.values[row]) else self.values[row],
+            'currency': self.currencies.values[self.currency_codes[row]] or None,
+            'category': self.categories.values[self.category_codes[row]],
+            'doc_name': self.documents.values[self.doc_codes[row]],
+            'page': self.pages[row] or None,
+            'offset': self.offsets[row]
+        }
+
+    def citation(self, row: int) -> str:
+        doc_name = self.documents.values[self.doc_codes[row]]
+        return f"{doc_name} p.{self.pages[row]}" if self.pages[row] else doc_name
+
+    def distinct_amounts(self, category: str) -> Dict[str, List[int]]:
+        """Amount text -> rows it occurs in, in first-seen order"""
+        amounts: Dict[str, List[int]] = {}
+        for row in self.rows(category):
+            amounts.setdefault(self.amounts[row], []).append(row)
+        return amounts
+
+    def numeric_values(self, category: str) -> List[float]:
+        """Distinct normalized values of a category, sorted"""
+        return sorted({self.values[row] for row in self.rows(category) if not math.isnan(self.values[row])})
+
+    @property
+    def has_financial_data(self) -> bool:
+        return any(self.rows(category) for category in
+                   ('company_funding', 'market_data', PERCENTAGE_CATEGORY, 'revenue_metric', *KPI_PATTERNS))
+
+    def validate(self) -> List[str]:
+        """Same checks as the text extractor, on normalized values instead of re-parsed strings"""
+        warnings = []
+
+        # Company funding >10% of a market size is suspicious
+        market_values = self.numeric_values('market_data')
+        for company_value in self.numeric_values('company_funding'):
+            for market_value in market_values[:bisect_left(market_values, company_value * 10)]:
+                warnings.append(f"Company funding ({company_value}) unusually high vs market size ({market_value})")
+
+        # CAC > 50% of LTV is concerning (first mention of each)
+        cac_rows, ltv_rows = self.rows('cac'), self.rows('ltv')
+        if cac_rows and ltv_rows:
+            cac_value, ltv_value = self.values[cac_rows[0]], self.values[ltv_rows[0]]
+            if ltv_value > 0 and cac_value / ltv_value > 0.5:
+                warnings.append(f"CAC/LTV ratio concerning: CAC {self.amounts[cac_rows[0]]} ({self.citation(cac_rows[0])}), "
+                                f"LTV {self.amounts[ltv_rows[0]]} ({self.citation(ltv_rows[0])})")
+
+        # The same amount classified under different funding categories
+        seen: Dict[str, str] = {}
+        for category in FUNDING_CATEGORIES:
+            for amount in self.distinct_amounts(category):
+                if seen.setdefault(amount, category) != category:
+                    warnings.append("Duplicate amounts found across different categories")
+                    return warnings
+
+        return warnings
+
 
 class FinancialDataExtractor:
     """
     Extract financial data using deterministic pattern matching
     """
     
-    def __init__(self):
+    def __init__(self, single_pass: bool = True):
         """Initialize the financial extractor with patterns"""
-        self.funding_patterns = [
-            # Standard formats: 300K, €1M, $5M, 2.5B
-            r'(\d+[.,]?\d*)\s*([KMB])\s*([€$]|EUR|USD|euro|dollar)',
-            r'([€$]|EUR|USD|euro|dollar)\s*(\d+[.,]?\d*)\s*([KMB])',
-            # Funding context: "Initial financing 2019 needs 300K"
-            r'(?:funding|financing|investment|capital|raise|need|ask)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
-            # Number with currency: 300K€, $1M, €500K
-            r'(\d+[.,]?\d*)\s*([KMB])\s*([€$])',
-            r'([€$])\s*(\d+[.,]?\d*)\s*([KMB])',
-        ]
-        
-        self.kpi_patterns = {
-            'cac': [
-                r'CAC[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'Customer\s+Acquisition\s+Cost[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'(?:CAC|customer acquisition)[:\s]*([€$]?\s*\d+[.,]?\d*[€$]?)',
-            ],
-            'cpl': [
-                r'CPL[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'Cost\s+Per\s+Lead[:\s]*([€$]?\s*\d+[.,]?\d*)',
-            ],
-            'ltv': [
-                r'LTV[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'Customer\s+Life\s*Time\s+Value[:\s]*([€$]?\s*\d+[.,]?\d*)',
-            ],
-            'arpu': [
-                r'ARPU[:\s]*([€$]?\s*\d+[.,]?\d*)',
-                r'Average\s+Revenue\s+Per\s+User[:\s]*([€$]?\s*\d+[.,]?\d*)',
-            ]
-        }
-        
-        self.percentage_patterns = [
-            # Conversion rates, margins, growth
-            r'(\d+[.,]?\d*)\s*%',
-            r'(\d+[.,]?\d*)\s*percent',
-        ]
-        
-        self.revenue_patterns = [
-            r'(?:revenue|sales|income)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
-            r'(?:profit|loss|EBITDA|margin)[:\s]*([€$]?\s*\d+[.,]?\d*\s*[KMB]?[€$]?)',
-            r'P&L|profit.*loss|cash.*flow|income.*statement',
-        ]
+        self.single_pass = single_pass
+        self.funding_patterns = list(FUNDING_PATTERNS)
+        self.kpi_patterns = {kpi: list(patterns) for kpi, patterns in KPI_PATTERNS.items()}
+        self.percentage_patterns = list(PERCENTAGE_PATTERNS)
+        self.revenue_patterns = list(REVENUE_PATTERNS)
     
     def extract_all_financial_data(self, content: str) -> Dict[str, Any]:
         """
@@ -78,12 +406,15 @@ class FinancialDataExtractor:
             return self._empty_result()
         
         logger.info(f"🔍 Starting financial extraction from {len(content)} characters")
+
+        # One keyword scan shared by every pattern (None = scan pattern by pattern)
+        keywords = self._scan_keywords(content) if self.single_pass else None
         
         # Extract different types of financial data
-        funding_data = self._extract_funding_amounts(content)
-        kpi_data = self._extract_kpis(content)
-        percentage_data = self._extract_percentages(content)
-        revenue_data = self._extract_revenue_metrics(content)
+        funding_data = self._extract_funding_amounts(content, keywords)
+        kpi_data = self._extract_kpis(content, keywords)
+        percentage_data = self._extract_percentages(content, keywords)
+        revenue_data = self._extract_revenue_metrics(content, keywords)
         
         # Validate and check for inconsistencies
         validation_warnings = self._validate_extracted_data(funding_data, kpi_data, percentage_data)
@@ -115,35 +446,83 @@ class FinancialDataExtractor:
         
         return result
     
-    def _extract_funding_amounts(self, content: str) -> Dict[str, Any]:
-        """Extract funding amounts and investment needs with context awareness"""
-        company_funding = []
-        market_data = []
-        founder_exits = []
-        contexts = []
-        
+    def _scan_keywords(self, content: str) -> Optional[KeywordOccurrences]:
+        """Keyword positions in the lowercased content, or None if lowercasing can't stand in for IGNORECASE"""
+        if any(char in content for char in CASE_FOLD_EXCEPTIONS):
+            return None
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            return None
+        return KEYWORD_SCANNER.scan(lowered)
+
+    def _finditer(self, pattern: str, content: str,
+                  keywords: Optional[KeywordOccurrences] = None) -> Iterator[re.Match]:
+        """Same matches as re.finditer(pattern, content, IGNORECASE | MULTILINE)"""
+        compiled = _compile(pattern)
+        if keywords is None:
+            return compiled.finditer(content)
+
+        leading = LEADING_LITERALS.get(pattern)
+        if leading:
+            return self._anchored_matches(compiled, content, keywords.starts_of(leading))
+
+        required = REQUIRED_LITERALS.get(pattern)
+        if required and not any(keywords.contains(literal) for literal in required):
+            return iter(())
+        return compiled.finditer(content)
+
+    @staticmethod
+    def _anchored_matches(compiled, content: str, positions: List[int]) -> Iterator[re.Match]:
+        """finditer restricted to the only positions a match can start at"""
+        last_end = 0
+        for position in positions:
+            if position < last_end:
+                continue
+            match = compiled.match(content, position)
+            if match:
+                yield match
+                last_end = max(match.end(), position + 1)
+
+    def _funding_matches(self, content: str,
+                         keywords: Optional[KeywordOccurrences] = None) -> Iterator[Tuple[re.Match, str, str]]:
+        """(match, category, context) for every funding amount, categorized by its context"""
         for pattern in self.funding_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+            for match in self._finditer(pattern, content, keywords):
                 # Extract context around the match
                 start = max(0, match.start() - 100)
                 end = min(len(content), match.end() + 100)
                 context = content[start:end].strip().lower()
-                
-                amount_text = match.group(0)
-                
-                # Categorize based on context (order matters - most specific first)
-                if self._is_market_data_context(context):
-                    market_data.append(amount_text)
-                elif self._is_founder_exit_context(context):
-                    founder_exits.append(amount_text)
-                elif self._is_company_funding_context(context):
-                    company_funding.append(amount_text)
+
+                if keywords is not None:
+                    flags = keywords.flags_within(start, end)
+                    is_market = bool(flags & MARKET_FLAG)
+                    is_founder_exit = bool((flags & EXIT_FLAG and flags & FOUNDER_FLAG) or flags & KNOWN_EXIT_FLAG)
+                else:
+                    is_market = self._is_market_data_context(context)
+                    is_founder_exit = not is_market and self._is_founder_exit_context(context)
+
+                # Categorize based on context (order matters - most specific first);
+                # unclear contexts default to company funding
+                if is_market:
+                    yield match, 'market_data', context
+                elif is_founder_exit:
+                    yield match, 'founder_exits', context
                 else:
-                    # Default to company funding if context is unclear
-                    company_funding.append(amount_text)
-                
-                contexts.append(context)
+                    yield match, 'company_funding', context
+
+    def _extract_funding_amounts(self, content: str,
+                                 keywords: Optional[KeywordOccurrences] = None) -> Dict[str, Any]:
+        """Extract funding amounts and investment needs with context awareness"""
+        amounts = {'company_funding': [], 'market_data': [], 'founder_exits': []}
+        contexts = []
+
+        for match, category, context in self._funding_matches(content, keywords):
+            amounts[category].append(match.group(0))
+            contexts.append(context)
+
+        company_funding = amounts['company_funding']
+        market_data = amounts['market_data']
+        founder_exits = amounts['founder_exits']
         
         return {
             'company_funding': list(set(company_funding)),
@@ -155,53 +534,29 @@ class FinancialDataExtractor:
     
     def _is_founder_exit_context(self, context: str) -> bool:
         """Check if funding amount refers to founder's previous exit"""
-        # Specific company/exit indicators
-        exit_indicators = [
-            'sold by', 'sold for', 'sold to', 'acquisition', 'acquired for',
-            'akamon', 'startup sold', 'company sold', 'exit'
-        ]
-        
-        # Founder background indicators
-        founder_indicators = [
-            'previous startup', 'founder of', 'sold a startup', 'entrepreneur',
-            'previous company', 'previously sold', 'ceo previously'
-        ]
-        
         # Must have both exit context AND founder context for high confidence
-        has_exit_context = any(indicator in context for indicator in exit_indicators)
-        has_founder_context = any(indicator in context for indicator in founder_indicators)
+        has_exit_context = any(indicator in context for indicator in EXIT_INDICATORS)
+        has_founder_context = any(indicator in context for indicator in FOUNDER_INDICATORS)
         
         # Special case for known companies like Akamon
-        has_known_exit = 'akamon' in context
+        has_known_exit = any(indicator in context for indicator in KNOWN_EXIT_INDICATORS)
         
         return (has_exit_context and has_founder_context) or has_known_exit
     
     def _is_market_data_context(self, context: str) -> bool:
         """Check if amount refers to market size data"""
-        market_indicators = [
-            'market size', 'tam', 'total addressable market', 'market value',
-            'industry size', 'market potential', 'jewelry market', 'global market',
-            'market worth', 'billion market', 'european market', 'serviceable obtainable market',
-            'market opportunity', 'addressable market', 'market represents'
-        ]
+        has_market_indicator = any(indicator in context for indicator in MARKET_INDICATORS)
         # Strong market indicators that override other contexts
-        strong_indicators = ['€70b', '€35b', '€1.5b', 'global', 'billion', 'market']
-        
-        has_market_indicator = any(indicator in context for indicator in market_indicators)
-        has_strong_indicator = any(indicator in context for indicator in strong_indicators)
+        has_strong_indicator = any(indicator in context for indicator in STRONG_MARKET_INDICATORS)
         
         return has_market_indicator or has_strong_indicator
     
     def _is_company_funding_context(self, context: str) -> bool:
         """Check if amount refers to actual company funding"""
-        company_funding_indicators = [
-            'initial financing', 'funding needs', 'investment needs', 'capital needs',
-            'raise', 'raised', 'funding', 'investment', 'series a', 'series b',
-            'seed', 'round', 'investors', 'valuation', 'financing 2019'
-        ]
-        return any(indicator in context for indicator in company_funding_indicators)
+        return any(indicator in context for indicator in COMPANY_FUNDING_INDICATORS)
     
-    def _extract_kpis(self, content: str) -> Dict[str, Optional[str]]:
+    def _extract_kpis(self, content: str,
+                      keywords: Optional[KeywordOccurrences] = None) -> Dict[str, Optional[str]]:
         """Extract KPIs like CAC, CPL, LTV"""
         kpis = {}
         
@@ -209,7 +564,7 @@ class FinancialDataExtractor:
             kpis[kpi_name] = None
             
             for pattern in patterns:
-                matches = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+                matches = next(self._finditer(pattern, content, keywords), None)
                 if matches:
                     # Take the first match for each KPI type
                     kpis[kpi_name] = matches.group(1).strip()
@@ -217,25 +572,44 @@ class FinancialDataExtractor:
         
         return kpis
     
-    def _extract_percentages(self, content: str) -> Dict[str, Any]:
-        """Extract percentage values that might be conversion rates or margins"""
-        rates = []
-        contexts = []
-        
+    def _kpi_matches(self, content: str,
+                     keywords: Optional[KeywordOccurrences] = None) -> Iterator[Tuple[re.Match, str]]:
+        """(match, kpi name) for every KPI mention; patterns of one KPI matching at the same spot count once"""
+        for kpi_name, patterns in self.kpi_patterns.items():
+            seen_starts = set()
+            for pattern in patterns:
+                for match in self._finditer(pattern, content, keywords):
+                    if match.start() not in seen_starts:
+                        seen_starts.add(match.start())
+                        yield match, kpi_name
+
+    def _percentage_matches(self, content: str,
+                            keywords: Optional[KeywordOccurrences] = None) -> Iterator[Tuple[re.Match, str]]:
+        """(match, context) for percentages that don't look like years"""
         for pattern in self.percentage_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                percentage = match.group(1)
-                
+            for match in self._finditer(pattern, content, keywords):
                 # Get context to understand what this percentage refers to
                 start = max(0, match.start() - 30)
                 end = min(len(content), match.end() + 30)
                 context = content[start:end].strip()
-                
+
                 # Filter out obviously non-business percentages (like years: 2024%)
-                if not any(year in context for year in ['2019', '2020', '2021', '2022', '2023', '2024', '2025']):
-                    rates.append(f"{percentage}%")
-                    contexts.append(context)
+                if keywords is not None:
+                    mentions_year = bool(keywords.flags_within(start, end) & YEAR_FLAG)
+                else:
+                    mentions_year = any(year in context for year in YEAR_MARKERS)
+                if not mentions_year:
+                    yield match, context
+
+    def _extract_percentages(self, content: str,
+                             keywords: Optional[KeywordOccurrences] = None) -> Dict[str, Any]:
+        """Extract percentage values that might be conversion rates or margins"""
+        rates = []
+        contexts = []
+
+        for match, context in self._percentage_matches(content, keywords):
+            rates.append(f"{match.group(1)}%")
+            contexts.append(context)
         
         return {
             'rates': list(set(rates)),  # Remove duplicates
@@ -243,21 +617,25 @@ class FinancialDataExtractor:
             'count': len(set(rates))
         }
     
-    def _extract_revenue_metrics(self, content: str) -> Dict[str, Any]:
-        """Extract revenue-related metrics and P&L mentions"""
-        metrics = []
-        pl_mentions = []
-        
+    def _revenue_matches(self, content: str,
+                         keywords: Optional[KeywordOccurrences] = None) -> Iterator[Tuple[re.Match, str]]:
+        """(match, 'metrics' or 'pl_mentions') for revenue-related text"""
         for pattern in self.revenue_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                metric_text = match.group(0)
-                
+            for match in self._finditer(pattern, content, keywords):
                 # Check if this looks like P&L or financial statement mention
-                if any(term in metric_text.lower() for term in ['p&l', 'profit', 'loss', 'cash flow']):
-                    pl_mentions.append(metric_text)
+                if any(term in match.group(0).lower() for term in ['p&l', 'profit', 'loss', 'cash flow']):
+                    yield match, 'pl_mentions'
                 else:
-                    metrics.append(metric_text)
+                    yield match, 'metrics'
+
+    def _extract_revenue_metrics(self, content: str,
+                                 keywords: Optional[KeywordOccurrences] = None) -> Dict[str, Any]:
+        """Extract revenue-related metrics and P&L mentions"""
+        metrics = []
+        pl_mentions = []
+
+        for match, category in self._revenue_matches(content, keywords):
+            (pl_mentions if category == 'pl_mentions' else metrics).append(match.group(0))
         
         return {
             'metrics': list(set(metrics)),
@@ -420,6 +798,101 @@ class FinancialDataExtractor:
         
         return '\n'.join(sections)
 
+    def extract_records(self, processed_documents: List[Dict[str, Any]]) -> FinancialRecordStore:
+        """
+        Extract financial data page by page into a FinancialRecordStore
+        
+        Args:
+            processed_documents: DocumentProcessor output (name, type, content with page markers)
+            
+        Returns:
+            Store with one record per match, citing document, page and offset
+        """
+        store = FinancialRecordStore()
+        total_chars = 0
+
+        for doc in processed_documents:
+            if doc.get('type') == 'error' or not doc.get('content'):
+                continue
+            doc_name = doc['name']
+            total_chars += len(doc['content'])
+
+            for page, page_offset, text in iter_pages(doc['content']):
+                if not text.strip():
+                    continue
+                keywords = self._scan_keywords(text) if self.single_pass else None
+                seen = set()  # Overlapping patterns can match the same figure at the same spot
+
+                def add(amount: str, category: str, start: int, value: Optional[float] = None,
+                        currency: Optional[str] = None):
+                    if (amount, category, start) not in seen:
+                        seen.add((amount, category, start))
+                        store.add(amount, category, doc_name, page, page_offset + start, value, currency)
+
+                for match, category, _ in self._funding_matches(text, keywords):
+                    add(match.group(0), category, match.start())
+                for match, kpi_name in self._kpi_matches(text, keywords):
+                    add(match.group(1).strip(), kpi_name, match.start())
+                for match, _ in self._percentage_matches(text, keywords):
+                    add(f"{match.group(1)}%", PERCENTAGE_CATEGORY, match.start(), _normalize_amount(match.group(1))[0], '')
+                for match, category in self._revenue_matches(text, keywords):
+                    add(match.group(0), 'pl_mention' if category == 'pl_mentions' else 'revenue_metric', match.start())
+
+        logger.info(f"🔍 Structured financial extraction: {len(store)} records from "
+                    f"{len(store.documents.values)} documents ({total_chars} characters)")
+        validation_warnings = store.validate()
+        if validation_warnings:
+            logger.warning(f"   ⚠️  Validation warnings: {len(validation_warnings)}")
+        return store
+
+    def format_records_for_gpt4(self, store: FinancialRecordStore, max_amounts: int = 10) -> str:
+        """
+        Format a FinancialRecordStore for a GPT-5 prompt, citing where each figure comes from
+        
+        Args:
+            store: Result from extract_records()
+            max_amounts: Distinct amounts listed per section
+            
+        Returns:
+            Formatted string for inclusion in GPT-5 prompt
+        """
+        if not store.has_financial_data:
+            return "No specific financial data detected in documents."
+
+        def cited(category: str, limit: int) -> List[str]:
+            items = []
+            for amount, rows in list(store.distinct_amounts(category).items())[:limit]:
+                more = f", +{len(rows) - 1}" if len(rows) > 1 else ""
+                items.append(f"{amount} ({store.citation(rows[0])}{more})")
+            return items
+
+        sections = []
+
+        # Company funding (most important for analysis), market data and founder background
+        for category, label in (('company_funding', 'COMPANY FUNDING'), ('market_data', 'MARKET SIZE'),
+                                ('founder_exits', 'FOUNDER PREVIOUS EXIT')):
+            amounts = cited(category, max_amounts)
+            if amounts:
+                sections.append(f"{label}: {', '.join(amounts)}")
+
+        # KPIs (first mention of each)
+        detected_kpis = [f"{kpi.upper()}: {store.amounts[store.rows(kpi)[0]]} ({store.citation(store.rows(kpi)[0])})"
+                         for kpi in self.kpi_patterns if store.rows(kpi)]
+        if detected_kpis:
+            sections.append(f"KPIs: {' | '.join(detected_kpis)}")
+
+        # Percentages/Conversion rates
+        rates = cited(PERCENTAGE_CATEGORY, 5)  # Limit to avoid clutter
+        if rates:
+            sections.append(f"CONVERSION RATES/MARGINS: {', '.join(rates)}")
+
+        # P&L/Revenue data
+        pl_rows = store.rows('pl_mention')
+        if pl_rows:
+            sections.append(f"P&L/FINANCIAL STATEMENTS: Referenced in {store.citation(pl_rows[0])}")
+
+        return '\n'.join(sections)
+
 
 def extract_financial_data(content: str) -> Dict[str, Any]:
     """
@@ -446,4 +919,32 @@ def format_financial_data_for_prompt(extracted_data: Dict[str, Any]) -> str:
         Formatted string for GPT-5 prompt
     """
     extractor = FinancialDataExtractor()
-    return extractor.format_for_gpt4(extracted_data)
\ No newline at end of file
+    return extractor.format_for_gpt4(extracted_data)
+
+
+def extract_financial_records(processed_documents: List[Dict[str, Any]]) -> FinancialRecordStore:
+    """
+    Convenience function for page-aware extraction over processed documents
+    
+    Args:
+        processed_documents: DocumentProcessor output
+        
+    Returns:
+        FinancialRecordStore with cited records
+    """
+    extractor = FinancialDataExtractor()
+    return extractor.extract_records(processed_documents)
+
+
+def format_financial_records_for_prompt(store: FinancialRecordStore) -> str:
+    """
+    Convenience function for formatting structured records for GPT-5
+    
+    Args:
+        store: Result from extract_financial_records()
+        
+    Returns:
+        Formatted string for GPT-5 prompt, with document/page citations
+    """
+    extractor = FinancialDataExtractor()
+    return extractor.format_records_for_gpt4(store)
@@ -61,9 +61,7 @@ def _generate_mock_insights(competitive_data: Dict, market_profile: Dict) -> Dic
 def _generate_ai_insights(competitive_data: Dict, market_profile: Dict) -> Dict[str, List[str]]:
     """Generate AI-powered insights using GPT-5"""
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        from utils.llm_gateway import get_llm_gateway
         
         # Prepare context for GPT-5
         context = _build_insight_context(competitive_data, market_profile)
@@ -96,7 +94,8 @@ RISKS:
 - [Specific risk with impact assessment]
 - [Specific risk with impact assessment]"""
 
-        response = client.chat.completions.create(
+        content = get_llm_gateway().chat(
+            "market.insights",
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are an expert VC analyst focused on competitive intelligence and market dynamics."},
@@ -107,7 +106,6 @@ RISKS:
         )
         
         # Parse GPT-5 response
-        content = response.choices[0].message.content
         return _parse_insight_response(content)
         
     except Exception as e:
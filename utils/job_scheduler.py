@@ -0,0 +1,246 @@
+"""
+Job scheduler for DataRoom Intelligence
+Bounded worker pools with separate queues per job class (CPU extraction vs network LLM/search)
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from config.settings import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Job:
+    """A unit of background work submitted from a Slack command"""
+    job_id: int
+    job_class: str
+    user_id: str
+    name: str
+    func: Callable
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"  # queued, running, completed, failed
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished (True) or the timeout expires (False)"""
+        return self.done.wait(timeout)
+
+    @property
+    def dedup_key(self) -> Tuple[str, str]:
+        return (self.user_id, self.name)
+
+    @property
+    def wait_seconds(self) -> float:
+        end = self.started_at if self.started_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+    @property
+    def run_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+
+@dataclass
+class SubmitResult:
+    """Outcome of a submit call"""
+    job: Optional[Job]
+    accepted: bool
+    position: int = 0  # Jobs ahead in the queue (0 = starts immediately)
+    duplicate: bool = False
+    reason: str = ""
+
+
+class _JobClassQueue:
+    """Queue, workers and counters for one job class"""
+
+    def __init__(self, name: str, workers: int, max_queue_size: int, lock: threading.Lock):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.condition = threading.Condition(lock)  # Wakes only this class's workers
+        self.queue: Deque[Job] = deque()
+        self.running: Dict[int, Job] = {}
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+        self.max_run = 0.0
+
+    def record(self, job: Job):
+        if job.status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.total_wait += job.wait_seconds
+        self.total_run += job.run_seconds
+        self.max_wait = max(self.max_wait, job.wait_seconds)
+        self.max_run = max(self.max_run, job.run_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            'workers': self.workers,
+            'queue_depth': len(self.queue),
+            'running': len(self.running),
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_wait_seconds': round(self.total_wait / finished, 2) if finished else 0.0,
+            'max_wait_seconds': round(self.max_wait, 2),
+            'avg_run_seconds': round(self.total_run / finished, 2) if finished else 0.0,
+            'max_run_seconds': round(self.max_run, 2),
+            'oldest_queued_seconds': round(self.queue[0].wait_seconds, 2) if self.queue else 0.0
+        }
+
+
+class JobScheduler:
+    """
+    Runs background jobs on bounded per-class worker pools
+
+    Each job class has its own FIFO queue, condition and worker threads, so a burst of
+    CPU-heavy extraction jobs cannot starve network-bound research jobs.
+    A user can have at most one in-flight job per job name.
+    """
+
+    def __init__(self, class_workers: Dict[str, int], max_queue_size: int = 50):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._in_flight: Dict[Tuple[str, str], Job] = {}
+        self._classes: Dict[str, _JobClassQueue] = {
+            name: _JobClassQueue(name, workers, max_queue_size, self._lock)
+            for name, workers in class_workers.items()
+        }
+
+        for job_class in self._classes.values():
+            for i in range(job_class.workers):
+                threading.Thread(
+                    target=self._worker_loop,
+                    args=(job_class,),
+                    name=f"job-{job_class.name}-{i + 1}",
+                    daemon=True
+                ).start()
+
+        logger.info("🧵 Job scheduler started: " +
+                    ", ".join(f"{c.name}={c.workers} workers" for c in self._classes.values()))
+
+    def submit(self, job_class: str, user_id: str, name: str, func: Callable,
+               *args, **kwargs) -> SubmitResult:
+        """
+        Queue ``func(*args, **kwargs)`` on the given job class
+
+        Returns a SubmitResult; duplicates of an in-flight job for the same
+        user and name are rejected with ``duplicate=True``.
+        """
+        with self._lock:
+            queue = self._classes.get(job_class)
+            if queue is None:
+                raise ValueError(f"Unknown job class: {job_class}")
+
+            existing = self._in_flight.get((user_id, name))
+            if existing is not None:
+                position = self._position(existing)
+                logger.info(f"🧵 Duplicate {name} job for user {user_id} ignored (job {existing.job_id} {existing.status})")
+                return SubmitResult(existing, accepted=False, position=position, duplicate=True,
+                                    reason=f"already {existing.status}")
+
+            if len(queue.queue) >= queue.max_queue_size:
+                logger.warning(f"⚠️ {job_class} queue full ({len(queue.queue)} jobs), rejecting {name} for {user_id}")
+                return SubmitResult(None, accepted=False, reason="queue full")
+
+            job = Job(next(self._ids), job_class, user_id, name, func, args, kwargs)
+            # Position counts jobs ahead that will not start before this one
+            position = max(0, len(queue.queue) + len(queue.running) - queue.workers + 1)
+            queue.queue.append(job)
+            self._in_flight[job.dedup_key] = job
+            queue.condition.notify()
+
+        logger.info(f"🧵 Queued {name} job {job.job_id} for user {user_id} on '{job_class}' (position {position})")
+        return SubmitResult(job, accepted=True, position=position)
+
+    def _position(self, job: Job) -> int:
+        """Jobs ahead of ``job`` (lock held)"""
+        if job.status != "queued":
+            return 0
+        queue = self._classes[job.job_class]
+        index = list(queue.queue).index(job) if job in queue.queue else 0
+        return max(0, index + len(queue.running) - queue.workers + 1)
+
+    def _worker_loop(self, queue: _JobClassQueue):
+        while True:
+            with queue.condition:
+                while not queue.queue:
+                    queue.condition.wait()
+                job = queue.queue.popleft()
+                job.status = "running"
+                job.started_at = time.monotonic()
+                queue.running[job.job_id] = job
+
+            logger.info(f"🧵 Running {job.name} job {job.job_id} for user {job.user_id} "
+                        f"(waited {job.wait_seconds:.1f}s)")
+            try:
+                job.result = job.func(*job.args, **job.kwargs)
+                job.status = "completed"
+            except Exception as e:
+                job.status = "failed"
+                logger.error(f"❌ {job.name} job {job.job_id} failed: {e}", exc_info=True)
+            finally:
+                job.finished_at = time.monotonic()
+                with self._lock:
+                    queue.running.pop(job.job_id, None)
+                    if self._in_flight.get(job.dedup_key) is job:
+                        del self._in_flight[job.dedup_key]
+                    queue.record(job)
+                job.done.set()
+
+            logger.info(f"🧵 Finished {job.name} job {job.job_id} ({job.status}, ran {job.run_seconds:.1f}s)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait and run times per job class"""
+        with self._lock:
+            return {name: queue.stats() for name, queue in self._classes.items()}
+
+
+def format_queue_position(submit_result: SubmitResult) -> str:
+    """Slack-friendly queue feedback for a submitted job"""
+    if submit_result.duplicate:
+        return ("⏳ You already have this job in progress"
+                + (f" (position {submit_result.position} in queue)" if submit_result.position else "")
+                + ". Please wait for it to finish.")
+    if not submit_result.accepted:
+        return "⚠️ The bot is at capacity right now. Please try again in a few minutes."
+    if submit_result.position:
+        return f"⏳ Queued behind {submit_result.position} other job(s) - will start automatically."
+    return ""
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Process-wide job scheduler configured from settings"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler(
+                {
+                    'cpu': config.JOB_CPU_WORKERS,
+                    'network': config.JOB_NETWORK_WORKERS,
+                    'speculative': config.JOB_SPECULATIVE_WORKERS
+                },
+                max_queue_size=config.JOB_MAX_QUEUE_SIZE
+            )
+        return _scheduler
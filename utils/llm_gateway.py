@@ -0,0 +1,457 @@
+"""
+LLM gateway for DataRoom Intelligence
+One pooled OpenAI client for every call site, with concurrency and tokens-per-minute limits,
+jittered retries on 429/5xx, per-call deadlines, an opt-in response cache and
+latency/token/cost metrics by call site
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from config.settings import config
+from utils.context_packer import get_token_counter
+from utils.disk_cache import DiskCache
+from utils.rate_limiter import TokenBucket
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# USD per 1K tokens (prompt, completion); unknown models are costed as gpt-4
+MODEL_PRICES_PER_1K = {
+    'gpt-4': (0.03, 0.06),
+    'gpt-4-turbo': (0.01, 0.03),
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-3.5-turbo': (0.0005, 0.0015)
+}
+
+LATENCY_HISTORY = 200  # Calls kept per call site for latency percentiles
+
+
+@dataclass
+class CallSiteStats:
+    """Counters for one call site (e.g. 'ask', 'agent.market_detection')"""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_saved_seconds: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_HISTORY))
+
+    def report(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cost_usd': round(self.cost_usd, 4),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_saved_seconds': round(self.cache_saved_seconds, 2),
+            'latency_p50_seconds': round(latencies[len(latencies) // 2], 3) if latencies else None,
+            'latency_p95_seconds': round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None
+        }
+
+
+class LLMCallCancelled(Exception):
+    """Raised for a background call whose result is no longer wanted"""
+
+
+class PrioritySlots:
+    """
+    Concurrency slots shared by interactive and background callers
+
+    Background callers (speculative work) hold at most ``slots - reserved``
+    slots and never take one while an interactive caller is waiting, so an
+    interactive call waits for at most the calls already running.
+    """
+
+    def __init__(self, slots: int, reserved: int):
+        self.slots = max(1, slots)
+        self.background_slots = max(1, self.slots - max(reserved, 0))
+        self._condition = threading.Condition()
+        self._used = 0
+        self._background_used = 0
+        self._interactive_waiting = 0
+
+    def _available(self, background: bool) -> bool:
+        if self._used >= self.slots:
+            return False
+        if background:
+            return self._interactive_waiting == 0 and self._background_used < self.background_slots
+        return True
+
+    def acquire(self, background: bool = False, timeout: Optional[float] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """Take a slot; False on timeout. Raises LLMCallCancelled once ``cancelled()`` is true"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if not background:
+                self._interactive_waiting += 1
+            try:
+                while not self._available(background):
+                    if cancelled is not None and cancelled():
+                        raise LLMCallCancelled("Background LLM call cancelled while waiting for a slot")
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(0.5 if remaining is None else min(remaining, 0.5))
+                self._used += 1
+                if background:
+                    self._background_used += 1
+                return True
+            finally:
+                if not background:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()  # Background waiters may proceed once no interactive call waits
+
+    def release(self, background: bool = False):
+        with self._condition:
+            self._used -= 1
+            if background:
+                self._background_used -= 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {'in_use': self._used, 'background_in_use': self._background_used,
+                    'background_limit': self.background_slots, 'interactive_waiting': self._interactive_waiting}
+
+
+@dataclass
+class CostScope:
+    """Spend of the calls made inside one cost_scope() block"""
+    calls: int = 0
+    cost_usd: float = 0.0
+
+
+class LLMGateway:
+    """
+    Shared entry point for chat completions
+
+    Every attempt first takes its estimated tokens (prompt + max_tokens) from
+    the tokens-per-minute bucket, then a slot in the global concurrency
+    semaphore, and runs against the one pooled client. Rate limits (429),
+    server errors (5xx), timeouts and connection errors are retried with
+    full-jitter exponential backoff (honouring Retry-After, slot released)
+    until the call's deadline, which also cuts off a stream that runs past
+    it; other errors are raised at once. Streamed calls are only retried
+    before their first chunk has been passed on.
+
+    Calls made inside background() (speculative work) are low priority:
+    they get at most LLM_MAX_CONCURRENCY - LLM_INTERACTIVE_RESERVED_SLOTS
+    slots, yield to waiting interactive calls, leave LLM_BACKGROUND_TPM_RESERVE
+    of the TPM bucket untouched and stop before their next attempt once
+    cancelled.
+
+    With LLM_CACHE_ENABLED, responses are cached on disk keyed by model,
+    messages, temperature and max_tokens, so replayed prompts skip the
+    network (and the limits) entirely.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 max_retries: Optional[int] = None, base_url: Optional[str] = None, api_key: Optional[str] = None):
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.tokens_per_minute = tokens_per_minute or config.LLM_TOKENS_PER_MINUTE
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_url = base_url or config.OPENAI_BASE_URL or None
+        self.api_key = api_key or config.OPENAI_API_KEY
+
+        self._slots = PrioritySlots(self.max_concurrency, config.LLM_INTERACTIVE_RESERVED_SLOTS)
+        self._tpm = TokenBucket(self.tokens_per_minute / 60.0, self.tokens_per_minute)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stats: Dict[str, CallSiteStats] = {}
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._cache: Optional[DiskCache] = None
+        self._local = threading.local()  # Active cost scopes of the calling thread
+        self._cache_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The pooled OpenAI client (created on first use; its own retries are off, the gateway retries)"""
+        with self._client_lock:
+            if self._client is None:
+                from openai import OpenAI
+                self._client = OpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                      timeout=config.LLM_REQUEST_TIMEOUT_SECONDS)
+                logger.info(f"🔌 LLM gateway client initialized (concurrency {self.max_concurrency}, "
+                            f"{self.tokens_per_minute} TPM{f', base URL {self.base_url}' if self.base_url else ''})")
+            return self._client
+
+    @property
+    def cache(self) -> Optional[DiskCache]:
+        """Persistent response cache (created on first use; None if it can't be opened)"""
+        with self._cache_lock:
+            if self._cache is None:
+                try:
+                    self._cache = DiskCache(
+                        config.cache_dir / "llm_cache.sqlite3",
+                        name="LLM response",
+                        ttl_seconds=config.LLM_CACHE_TTL_HOURS * 3600,
+                        max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024
+                    )
+                except Exception as e:
+                    logger.error(f"❌ LLM response cache unavailable: {e}")
+                    return None
+            return self._cache
+
+    @contextmanager
+    def cost_scope(self) -> Iterator[CostScope]:
+        """Collect the cost of the calls this thread makes inside the block (cache hits are free)"""
+        scope = CostScope()
+        outer = getattr(self._local, 'scopes', [])
+        self._local.scopes = outer + [scope]
+        try:
+            yield scope
+        finally:
+            self._local.scopes = outer
+
+    @contextmanager
+    def background(self, cancelled: Optional[Callable[[], bool]] = None) -> Iterator[None]:
+        """Run this thread's calls inside the block at background priority, cancellable via ``cancelled()``"""
+        outer = getattr(self._local, 'background', None)
+        self._local.background = cancelled or (lambda: False)
+        try:
+            yield
+        finally:
+            self._local.background = outer
+
+    @staticmethod
+    def cache_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        payload = json.dumps({'model': model, 'messages': messages, 'temperature': temperature,
+                              'max_tokens': max_tokens}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def chat(self, call_site: str, messages: List[Dict[str, str]], model: str = "gpt-4",
+             max_tokens: int = 1000, temperature: float = 0.3, deadline_seconds: Optional[float] = None,
+             on_delta: Optional[Callable[[str], None]] = None, use_cache: Optional[bool] = None) -> str:
+        """
+        Run a chat completion and return its text
+
+        Args:
+            call_site: Name the metrics are recorded under
+            messages: Chat messages
+            model, max_tokens, temperature: Completion parameters
+            deadline_seconds: Give up (TimeoutError) after this long, waiting and retries included
+            on_delta: Stream the completion, passing each chunk of text as it arrives
+            use_cache: Read/write the response cache (None = LLM_CACHE_ENABLED, False = bypass)
+
+        Returns:
+            Completion text
+        """
+        deadline_seconds = deadline_seconds or config.LLM_CALL_DEADLINE_SECONDS
+        deadline = time.monotonic() + deadline_seconds
+        started_at = time.monotonic()
+        stats = self._site_stats(call_site)
+
+        cache = self.cache if (config.LLM_CACHE_ENABLED if use_cache is None else use_cache) else None
+        cache_key = self.cache_key(model, messages, temperature, max_tokens) if cache else None
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                with self._stats_lock:
+                    stats.cache_hits += 1
+                    stats.cache_saved_seconds += cached.get('latency_seconds', 0.0)
+                logger.info(f"🗄️ LLM call '{call_site}' served from cache "
+                            f"(saved ~{cached.get('latency_seconds', 0.0):.1f}s)")
+                if on_delta is not None and cached['text']:
+                    on_delta(cached['text'])
+                return cached['text']
+            with self._stats_lock:
+                stats.cache_misses += 1
+
+        estimated_prompt_tokens = self._count_tokens(messages)
+        cancelled = getattr(self._local, 'background', None)
+        background = cancelled is not None
+        tpm_reserve = self.tokens_per_minute * config.LLM_BACKGROUND_TPM_RESERVE if background else 0.0
+
+        attempt = 0
+        emitted = []  # Chunks already passed to on_delta (a streamed call can't be retried after these)
+        while True:
+            if background and cancelled():
+                raise LLMCallCancelled(f"Background LLM call '{call_site}' cancelled")
+
+            # Every attempt pays for its tokens, and waits for them before taking a slot,
+            # so a throttled call doesn't hold a slot other callers could use
+            if not self._tpm.acquire(estimated_prompt_tokens + max_tokens, timeout=max(deadline - time.monotonic(), 0),
+                                     reserve=tpm_reserve):
+                self._record_error(stats)
+                raise TimeoutError(f"LLM call '{call_site}' timed out waiting for tokens-per-minute budget")
+            if not self._slots.acquire(background, timeout=max(deadline - time.monotonic(), 0),
+                                       cancelled=cancelled if background else None):
+                self._record_error(stats)
+                raise TimeoutError(f"LLM call '{call_site}' timed out waiting for a concurrency slot")
+
+            self._change_in_flight(1)
+            error = None
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"LLM call '{call_site}' exceeded its {deadline_seconds}s deadline")
+                timeout = min(config.LLM_REQUEST_TIMEOUT_SECONDS, remaining)
+                if on_delta is None:
+                    text, usage = self._complete(messages, model, max_tokens, temperature, timeout)
+                else:
+                    text, usage = self._stream(messages, model, max_tokens, temperature, timeout, on_delta,
+                                               emitted, deadline)
+            except TimeoutError:
+                self._record_error(stats)
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                self._change_in_flight(-1)
+                self._slots.release(background)
+
+            if error is None:
+                break
+            delay = self._retry_delay(error, attempt)
+            if delay is None or attempt >= self.max_retries or emitted or time.monotonic() + delay >= deadline:
+                self._record_error(stats)
+                logger.error(f"❌ LLM call '{call_site}' failed after {attempt + 1} attempt(s): {error}")
+                raise error
+            attempt += 1
+            with self._stats_lock:
+                stats.retries += 1
+            logger.warning(f"⚠️ LLM call '{call_site}' retry {attempt}/{self.max_retries} in {delay:.1f}s: {error}")
+            time.sleep(delay)
+
+        latency = time.monotonic() - started_at
+        prompt_tokens = usage.get('prompt_tokens') or estimated_prompt_tokens
+        completion_tokens = usage.get('completion_tokens') or self._count_tokens([{'content': text}])
+        self._record_success(stats, model, latency, prompt_tokens, completion_tokens)
+        if cache is not None and text:
+            cache.set(cache_key, {'text': text, 'latency_seconds': latency,
+                                  'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens})
+        return text
+
+    def _complete(self, messages, model, max_tokens, temperature, timeout):
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout
+        )
+        usage = response.usage
+        return response.choices[0].message.content, {
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+            'completion_tokens': getattr(usage, 'completion_tokens', 0)
+        }
+
+    def _stream(self, messages, model, max_tokens, temperature, timeout, on_delta, emitted, deadline):
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout,
+            stream=True
+        )
+        for chunk in stream:
+            if time.monotonic() > deadline:
+                stream.close()
+                raise TimeoutError(f"Streamed completion exceeded its deadline after {len(emitted)} chunks")
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                emitted.append(delta)
+                try:
+                    on_delta(delta)
+                except Exception as e:
+                    logger.warning(f"⚠️ Streaming callback failed: {e}")
+        return "".join(emitted), {}
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the error isn't retryable"""
+        import openai
+
+        if isinstance(error, openai.APIConnectionError):  # Includes APITimeoutError
+            retry_after = None
+        elif isinstance(error, openai.APIStatusError) and (error.status_code == 429 or error.status_code >= 500):
+            retry_after = self._retry_after(error)
+        else:
+            return None
+
+        backoff = random.uniform(0, min(config.LLM_BACKOFF_MAX_SECONDS, config.LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+        return max(backoff, retry_after or 0.0)
+
+    @staticmethod
+    def _retry_after(error) -> Optional[float]:
+        try:
+            value = error.response.headers.get('retry-after')
+            return min(float(value), config.LLM_BACKOFF_MAX_SECONDS) if value else None
+        except (AttributeError, ValueError):
+            return None
+
+    @staticmethod
+    def _count_tokens(messages: List[Dict[str, str]]) -> int:
+        counter = get_token_counter()
+        return sum(counter.count(message.get('content') or '') + 4 for message in messages)
+
+    def _change_in_flight(self, delta: int):
+        with self._stats_lock:
+            self._in_flight += delta
+
+    def _site_stats(self, call_site: str) -> CallSiteStats:
+        with self._stats_lock:
+            return self._stats.setdefault(call_site, CallSiteStats())
+
+    def _record_error(self, stats: CallSiteStats):
+        with self._stats_lock:
+            stats.calls += 1
+            stats.errors += 1
+
+    def _record_success(self, stats: CallSiteStats, model: str, latency: float,
+                        prompt_tokens: int, completion_tokens: int):
+        prompt_price, completion_price = MODEL_PRICES_PER_1K.get(model, MODEL_PRICES_PER_1K['gpt-4'])
+        cost = (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+        for scope in getattr(self._local, 'scopes', []):
+            scope.calls += 1
+            scope.cost_usd += cost
+        with self._stats_lock:
+            stats.calls += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost_usd += cost
+            stats.latencies.append(latency)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            call_sites = {site: stats.report() for site, stats in self._stats.items()}
+        return {
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self._in_flight,
+            'slots': self._slots.stats(),
+            'tokens_per_minute': self.tokens_per_minute,
+            'tpm_available': int(self._tpm.available_tokens),
+            'total_cost_usd': round(sum(site['cost_usd'] for site in call_sites.values()), 4),
+            'cache': self._cache.stats() if self._cache is not None else None,
+            'call_sites': call_sites
+        }
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide LLM gateway configured from settings"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,93 @@
+"""
+Rate limiting utilities for DataRoom Intelligence
+Thread-safe token bucket shared by all callers of an external API
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` blocks until enough tokens are available (or the timeout expires).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("TokenBucket rate and capacity must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None, reserve: float = 0.0) -> bool:
+        """
+        Take ``tokens`` from the bucket, waiting for a refill if necessary
+
+        Args:
+            tokens: Number of tokens to consume (capped at bucket capacity)
+            timeout: Maximum seconds to wait, None to wait indefinitely
+            reserve: Tokens that must be left in the bucket afterwards (lets low-priority callers yield)
+
+        Returns:
+            True if the tokens were acquired, False on timeout
+        """
+        tokens = min(float(tokens), self.capacity)
+        reserve = min(max(float(reserve), 0.0), self.capacity - tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens - tokens >= reserve:
+                    self._tokens -= tokens
+                    return True
+                wait_seconds = (tokens + reserve - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_seconds = min(wait_seconds, remaining)
+            time.sleep(wait_seconds)
+
+    @property
+    def available_tokens(self) -> float:
+        """Current number of tokens (after refill)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, capacity: float) -> TokenBucket:
+    """
+    Get the process-wide token bucket registered under ``name``
+
+    The first caller's rate/capacity configure the bucket; later callers share it.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(rate, capacity)
+            _limiters[name] = limiter
+            logger.info(f"🚦 Rate limiter '{name}' initialized: {rate}/s, burst {capacity}")
+        return limiter
@@ -0,0 +1,155 @@
+"""
+Retrieval index for DataRoom Intelligence
+Page-aware chunks of extracted documents ranked with BM25 (no network, no extra dependencies)
+"""
+
+import heapq
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config.settings import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Page separators written by DocumentProcessor ("--- Page 3 ---", "--- Page 3 (OCR) ---", "--- Page 3 Table 1 ---")
+PAGE_MARKER_PATTERN = re.compile(r'^--- Page (\d+)(?: \(OCR\)| Table \d+)? ---$', re.MULTILINE)
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+STOPWORDS = frozenset("""
+a an and are as at be by de del el en es for from has have how in is it its la las los of on or que
+the their this to un una was what when where which who why will with y
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class Chunk:
+    """A passage of one document, with the page it came from (None if the format has no pages)"""
+    doc_name: str
+    page: Optional[int]
+    text: str
+
+    @property
+    def citation(self) -> str:
+        return f"[{self.doc_name}, p. {self.page}]" if self.page else f"[{self.doc_name}]"
+
+
+def iter_pages(content: str) -> Iterator[Tuple[Optional[int], int, str]]:
+    """(page number, offset in content, raw text) for each page-marker delimited segment"""
+    position = 0
+    page: Optional[int] = None
+    for match in PAGE_MARKER_PATTERN.finditer(content):
+        yield page, position, content[position:match.start()]
+        page = int(match.group(1))
+        position = match.end()
+    yield page, position, content[position:]
+
+
+def split_pages(content: str) -> List[Tuple[Optional[int], str]]:
+    """Split extracted content on page markers into (page number, text) pairs"""
+    return [(page, text.strip()) for page, _, text in iter_pages(content) if text.strip()]
+
+
+def chunk_text(text: str, chunk_chars: int, overlap_chars: int) -> List[str]:
+    """Split text into ~chunk_chars passages on whitespace, overlapping by overlap_chars"""
+    if len(text) <= chunk_chars:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            boundary = text.rfind(' ', start + chunk_chars // 2, end)
+            if boundary != -1:
+                end = boundary
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap_chars, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+
+class RetrievalIndex:
+    """
+    BM25 index over page-aware chunks of a data room
+
+    Built once per analysis and stored in the AnalysisSession, so it is plain
+    Python data and pickles with the session.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, chunks: List[Chunk]):
+        self.chunks = chunks
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.chunk_lengths: List[int] = []
+
+        for chunk_id, chunk in enumerate(chunks):
+            term_counts = Counter(tokenize(chunk.text))
+            self.chunk_lengths.append(sum(term_counts.values()))
+            for term, count in term_counts.items():
+                self.postings[term].append((chunk_id, count))
+
+        self.postings = dict(self.postings)
+        self.average_length = (sum(self.chunk_lengths) / len(self.chunk_lengths)) if self.chunk_lengths else 0.0
+        total = len(chunks)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    @classmethod
+    def from_documents(cls, processed_documents: List[Dict[str, Any]],
+                       chunk_chars: Optional[int] = None,
+                       overlap_chars: Optional[int] = None) -> "RetrievalIndex":
+        """Chunk DocumentProcessor output page by page and index it"""
+        start_time = time.time()
+        chunk_chars = chunk_chars or config.RETRIEVAL_CHUNK_CHARS
+        overlap_chars = config.RETRIEVAL_CHUNK_OVERLAP_CHARS if overlap_chars is None else overlap_chars
+
+        chunks = []
+        for doc in processed_documents:
+            if doc.get('type') == 'error' or not doc.get('content'):
+                continue
+            for page, page_text in split_pages(doc['content']):
+                for text in chunk_text(page_text, chunk_chars, overlap_chars):
+                    chunks.append(Chunk(doc['name'], page, text))
+
+        index = cls(chunks)
+        logger.info(f"🔎 Retrieval index built: {len(chunks)} chunks, {len(index.postings)} terms "
+                    f"in {time.time() - start_time:.2f}s")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[Tuple[Chunk, float]]:
+        """Top-k chunks for the query by BM25 score (highest first)"""
+        top_k = top_k or config.RETRIEVAL_TOP_K
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for chunk_id, count in postings:
+                length_norm = 1 - self.B + self.B * self.chunk_lengths[chunk_id] / (self.average_length or 1)
+                scores[chunk_id] += idf * count * (self.K1 + 1) / (count + self.K1 * length_norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self.chunks[chunk_id], score) for chunk_id, score in best]
+
+    def format_context(self, results: List[Tuple[Chunk, float]]) -> str:
+        """Render search results as cited passages for a prompt"""
+        return "\n\n".join(f"{chunk.citation}\n{chunk.text}" for chunk, _ in results)
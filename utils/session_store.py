@@ -0,0 +1,315 @@
+"""
+Session store for DataRoom Intelligence
+Dict-like user session storage with LRU/TTL eviction, a memory budget and a SQLite disk tier
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ACCESS_WRITE_INTERVAL_SECONDS = 60  # Memory hits refresh the disk last_accessed at most this often
+
+
+class SessionStore:
+    """
+    Stores user sessions in memory with a disk-backed tier
+
+    Sessions are written through to SQLite (compressed pickle) so they survive
+    restarts. The in-memory tier is bounded by ``max_sessions`` and
+    ``memory_budget_bytes``; least-recently-used sessions are dropped from memory
+    and reload transparently from disk on next access. Sessions idle for longer
+    than ``ttl_seconds`` are deleted from both tiers.
+
+    Supports the dict operations the bot uses: ``in``, ``[]``, ``del``,
+    ``get``, ``keys`` and ``len``. Mutating a session dict in place is not
+    persisted; use ``update_session`` for that. Assignments and
+    ``update_session`` are checkpoints that rewrite the whole session, while
+    ``update_session(..., persist=False)`` only marks it dirty: it is written
+    at its next checkpoint or before it is evicted from memory.
+
+    ``on_evict`` is called with the user id whenever a session is deleted or
+    expires, so per-session resources (e.g. download workspaces) can be
+    released. Dropping a session from memory does not call it: the session
+    is still on disk and reloads on next access.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None,
+                 max_sessions: Optional[int] = None, memory_budget_bytes: Optional[int] = None,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.memory_budget_bytes = memory_budget_bytes
+        self.on_evict = on_evict
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        self._disk_access: Dict[str, float] = {}  # last_accessed as last written to disk
+        self._memory_only: set = set()  # Sessions that could not be pickled
+        self._dirty: set = set()  # Changed in memory since they were last written to disk
+        self._lock = threading.RLock()
+
+        self.memory_hits = 0
+        self.disk_loads = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS sessions (
+                       user_id TEXT PRIMARY KEY,
+                       value BLOB NOT NULL,
+                       last_accessed REAL NOT NULL
+                   )"""
+            )
+            self._conn.commit()
+
+        logger.info(f"💾 Session store ready: {self.path} ({self._disk_count()} sessions on disk)")
+
+    # ==========================================
+    # DICT INTERFACE
+    # ==========================================
+
+    def __contains__(self, user_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            if user_id in self._memory:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            return row is not None
+
+    def __getitem__(self, user_id: str) -> Dict[str, Any]:
+        session = self.get(user_id)
+        if session is None:
+            raise KeyError(user_id)
+        return session
+
+    def __setitem__(self, user_id: str, session: Dict[str, Any]):
+        with self._lock:
+            now = time.time()
+            self._memory[user_id] = session
+            self._memory.move_to_end(user_id)
+            self._last_access[user_id] = now
+            self._write(user_id, session, now)
+            self._enforce_limits()
+
+    def _write(self, user_id: str, session: Dict[str, Any], now: float):
+        """Pickle a session to disk, or keep it memory-only if it can't be pickled (lock held)"""
+        pickled = self._serialize(user_id, session)
+        self._dirty.discard(user_id)
+        if pickled is not None:
+            self._sizes[user_id] = len(pickled)  # Uncompressed: the zlib blob understates what memory holds
+            self._memory_only.discard(user_id)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (user_id, value, last_accessed) VALUES (?, ?, ?)",
+                (user_id, zlib.compress(pickled), now)
+            )
+            self._disk_access[user_id] = now
+        else:
+            self._sizes[user_id] = self._estimate_size(session)
+            self._memory_only.add(user_id)
+            self._conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+        self._conn.commit()
+
+    def __delitem__(self, user_id: str):
+        with self._lock:
+            existed = user_id in self
+            self._drop_from_memory(user_id)
+            self._memory_only.discard(user_id)
+            self._conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+            self._conn.commit()
+            if not existed:
+                raise KeyError(user_id)
+            self._notify_evict(user_id)
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, user_id: str, default: Any = None) -> Any:
+        """Return the session, reloading it from disk if it was evicted from memory"""
+        with self._lock:
+            self._expire()
+            now = time.time()
+
+            if user_id in self._memory:
+                self._memory.move_to_end(user_id)
+                self._last_access[user_id] = now
+                self.memory_hits += 1
+                # Keep the disk timestamp roughly current so a restart doesn't expire a session in use
+                if user_id not in self._memory_only and \
+                        now - self._disk_access.get(user_id, 0) >= ACCESS_WRITE_INTERVAL_SECONDS:
+                    self._conn.execute("UPDATE sessions SET last_accessed = ? WHERE user_id = ?", (now, user_id))
+                    self._conn.commit()
+                    self._disk_access[user_id] = now
+                return self._memory[user_id]
+
+            row = self._conn.execute(
+                "SELECT value FROM sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            try:
+                pickled = zlib.decompress(row[0])
+                session = pickle.loads(pickled)
+            except Exception as e:
+                logger.error(f"❌ Failed to load session for {user_id} from disk: {e}")
+                return default
+
+            self._memory[user_id] = session
+            self._sizes[user_id] = len(pickled)
+            self._last_access[user_id] = now
+            self._conn.execute("UPDATE sessions SET last_accessed = ? WHERE user_id = ?", (now, user_id))
+            self._conn.commit()
+            self._disk_access[user_id] = now
+            self.disk_loads += 1
+            logger.info(f"💾 Session for {user_id} reloaded from disk")
+            self._enforce_limits(keep=user_id)
+            return session
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            self._expire()
+            disk_keys = [row[0] for row in self._conn.execute("SELECT user_id FROM sessions")]
+            return list(dict.fromkeys(list(self._memory.keys()) + disk_keys))
+
+    def update_session(self, user_id: str, persist: bool = True, **fields):
+        """
+        Merge fields into a stored session and persist it
+
+        With ``persist=False`` the session is only marked dirty, so frequent
+        small changes (counters, memoized data) don't re-pickle and rewrite the
+        whole session each time; it reaches disk at the next checkpoint.
+        """
+        with self._lock:
+            session = self.get(user_id)
+            if session is None:
+                raise KeyError(user_id)
+            session.update(fields)
+            if persist:
+                self[user_id] = session
+            elif user_id not in self._memory_only:
+                self._dirty.add(user_id)
+
+    # ==========================================
+    # EVICTION
+    # ==========================================
+
+    def _serialize(self, user_id: str, session: Dict[str, Any]) -> Optional[bytes]:
+        try:
+            return pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"⚠️ Session for {user_id} is not serializable, keeping in memory only: {e}")
+            return None
+
+    def _estimate_size(self, session: Dict[str, Any]) -> int:
+        """Rough size for sessions that cannot be pickled (document text dominates)"""
+        size = 0
+        for doc in session.get('processed_documents', []) or []:
+            if isinstance(doc, dict):
+                size += len(doc.get('content', '') or '')
+        return size
+
+    def _notify_evict(self, user_id: str):
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(user_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Session eviction hook failed for {user_id}: {e}")
+
+    def _drop_from_memory(self, user_id: str):
+        self._memory.pop(user_id, None)
+        self._sizes.pop(user_id, None)
+        self._last_access.pop(user_id, None)
+        self._disk_access.pop(user_id, None)
+        self._dirty.discard(user_id)
+
+    def _memory_bytes(self) -> int:
+        return sum(self._sizes.get(user_id, 0) for user_id in self._memory)
+
+    def _enforce_limits(self, keep: Optional[str] = None):
+        """Evict LRU sessions from memory until within count and byte budgets (lock held)"""
+        def over_limits() -> bool:
+            if self.max_sessions is not None and len(self._memory) > self.max_sessions:
+                return True
+            return self.memory_budget_bytes is not None and self._memory_bytes() > self.memory_budget_bytes
+
+        for user_id in list(self._memory.keys()):
+            if not over_limits():
+                break
+            if user_id == keep or user_id in self._memory_only:
+                continue  # Memory-only sessions would be lost if evicted
+            if user_id in self._dirty:
+                self._write(user_id, self._memory[user_id], self._last_access[user_id])
+                if user_id in self._memory_only:
+                    continue  # No longer picklable; keep it rather than lose the changes
+            self._drop_from_memory(user_id)
+            self.evictions += 1
+            logger.info(f"💾 Session for {user_id} evicted from memory (still on disk)")
+
+    def _expire(self):
+        """Delete sessions idle longer than the TTL from both tiers (lock held)"""
+        if self.ttl_seconds is None:
+            return
+        cutoff = time.time() - self.ttl_seconds
+
+        expired = set()
+        for user_id, last_access in list(self._last_access.items()):
+            if last_access < cutoff:
+                self._drop_from_memory(user_id)
+                self._memory_only.discard(user_id)
+                self.expirations += 1
+                expired.add(user_id)
+                logger.info(f"💾 Session for {user_id} expired")
+
+        # Sessions read from memory within the TTL are live even if their disk timestamp lags
+        stale_on_disk = [row[0] for row in self._conn.execute(
+            "SELECT user_id FROM sessions WHERE last_accessed < ?", (cutoff,)
+        ) if row[0] not in self._last_access]
+        if stale_on_disk:
+            self._conn.executemany("DELETE FROM sessions WHERE user_id = ?", [(u,) for u in stale_on_disk])
+            self._conn.commit()
+        expired.update(stale_on_disk)
+
+        for user_id in expired:
+            self._notify_evict(user_id)
+
+    def _disk_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Tier sizes and eviction counters"""
+        with self._lock:
+            self._expire()
+            return {
+                'sessions_in_memory': len(self._memory),
+                'sessions_on_disk': self._disk_count(),
+                'memory_only_sessions': len(self._memory_only),
+                'dirty_sessions': len(self._dirty),
+                'memory_bytes': self._memory_bytes(),
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'max_sessions_in_memory': self.max_sessions,
+                'ttl_seconds': self.ttl_seconds,
+                'memory_hits': self.memory_hits,
+                'disk_loads': self.disk_loads,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -0,0 +1,147 @@
+"""
+Slack streaming for DataRoom Intelligence
+Shows an LLM completion in one Slack message while it is generated, with coalesced chat_update calls
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from config.settings import config
+from utils.rate_limiter import get_rate_limiter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STREAMING_CURSOR = " ▌"
+MAX_STREAMING_CHARS = 3500  # Longer partial text is shown as its tail; the final message is complete
+LATENCY_HISTORY = 100  # Completions kept per command for /status
+
+
+class SlackMessageStreamer:
+    """
+    Streams partial text into a single Slack message
+
+    append() is called with every delta from the model and only buffers it; a
+    background flusher edits the message at most once per
+    SLACK_STREAM_UPDATE_INTERVAL_SECONDS, when the process-wide chat.update
+    bucket has a token, so a fast stream becomes a handful of edits and never
+    waits on Slack. finish() stops the flusher, writes the full formatted
+    message and records time-to-first-token and total latency for the command.
+    """
+
+    def __init__(self, client, channel: str, command: str, header: str = "", ts: Optional[str] = None,
+                 update_interval: Optional[float] = None):
+        self.client = client
+        self.channel = channel
+        self.command = command
+        self.header = header
+        self.ts = ts  # Message to edit (e.g. the progress message); posted on first flush if None
+        self.update_interval = (config.SLACK_STREAM_UPDATE_INTERVAL_SECONDS
+                                if update_interval is None else update_interval)
+        self.limiter = get_rate_limiter("slack_chat_update", config.SLACK_STREAM_UPDATES_PER_SECOND,
+                                        max(config.SLACK_STREAM_UPDATES_PER_SECOND, 1.0))
+
+        self.started_at = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.updates = 0
+        self._text = ""
+        self._sent_length = 0  # Length of the text in the last successful update
+        self._last_update = 0.0
+        self._lock = threading.Lock()  # Guards the buffered text; never held across a Slack call
+        self._done = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def append(self, delta: str):
+        """Add generated text; the background flusher pushes it to Slack when an update is due"""
+        if not delta:
+            return
+        with self._lock:
+            if self.first_token_at is None:
+                self.first_token_at = time.monotonic()
+            self._text += delta
+            if self._flusher is None and not self._done.is_set():
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True,
+                                                 name=f"slack-stream-{self.command}")
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._done.wait(max(self._last_update + self.update_interval - time.monotonic(), 0.0)):
+            with self._lock:
+                text = self._text
+            if len(text) == self._sent_length:
+                self._last_update = time.monotonic()  # Nothing new: check again after an interval
+                continue
+            if self.limiter.acquire(timeout=self.update_interval) and not self._done.is_set():
+                self._flush(text)
+
+    def _flush(self, text: str):
+        shown = text if len(text) <= MAX_STREAMING_CHARS else "…" + text[-MAX_STREAMING_CHARS:]
+        if not self._send(self.header + shown + STREAMING_CURSOR):
+            self._last_update = time.monotonic() + self.update_interval  # Back off after a failed update
+            return
+        self._last_update = time.monotonic()
+        self._sent_length = len(text)
+        self.updates += 1
+
+    def _send(self, text: str) -> bool:
+        try:
+            if self.ts:
+                self.client.chat_update(channel=self.channel, ts=self.ts, text=text)
+            else:
+                self.ts = self.client.chat_postMessage(channel=self.channel, text=text)['ts']
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Streaming update for /{self.command} failed: {e}")
+            return False
+
+    def finish(self, final_text: str):
+        """Replace the streamed text with the full formatted message and record latency"""
+        with self._lock:
+            self._done.set()
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join()  # Lets an in-flight edit land before the final one
+
+        if self.ts:
+            self.limiter.acquire(timeout=self.update_interval)
+        if not self._send(final_text) and self.ts:
+            # The streamed message couldn't be edited: post the result as a new message
+            self.ts = None
+            self._send(final_text)
+
+        total = time.monotonic() - self.started_at
+        ttft = (self.first_token_at - self.started_at) if self.first_token_at is not None else None
+        record_latency(self.command, ttft, total)
+        logger.info(f"📡 /{self.command} reply: first token "
+                    f"{f'{ttft:.2f}s' if ttft is not None else 'n/a'}, total {total:.2f}s, "
+                    f"{self.updates} updates")
+
+
+_latencies: Dict[str, Deque[Tuple[Optional[float], float]]] = {}
+_latencies_lock = threading.Lock()
+
+
+def record_latency(command: str, ttft: Optional[float], total: float):
+    with _latencies_lock:
+        _latencies.setdefault(command, deque(maxlen=LATENCY_HISTORY)).append((ttft, total))
+
+
+def latency_stats() -> Dict[str, Any]:
+    """Per-command time-to-first-token and total latency (p50/p95 seconds over recent completions)"""
+    def percentiles(values):
+        if not values:
+            return None
+        values = sorted(values)
+        return {'p50': round(values[len(values) // 2], 3), 'p95': round(values[int(len(values) * 0.95)], 3)}
+
+    with _latencies_lock:
+        snapshot = {command: list(samples) for command, samples in _latencies.items()}
+    return {
+        command: {
+            'count': len(samples),
+            'ttft_seconds': percentiles([ttft for ttft, _ in samples if ttft is not None]),
+            'total_seconds': percentiles([total for _, total in samples])
+        }
+        for command, samples in snapshot.items()
+    }
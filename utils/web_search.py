@@ -10,11 +10,17 @@ import os
 import re
 import json
 import time
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 import requests
+from config.settings import config
+from utils.disk_cache import DiskCache
 from utils.logger import get_logger
+from utils.rate_limiter import TokenBucket, get_rate_limiter
 
 logger = get_logger(__name__)
 
@@ -22,6 +28,9 @@ logger = get_logger(__name__)
 class SearchProvider(ABC):
     """Abstract base class for search providers"""
     
+    # Provider key used for rate limiting
+    name = 'base'
+    
     @abstractmethod
     def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """Execute a search query and return results"""
@@ -31,6 +40,8 @@ class SearchProvider(ABC):
 class DuckDuckGoProvider(SearchProvider):
     """DuckDuckGo search provider - Free, unlimited API"""
     
+    name = 'duckduckgo'
+    
     def __init__(self):
         self.base_url = "https://api.duckduckgo.com/"
         self.headers = {
@@ -111,6 +122,8 @@ class DuckDuckGoProvider(SearchProvider):
 class TavilyProvider(SearchProvider):
     """Tavily search provider - Professional AI-focused search"""
     
+    name = 'tavily'
+    
     def __init__(self):
         self.api_key = os.getenv('TAVILY_API_KEY')
         if not self.api_key:
@@ -223,6 +236,8 @@ class TavilyProvider(SearchProvider):
 class MockSearchProvider(SearchProvider):
     """Mock search provider for TEST_MODE"""
     
+    name = 'mock'
+    
     def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """Return mock search results for testing"""
         
@@ -281,6 +296,70 @@ class MockSearchProvider(SearchProvider):
         return mock_results[:max_results]
 
 
+class CachedSearchProvider(SearchProvider):
+    """Wraps a provider with the persistent search cache (keyed by provider, normalized query, max_results)"""
+    
+    def __init__(self, provider: SearchProvider, cache: DiskCache):
+        self.provider = provider
+        self.cache = cache
+        self.name = provider.name
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase, strip quotes/trailing punctuation and collapse whitespace"""
+        normalized = query.lower().replace('"', ' ').replace("'", ' ')
+        normalized = re.sub(r'\s+', ' ', normalized).strip(' .,;:?!')
+        return normalized
+    
+    def _cache_key(self, query: str, max_results: int) -> str:
+        raw_key = f"{self.name}|{self.normalize_query(query)}|{max_results}"
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+    
+    def lookup(self, query: str, max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results or None (counts as a cache hit/miss)"""
+        cached = self.cache.get(self._cache_key(query, max_results))
+        if cached is not None:
+            logger.info(f"🗄️ Search cache hit for '{query}'")
+        return cached
+    
+    def fetch(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Query the wrapped provider and cache non-empty results"""
+        results = self.provider.search(query, max_results)
+        if results:  # Don't cache failures (providers return [] on error)
+            self.cache.set(self._cache_key(query, max_results), results)
+        return results
+    
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        cached = self.lookup(query, max_results)
+        if cached is not None:
+            return cached
+        return self.fetch(query, max_results)
+
+
+_search_cache: Optional[DiskCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[DiskCache]:
+    """Process-wide persistent search cache (None when disabled)"""
+    global _search_cache
+    if not config.SEARCH_CACHE_ENABLED:
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            try:
+                _search_cache = DiskCache(
+                    config.cache_dir / "search_cache.sqlite3",
+                    name="Web search",
+                    ttl_seconds=config.SEARCH_CACHE_TTL_HOURS * 3600,
+                    max_entries=config.SEARCH_CACHE_MAX_ENTRIES
+                )
+            except Exception as e:
+                logger.error(f"❌ Search cache unavailable: {e}")
+                return None
+        return _search_cache
+
+
 class WebSearchEngine:
     """Main web search engine with provider flexibility"""
     
@@ -324,38 +403,101 @@ class WebSearchEngine:
                 else:
                     logger.warning(f"Unknown provider {provider}, defaulting to DuckDuckGo")
                     self.provider = DuckDuckGoProvider()
+        
+        # Persistent cache for real providers (mock results are free)
+        if self.provider.name != 'mock':
+            search_cache = get_search_cache()
+            if search_cache is not None:
+                self.provider = CachedSearchProvider(self.provider, search_cache)
+    
+    def _get_rate_limiter(self) -> Optional[TokenBucket]:
+        """Shared token bucket for the active provider (None if unlimited)"""
+        limits = config.SEARCH_RATE_LIMITS.get(self.provider.name)
+        if not limits:
+            return None
+        rate, burst = limits
+        return get_rate_limiter(f"search:{self.provider.name}", rate, burst)
     
-    def search_multiple(self, queries: List[str], max_results_per_query: int = 3) -> Dict[str, Any]:
+    def _timed_search(self, query: str, max_results: int,
+                      rate_limiter: Optional[TokenBucket]) -> Tuple[List[Dict[str, Any]], float, float, bool]:
+        """Run a single rate-limited search, returning results, latency, limiter wait and cache hit"""
+        query_start = time.time()
+        
+        # Cache hits skip the rate limiter entirely
+        if isinstance(self.provider, CachedSearchProvider):
+            cached = self.provider.lookup(query, max_results)
+            if cached is not None:
+                return cached, time.time() - query_start, 0.0, True
+        
+        wait_start = time.time()
+        if rate_limiter:
+            rate_limiter.acquire()
+        waited = time.time() - wait_start
+        
+        logger.info(f"Executing search: {query}")
+        query_start = time.time()
+        try:
+            if isinstance(self.provider, CachedSearchProvider):
+                results = self.provider.fetch(query, max_results)
+            else:
+                results = self.provider.search(query, max_results)
+        except Exception as e:
+            logger.error(f"Search failed for '{query}': {e}")
+            results = []
+        return results, time.time() - query_start, waited, False
+    
+    def search_multiple(self, queries: List[str], max_results_per_query: int = 3,
+                        max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
-        Execute multiple searches and aggregate results
+        Execute multiple searches concurrently and aggregate results
+        
+        Every query goes through the provider's shared token-bucket limiter.
+        Results are aggregated in query order, regardless of completion order.
         
         Args:
             queries: List of search queries
             max_results_per_query: Max results per individual query
+            max_workers: Max concurrent queries (defaults to SEARCH_MAX_CONCURRENCY)
             
         Returns:
-            Aggregated search intelligence
+            Aggregated search intelligence, including per-query latency
         """
         start_time = time.time()
+        rate_limiter = self._get_rate_limiter()
+        workers = max(1, min(len(queries), max_workers or config.SEARCH_MAX_CONCURRENCY))
+        
+        outcomes = [None] * len(queries)
+        if queries:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-search") as executor:
+                futures = {
+                    executor.submit(self._timed_search, query, max_results_per_query, rate_limiter): i
+                    for i, query in enumerate(queries)
+                }
+                for future in as_completed(futures):
+                    outcomes[futures[future]] = future.result()
+        
+        # Aggregate in deterministic (query) order
         all_results = []
         search_terms_used = []
-        
-        for query in queries[:3]:  # FASE 1: Limit to 2-3 searches
-            logger.info(f"Executing search: {query}")
-            results = self.provider.search(query, max_results_per_query)
+        query_latencies = []
+        for query, (results, latency, waited, cache_hit) in zip(queries, outcomes):
             all_results.extend(results)
             search_terms_used.append(query)
-            
-            # Small delay to avoid rate limiting (not needed for mock)
-            if self.provider_name != 'mock' and os.getenv('TEST_MODE', 'false').lower() != 'true':
-                time.sleep(0.5)
+            query_latencies.append({
+                'query': query,
+                'latency_seconds': round(latency, 3),
+                'rate_limit_wait_seconds': round(waited, 3),
+                'results': len(results),
+                'cache_hit': cache_hit
+            })
         
         elapsed_time = time.time() - start_time
-        logger.info(f"Completed {len(queries)} searches in {elapsed_time:.2f} seconds")
+        logger.info(f"Completed {len(queries)} searches in {elapsed_time:.2f} seconds ({workers} concurrent)")
         
         # Process and structure results
         web_intelligence = self._process_results(all_results, search_terms_used)
         web_intelligence['search_time_seconds'] = round(elapsed_time, 2)
+        web_intelligence['query_latencies'] = query_latencies
         
         return web_intelligence
     
@@ -0,0 +1,212 @@
+"""
+Per-session download workspaces for DataRoom Intelligence
+Reference-counted directories under temp storage with a disk-usage budget
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config.settings import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOB_SEPARATOR = "--"  # Workspace ids are {owner}--{job}; Slack user ids never contain it
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+class Workspace:
+    """A job's download directory (GoogleDriveHandler names files {file_id}_{name} so nothing collides)"""
+
+    def __init__(self, workspace_id: str, path: str):
+        self.workspace_id = workspace_id
+        self.path = path
+        self.owner = workspace_id.partition(JOB_SEPARATOR)[0]
+        self.refcount = 0
+        self.discarded = False
+        self.last_used = time.time()
+
+    def contains(self, path: Optional[str]) -> bool:
+        return bool(path) and os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.path)
+
+    def remove_file(self, path: Optional[str]):
+        """Delete a file that is no longer needed (e.g. its extraction is cached)"""
+        if not self.contains(path):
+            return
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not remove workspace file {path}: {e}")
+
+
+class WorkspaceManager:
+    """
+    Hands out per-job workspaces and removes them when no longer needed
+
+    Each job gets its own workspace (``acquire_job``), owned by the user who
+    started it, so concurrent jobs of one user never share a directory. Jobs
+    ``acquire`` a workspace while they use it and ``release`` it after.
+    ``discard`` and ``discard_owner`` (session reset, deletion or expiry)
+    delete the directory once the last reference is released. When total
+    usage exceeds the disk budget, idle workspaces are deleted
+    least-recently-used first.
+    """
+
+    def __init__(self, root: str, budget_bytes: Optional[int] = None):
+        self.root = str(root)
+        self.budget_bytes = budget_bytes
+        self._workspaces: Dict[str, Workspace] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        # Workspaces left over from a previous process are idle and evictable
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                workspace = Workspace(entry.name, entry.path)
+                workspace.last_used = entry.stat().st_mtime
+                self._workspaces[entry.name] = workspace
+
+    @staticmethod
+    def _safe_id(workspace_id: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', str(workspace_id))
+
+    def acquire_job(self, owner: str) -> Workspace:
+        """Create a fresh workspace for one job of ``owner`` and take a reference"""
+        return self.acquire(f"{self._safe_id(owner)}{JOB_SEPARATOR}{uuid.uuid4().hex[:12]}")
+
+    def acquire(self, workspace_id: str) -> Workspace:
+        """Get (or create) a workspace by id and take a reference"""
+        safe_id = self._safe_id(workspace_id)
+        with self._lock:
+            workspace = self._workspaces.get(safe_id)
+            if workspace is None:
+                workspace = Workspace(safe_id, os.path.join(self.root, safe_id))
+                self._workspaces[safe_id] = workspace
+            workspace.refcount += 1
+            workspace.discarded = False
+            workspace.last_used = time.time()
+            os.makedirs(workspace.path, exist_ok=True)
+
+        self.enforce_budget()
+        return workspace
+
+    def release(self, workspace: Workspace):
+        """Drop a reference; deletes the workspace if it was discarded meanwhile"""
+        with self._lock:
+            workspace.refcount = max(0, workspace.refcount - 1)
+            workspace.last_used = time.time()
+            remove = workspace.refcount == 0 and workspace.discarded
+            if remove:
+                self._workspaces.pop(workspace.workspace_id, None)
+
+        if remove:
+            self._delete(workspace)
+        self.enforce_budget()
+
+    def discard(self, workspace_id: str):
+        """Delete a workspace now, or when its last job releases it"""
+        safe_id = self._safe_id(workspace_id)
+        with self._lock:
+            workspace = self._workspaces.get(safe_id)
+            if workspace is None:
+                return
+            workspace.discarded = True
+            remove = workspace.refcount == 0
+            if remove:
+                self._workspaces.pop(safe_id, None)
+
+        if remove:
+            self._delete(workspace)
+
+    def discard_owner(self, owner: str, keep: Optional[str] = None):
+        """Discard every workspace of ``owner`` except ``keep`` (e.g. the one its session uses)"""
+        safe_owner = self._safe_id(owner)
+        with self._lock:
+            workspace_ids = [w.workspace_id for w in self._workspaces.values()
+                             if w.owner == safe_owner and w.workspace_id != keep]
+        for workspace_id in workspace_ids:
+            self.discard(workspace_id)
+
+    def _delete(self, workspace: Workspace):
+        try:
+            size = _directory_size(workspace.path)
+            shutil.rmtree(workspace.path, ignore_errors=True)
+            logger.info(f"🗑️ Removed workspace {workspace.workspace_id} ({size / (1024 * 1024):.1f} MB)")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to remove workspace {workspace.path}: {e}")
+
+    def usage_bytes(self) -> int:
+        return _directory_size(self.root)
+
+    def enforce_budget(self):
+        """Evict idle workspaces (LRU) until total usage is within the budget"""
+        if self.budget_bytes is None:
+            return
+
+        usage = self.usage_bytes()
+        if usage <= self.budget_bytes:
+            return
+
+        with self._lock:
+            idle = sorted((w for w in self._workspaces.values() if w.refcount == 0),
+                          key=lambda w: w.last_used)
+
+        for workspace in idle:
+            if usage <= self.budget_bytes:
+                break
+            with self._lock:
+                if workspace.refcount > 0:
+                    continue
+                self._workspaces.pop(workspace.workspace_id, None)
+            size = _directory_size(workspace.path)
+            self._delete(workspace)
+            usage -= size
+            self.evictions += 1
+
+        if usage > self.budget_bytes:
+            logger.warning(f"⚠️ Workspace usage {usage / (1024 * 1024):.1f} MB exceeds budget with only active workspaces left")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = sum(1 for w in self._workspaces.values() if w.refcount > 0)
+            total = len(self._workspaces)
+        return {
+            'workspaces': total,
+            'active_workspaces': active,
+            'usage_bytes': self.usage_bytes(),
+            'budget_bytes': self.budget_bytes,
+            'evictions': self.evictions
+        }
+
+
+_workspace_manager: Optional[WorkspaceManager] = None
+_workspace_manager_lock = threading.Lock()
+
+
+def get_workspace_manager() -> WorkspaceManager:
+    """Process-wide workspace manager under temp storage"""
+    global _workspace_manager
+    with _workspace_manager_lock:
+        if _workspace_manager is None:
+            _workspace_manager = WorkspaceManager(
+                Path(config.temp_dir) / "workspaces",
+                budget_bytes=config.WORKSPACE_DISK_BUDGET_MB * 1024 * 1024
+            )
+        return _workspace_manager